@@ -116,16 +116,38 @@ class ArbolDecisiones:
         Args:
             nodo_id: ID del nodo a marcar
         """
-        if nodo_id not in self.nodos:
-            return
+        # Propagar hacia arriba (iterativo: la profundidad puede superar
+        # el límite de recursión en instancias grandes)
+        while nodo_id is not None and nodo_id in self.nodos:
+            self.nodos[nodo_id].estado = 'exito'
+            nodo_id = self.nodos[nodo_id].padre_id
+    
+    def injertar(self, otro: 'ArbolDecisiones', padre_id: Optional[int]) -> Optional[int]:
+        """
+        Copia todos los nodos de otro árbol colgando su raíz de padre_id.
+        
+        Los nodos reciben IDs nuevos; estado, tipo y datos se conservan y la
+        profundidad se recalcula. Sirve para reunir en un solo árbol las
+        búsquedas de subproblemas resueltos por separado.
+        
+        Args:
+            otro: Árbol a copiar
+            padre_id: Nodo de este árbol del que cuelga la raíz copiada
+        
+        Returns:
+            ID de la raíz copiada (None si el otro árbol está vacío)
+        """
+        nuevos_ids: Dict[int, int] = {}
         
-        # Marcar este nodo
-        self.nodos[nodo_id].estado = 'exito'
+        # Los IDs crecen con la creación: cada padre se copia antes que sus hijos
+        for nodo_id in sorted(otro.nodos):
+            nodo = otro.nodos[nodo_id]
+            padre = padre_id if nodo.padre_id is None else nuevos_ids.get(nodo.padre_id, padre_id)
+            nuevo_id = self.agregar_nodo(nodo.tipo, nodo.datos, padre_id=padre)
+            self.nodos[nuevo_id].estado = nodo.estado
+            nuevos_ids[nodo_id] = nuevo_id
         
-        # Propagar hacia arriba
-        padre_id = self.nodos[nodo_id].padre_id
-        if padre_id is not None:
-            self.marcar_exito(padre_id)
+        return nuevos_ids.get(otro.raiz_id)
     
     def obtener_camino_solucion(self) -> List[int]:
         """
@@ -139,17 +161,18 @@ class ArbolDecisiones:
         
         camino = []
         
-        def recorrer(nodo_id: int):
+        # Recorrido en profundidad con pila explícita (mismo orden que el recursivo)
+        pendientes = [self.raiz_id]
+        while pendientes:
+            nodo_id = pendientes.pop()
             if nodo_id not in self.nodos:
-                return
+                continue
             
             nodo = self.nodos[nodo_id]
             if nodo.estado == 'exito':
                 camino.append(nodo_id)
-                for hijo_id in nodo.hijos_ids:
-                    recorrer(hijo_id)
+                pendientes.extend(reversed(nodo.hijos_ids))
         
-        recorrer(self.raiz_id)
         return camino
     
     def obtener_estadisticas(self) -> Dict[str, Any]:
@@ -3,24 +3,65 @@ Algoritmo de Backtracking para resolver el University Timetabling Problem.
 Implementa búsqueda recursiva con poda y heurísticas para eficiencia.
 """
 
+import io
+import os
 import time
-from typing import List, Dict, Any, Optional, Tuple
+import random
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import Manager
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple, Set
 from copy import deepcopy
 
 from ..core.modelos import Grupo, Materia, Profesor
-from ..core.grafo_conflictos import GrafoConflictos
-from ..core.config import get_all_slots, DIAS_SEMANA
+from ..core.grafo_conflictos import GrafoConflictos, NodoAsignacion
 
-from .restricciones import validar_restricciones_duras, verificar_solucion_completa
-from .heuristicas import aplicar_heuristicas_combinadas, seleccionar_mejor_slot
+from .estado_compacto import (
+    EstadoCompacto, TablaPendientes, SLOTS_POR_TURNO, MASCARA_TURNO, VACIO,
+    contar_bits, slots_posteriores
+)
+from .restricciones import causas_conflicto, mascara_slots_validos, verificar_solucion_completa
+from .forward_checking import DominiosFC
+from .nogoods import AlmacenNogoods
+from .descomposicion import Subproblema, descomponer_problema
+from .recocido import optimizar_recocido
+from .heuristicas import seleccionar_mejor_slot, ColaMRV
 from .arbol_decisiones import ArbolDecisiones
 
 
+# Estrategias de reinicio: cortes de nodos por ejecución
+ESTRATEGIAS_REINICIO = ('luby', 'geometrico')
+
+# Crecimiento del corte en la estrategia geométrica
+FACTOR_GEOMETRICO = 1.5
+
+# Decisiones (además de la profundidad) para completar un horario sin mover
+# las clases previas antes de resolver desde cero (minimizar_cambios)
+NODOS_CONSERVACION = 2000
+
+
 def resolver_backtracking(
     grupos: List[Grupo],
     materias: List[Materia],
     profesores: List[Profesor],
-    grafo: GrafoConflictos
+    grafo: GrafoConflictos,
+    forward_checking: bool = False,
+    iterativo: bool = False,
+    max_nodos: Optional[int] = None,
+    max_segundos: Optional[float] = None,
+    cancelacion: Optional[Any] = None,
+    reinicios: Optional[str] = None,
+    corte_inicial: int = 100,
+    semilla: Optional[int] = None,
+    portafolio: Optional[int] = None,
+    backjumping: bool = False,
+    nogoods: Optional[int] = None,
+    simetria: bool = False,
+    descomponer: Optional[int] = None,
+    recocido: Optional[float] = None,
+    horario_previo: Optional[Dict] = None,
+    minimizar_cambios: bool = False
 ) -> Tuple[Optional[Dict], ArbolDecisiones, Dict[str, Any]]:
     """
     Resuelve el problema de horarios usando backtracking con heurísticas.
@@ -33,99 +74,620 @@ def resolver_backtracking(
         materias: Lista de materias
         profesores: Lista de profesores
         grafo: Grafo de conflictos
+        forward_checking: Si es True, mantiene los dominios de las asignaciones
+                          pendientes y poda en cuanto uno no alcanza sus horas
+        iterativo: Si es True, usa BuscadorIterativo (pila explícita, sin
+                   límite de recursión) en lugar de _backtrack_recursivo
+        max_nodos: Máximo de decisiones a probar (None = sin límite)
+        max_segundos: Tiempo máximo de búsqueda (None = sin límite)
+        cancelacion: Objeto con is_set() (p. ej. threading.Event) para
+                     cancelar la búsqueda desde otro hilo o proceso
+        reinicios: 'luby' o 'geometrico' para reiniciar la búsqueda cada vez
+                   que una ejecución agota su corte de nodos (None = sin reinicios)
+        corte_inicial: Nodos de la primera ejecución (unidad de la secuencia)
+        semilla: Semilla del desempate aleatorio de MRV y LCV. Con reinicios
+                 el desempate siempre es aleatorio (sin semilla, no reproducible)
+        portafolio: Número de procesos que resuelven en paralelo con distintas
+                    configuraciones (ver configuraciones_portafolio); se retorna
+                    la primera solución completa (0 = un proceso por CPU)
+        backjumping: Si es True, al agotarse un nivel se salta directamente a
+                     la decisión más profunda responsable del conflicto
+                     (conflict-directed backjumping) en lugar de a la anterior
+        nogoods: Capacidad del almacén de nogoods (None = sin aprendizaje).
+                 Cada conjunto de conflicto de un nivel agotado se guarda y
+                 se poda cualquier rama que lo repita, también tras un
+                 reinicio. Activa backjumping, del que obtiene los conflictos
+        simetria: Si es True, rompe simetrías: las horas de una misma
+                  asignación se colocan en slots crecientes y, entre
+                  profesores intercambiables aún sin horas, solo se prueba uno
+        descomponer: Si se indica, resuelve por separado los subproblemas
+                     independientes (ver descomponer_problema) con este número
+                     de procesos (0 = uno por CPU, 1 = secuencial) y une sus
+                     horarios. max_nodos aplica a cada subproblema y
+                     max_segundos al total. Con portafolio, los subproblemas
+                     se resuelven uno tras otro, cada uno con su portafolio
+        recocido: Segundos de recocido simulado (ver optimizar_recocido) para
+                  mejorar el score de calidad de la solución encontrada, sin
+                  romper restricciones duras (None = se retorna tal cual)
+        horario_previo: Horario de una ejecución anterior (ej: del periodo
+                        pasado) usado como pista: cada asignación prueba
+                        primero los slots y profesores que tenía en él
+        minimizar_cambios: Si es True (con horario_previo), primero se
+                           intenta completar el horario dejando fijas las
+                           clases previas que siguen siendo válidas (ver
+                           _conservar_previo) y solo si no se logra se
+                           resuelve desde cero con las pistas
     
     Returns:
         Tupla (horario_completo, arbol_decisiones, estadisticas)
-        - horario_completo: None si no hay solución
+        - horario_completo: None si no hay solución. Si se indicó algún
+          presupuesto y no se halló solución completa, es el mejor horario
+          parcial encontrado (el de más horas asignadas)
         - arbol_decisiones: Árbol con el proceso de búsqueda
-        - estadisticas: Métricas del algoritmo
+        - estadisticas: Métricas del algoritmo; incluye 'solucion_completa',
+          'presupuesto_agotado', 'horas_asignadas' y 'asignaciones_faltantes'
+          (lista de (grupo, materia, horas) sin asignar) y, con reinicios,
+          'reinicios' (estadísticas de cada ejecución), con nogoods,
+          'nogoods' (uso del almacén), con portafolio, 'portafolio'
+          (configuración ganadora y desenlace de cada proceso) y, con
+          descomponer, 'descomposicion' (grupos y desenlace de cada subproblema)
+          y, con recocido, 'recocido' (score antes y después de optimizar)
+          y, con horario_previo, 'cambios' (ver contar_cambios)
+    
+    Raises:
+        ValueError: Si la estrategia de reinicios o la capacidad de nogoods
+                    no son válidas
     """
+    if reinicios is not None and reinicios not in ESTRATEGIAS_REINICIO:
+        raise ValueError(
+            f"Estrategia de reinicios inválida: {reinicios}. Use una de {ESTRATEGIAS_REINICIO}"
+        )
+    if nogoods is not None and nogoods <= 0:
+        raise ValueError(f"Capacidad de nogoods inválida: {nogoods}")
+    
+    if descomponer is not None:
+        horario, arbol, estadisticas = _resolver_descompuesto(
+            grupos, materias, profesores, grafo,
+            descomponer or os.cpu_count() or 1,
+            {
+                'forward_checking': forward_checking,
+                'iterativo': iterativo,
+                'max_nodos': max_nodos,
+                'max_segundos': max_segundos,
+                'reinicios': reinicios,
+                'corte_inicial': corte_inicial,
+                'semilla': semilla,
+                'portafolio': portafolio,
+                'backjumping': backjumping,
+                'nogoods': nogoods,
+                'simetria': simetria,
+                'recocido': recocido,
+                'horario_previo': horario_previo,
+                'minimizar_cambios': minimizar_cambios
+            },
+            cancelacion
+        )
+        if horario_previo is not None and horario is not None:
+            # Los subproblemas solo cuentan los cambios de sus propios grupos
+            estadisticas['cambios'] = contar_cambios(horario_previo, horario)
+        return horario, arbol, estadisticas
+    
+    if portafolio is not None:
+        return _resolver_portafolio(
+            grupos, materias, profesores, grafo,
+            portafolio or os.cpu_count() or 1,
+            {
+                'forward_checking': forward_checking,
+                'max_nodos': max_nodos,
+                'max_segundos': max_segundos,
+                'reinicios': reinicios,
+                'corte_inicial': corte_inicial,
+                'semilla': semilla,
+                'backjumping': backjumping,
+                'nogoods': nogoods,
+                'simetria': simetria,
+                'recocido': recocido,
+                'horario_previo': horario_previo,
+                'minimizar_cambios': minimizar_cambios
+            },
+            cancelacion
+        )
+    
     print("🚀 Iniciando algoritmo de Backtracking...")
     print("=" * 70)
     
     tiempo_inicio = time.time()
     
     # Inicializar estado
-    estado = _inicializar_estado(grupos, materias, profesores)
+    estado = _inicializar_estado(
+        grupos, materias, profesores, forward_checking, grafo, simetria, previo=horario_previo
+    )
+    estado['max_nodos'] = max_nodos
+    estado['limite_tiempo'] = tiempo_inicio + max_segundos if max_segundos is not None else None
+    estado['cancelacion'] = cancelacion
+    estado['backjumping'] = backjumping or nogoods is not None
+    if nogoods is not None:
+        estado['nogoods'] = AlmacenNogoods(nogoods)
+    con_presupuesto = max_nodos is not None or max_segundos is not None or cancelacion is not None
+    
+    # Desempate aleatorio (reproducible con semilla)
+    if semilla is not None or reinicios is not None:
+        estado['aleatorio'] = random.Random(semilla)
+        estado['cola'].barajar(estado['aleatorio'])
     
     # Crear árbol de decisiones
     arbol = ArbolDecisiones()
     arbol.agregar_nodo('raiz', {'descripcion': 'Estado inicial'})
     
-    print(f"📊 Asignaciones a realizar: {len(estado['asignaciones_pendientes'])}")
+    print(f"📊 Asignaciones a realizar: {len(estado['pendientes'])}")
     print(f"📊 Slots disponibles por turno: 35 (5 días × 7 horas)")
     print()
     
-    # Ejecutar backtracking recursivo
+    # Ejecutar backtracking (recursivo o con pila explícita)
     print("🔍 Explorando espacio de soluciones...")
-    resultado = _backtrack_recursivo(estado, 0, arbol, grafo, grupos)
+    resultado = None
+    if minimizar_cambios and horario_previo is not None:
+        resultado = _conservar_previo(estado, arbol, grafo, grupos, horario_previo, iterativo)
+    if resultado is not None:
+        print(f"♻️  Completado sin mover {estado['conservacion']['clases_fijas']} "
+              f"clases del horario previo")
+    elif forward_checking and not estado['dominios'].es_consistente():
+        # Alguna asignación no tiene slots suficientes desde el inicio
+        resultado = None
+    elif reinicios is not None:
+        resultado = _buscar_con_reinicios(
+            estado, arbol, grafo, grupos, iterativo, reinicios, corte_inicial
+        )
+    else:
+        resultado = _ejecutar_busqueda(estado, arbol, grafo, grupos, iterativo)
+    
+    # Mejor resultado parcial (anytime): el estado con más horas asignadas
+    _registrar_mejor_parcial(estado)
+    horas_asignadas = len(estado['mejor_rastro'])
+    faltantes = _asignaciones_faltantes(estado, estado['mejor_rastro'])
+    if resultado is not None:
+        horas_asignadas = sum(estado['pendientes'].horas_iniciales)
+        faltantes = []
+    elif con_presupuesto:
+        resultado_parcial = _horario_desde_rastro(estado, estado['mejor_rastro'])
     
     tiempo_fin = time.time()
     tiempo_total = tiempo_fin - tiempo_inicio
     
     # Generar estadísticas
+    estadisticas = _metricas_arbol(arbol, tiempo_total, resultado is not None)
+    estadisticas.update({
+        'nodos_decision': estado['nodos'],
+        'solucion_completa': resultado is not None,
+        'presupuesto_agotado': estado['abortado'],
+        'horas_asignadas': horas_asignadas,
+        'asignaciones_faltantes': faltantes
+    })
+    if reinicios is not None:
+        estadisticas['reinicios'] = estado['reinicios']
+        print(f"\n🔄 Ejecuciones con reinicios ({reinicios}): {len(estado['reinicios'])}")
+    if nogoods is not None:
+        estadisticas['nogoods'] = estado['nogoods'].estadisticas()
+        print(f"🧠 Nogoods aprendidos: {estadisticas['nogoods']['aprendidos']}, "
+              f"podas por nogoods: {estadisticas['nogoods']['podas']}")
+    if 'conservacion' in estado:
+        estadisticas['conservacion'] = estado['conservacion']
+    
+    if resultado:
+        print("\n✅ ¡SOLUCIÓN ENCONTRADA!")
+        print("=" * 70)
+        
+        # Marcar camino exitoso en el árbol
+        if arbol.nodo_actual_id is not None:
+            arbol.marcar_exito(arbol.nodo_actual_id)
+        
+        # Fase de optimización: mejorar restricciones blandas
+        if recocido is not None:
+            resultado, estadisticas['recocido'] = optimizar_recocido(
+                resultado, grupos, materias, profesores,
+                max_segundos=recocido, semilla=semilla, cancelacion=cancelacion
+            )
+            print(f"🔥 Recocido simulado: score {estadisticas['recocido']['puntaje_inicial']} → "
+                  f"{estadisticas['recocido']['puntaje_final']}")
+        
+        if horario_previo is not None:
+            estadisticas['cambios'] = contar_cambios(horario_previo, resultado)
+            print(f"♻️  Clases del horario previo conservadas: "
+                  f"{estadisticas['cambios']['conservadas']}/{estadisticas['cambios']['previas']}")
+    else:
+        if estado['abortado']:
+            print("\n⏱️  Presupuesto de búsqueda agotado")
+        print("\n❌ No se encontró solución válida")
+        print("=" * 70)
+        
+        if con_presupuesto:
+            print(f"📋 Mejor horario parcial: {horas_asignadas} horas asignadas, "
+                  f"{len(faltantes)} asignaciones incompletas")
+            if horario_previo is not None:
+                estadisticas['cambios'] = contar_cambios(horario_previo, resultado_parcial)
+            return resultado_parcial, arbol, estadisticas
+    
+    return resultado, arbol, estadisticas
+
+
+def _metricas_arbol(arbol: ArbolDecisiones, tiempo_total: float, exito: bool) -> Dict[str, Any]:
+    """Métricas del árbol de búsqueda comunes a todos los modos de resolución."""
     nodos_con_hijos = sum(1 for n in arbol.nodos.values() if n.hijos_ids)
     total_hijos = sum(len(n.hijos_ids) for n in arbol.nodos.values())
     factor_ramificacion = total_hijos / nodos_con_hijos if nodos_con_hijos > 0 else 0
     
-    estadisticas = {
+    return {
         'tiempo_total': tiempo_total,
         'nodos_explorados': len(arbol.nodos),
         'backtracks_realizados': sum(1 for n in arbol.nodos.values() if n.estado == 'fallo'),
         'profundidad_maxima': max((n.profundidad for n in arbol.nodos.values()), default=0),
         'nodos_por_segundo': len(arbol.nodos) / tiempo_total if tiempo_total > 0 else 0,
         'factor_ramificacion': factor_ramificacion,
-        'tasa_exito': 100.0 if resultado else 0.0,
+        'tasa_exito': 100.0 if exito else 0.0,
         'longitud_solucion': len(arbol.obtener_camino_solucion()),
         'nodos_exito': sum(1 for n in arbol.nodos.values() if n.estado == 'exito'),
         'nodos_por_tipo': {}
     }
+
+
+def configuraciones_portafolio(num_procesos: int, base: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Genera configuraciones distintas de resolver_backtracking para el portafolio.
     
-    if resultado:
-        print("\n✅ ¡SOLUCIÓN ENCONTRADA!")
-        print("=" * 70)
+    El proceso 0 usa la configuración pedida tal cual; el 1, la misma sin
+    forward checking (o con él, si no estaba activo); el resto usa
+    forward checking con reinicios Luby o geométricos alternados y
+    semillas distintas, de modo que cada uno rompe los empates de MRV y
+    LCV en otro orden.
+    
+    Args:
+        num_procesos: Número de configuraciones a generar
+        base: Parámetros de resolver_backtracking pedidos por el usuario
+    
+    Returns:
+        Lista de diccionarios de parámetros, uno por proceso
+    """
+    semilla_base = base.get('semilla') or 0
+    configuraciones = []
+    for i in range(num_procesos):
+        configuracion = dict(base, iterativo=True)
+        if i == 1:
+            configuracion['forward_checking'] = not base.get('forward_checking', False)
+        elif i >= 2:
+            configuracion['forward_checking'] = True
+            configuracion['reinicios'] = ESTRATEGIAS_REINICIO[i % len(ESTRATEGIAS_REINICIO)]
+            configuracion['semilla'] = semilla_base + i
+        configuraciones.append(configuracion)
+    return configuraciones
+
+
+def _resolver_en_silencio(
+    grupos: List[Grupo],
+    materias: List[Materia],
+    profesores: List[Profesor],
+    grafo: GrafoConflictos,
+    configuracion: Dict[str, Any],
+    cancelacion: Any
+) -> Tuple[Optional[Dict], ArbolDecisiones, Dict[str, Any]]:
+    """Ejecuta resolver_backtracking sin imprimir (procesos del portafolio y subproblemas)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return resolver_backtracking(
+            grupos, materias, profesores, grafo,
+            cancelacion=cancelacion,
+            **configuracion
+        )
+
+
+def _resolver_portafolio(
+    grupos: List[Grupo],
+    materias: List[Materia],
+    profesores: List[Profesor],
+    grafo: GrafoConflictos,
+    num_procesos: int,
+    base: Dict[str, Any],
+    cancelacion: Optional[Any]
+) -> Tuple[Optional[Dict], ArbolDecisiones, Dict[str, Any]]:
+    """
+    Lanza un proceso por configuración y se queda con la primera solución.
+    
+    Al llegar una solución completa (o la prueba de que no existe, de un
+    proceso exhaustivo) se cancela al resto con un Event compartido, que
+    los procesos consultan como token de cancelación. Si ninguno completa
+    el horario se retorna el resultado con más horas asignadas.
+    """
+    print(f"🚀 Iniciando portafolio de Backtracking ({num_procesos} procesos)...")
+    print("=" * 70)
+    
+    tiempo_inicio = time.time()
+    configuraciones = configuraciones_portafolio(num_procesos, base)
+    
+    mejor = None
+    mejor_indice = None
+    desenlaces: List[Optional[str]] = [None] * num_procesos
+    decidido = False
+    with Manager() as gestor, ProcessPoolExecutor(max_workers=num_procesos) as ejecutor:
+        detener = gestor.Event()
+        futuros = {
+            ejecutor.submit(
+                _resolver_en_silencio,
+                grupos, materias, profesores, grafo, configuracion, detener
+            ): i
+            for i, configuracion in enumerate(configuraciones)
+        }
         
-        # Marcar camino exitoso en el árbol
-        if arbol.nodo_actual_id is not None:
-            arbol.marcar_exito(arbol.nodo_actual_id)
+        pendientes = set(futuros)
+        while pendientes:
+            listos, pendientes = wait(pendientes, timeout=0.1, return_when=FIRST_COMPLETED)
+            
+            # Reenviar la cancelación del usuario a los procesos
+            if cancelacion is not None and cancelacion.is_set():
+                detener.set()
+            
+            for futuro in listos:
+                indice = futuros[futuro]
+                resultado = futuro.result()
+                estadisticas = resultado[2]
+                if estadisticas['solucion_completa']:
+                    desenlaces[indice] = 'solucion'
+                elif estadisticas['presupuesto_agotado']:
+                    desenlaces[indice] = 'presupuesto'
+                else:
+                    desenlaces[indice] = 'sin_solucion'
+                
+                # Una solución, o la prueba de que no hay, termina el portafolio;
+                # los procesos cancelados después ya no reemplazan ese resultado
+                if decidido:
+                    continue
+                if desenlaces[indice] != 'presupuesto':
+                    mejor, mejor_indice = resultado, indice
+                    decidido = True
+                    detener.set()
+                elif mejor is None or estadisticas['horas_asignadas'] > mejor[2]['horas_asignadas']:
+                    mejor, mejor_indice = resultado, indice
+    
+    horario, arbol, estadisticas = mejor
+    estadisticas['tiempo_total'] = time.time() - tiempo_inicio
+    estadisticas['portafolio'] = {
+        'procesos': num_procesos,
+        'ganador': mejor_indice,
+        'configuracion': configuraciones[mejor_indice],
+        'desenlaces': desenlaces
+    }
+    
+    if estadisticas['solucion_completa']:
+        print(f"\n✅ ¡SOLUCIÓN ENCONTRADA! (proceso {mejor_indice})")
     else:
-        print("\n❌ No se encontró solución válida")
-        print("=" * 70)
+        print("\n❌ Ningún proceso encontró solución válida")
+    print(f"⏱️  Tiempo total: {estadisticas['tiempo_total']:.2f}s")
+    print("=" * 70)
     
-    return resultado, arbol, estadisticas
+    return horario, arbol, estadisticas
+
+
+def _resolver_descompuesto(
+    grupos: List[Grupo],
+    materias: List[Materia],
+    profesores: List[Profesor],
+    grafo: GrafoConflictos,
+    num_procesos: int,
+    opciones: Dict[str, Any],
+    cancelacion: Optional[Any]
+) -> Tuple[Optional[Dict], ArbolDecisiones, Dict[str, Any]]:
+    """
+    Resuelve por separado los subproblemas independientes y une sus horarios.
+    
+    Con varios procesos cada subproblema corre en el suyo y, si alguno prueba
+    que no tiene solución, se cancela al resto con un Event compartido (como
+    en el portafolio). El árbol resultante cuelga de la raíz un nodo
+    'subproblema' por parte, con el árbol de su búsqueda injertado debajo.
+    """
+    print(f"🚀 Iniciando Backtracking por subproblemas ({num_procesos} procesos)...")
+    print("=" * 70)
+    
+    tiempo_inicio = time.time()
+    subproblemas = descomponer_problema(grupos, materias, profesores, grafo)
+    print(f"🧩 Subproblemas independientes: {len(subproblemas)} "
+          f"({', '.join(str(s.num_asignaciones) for s in subproblemas)} asignaciones)")
+    
+    resultados: List[Optional[Tuple]] = [None] * len(subproblemas)
+    paralelo = (num_procesos > 1 and len(subproblemas) > 1
+                and opciones.get('portafolio') is None)
+    if paralelo:
+        with Manager() as gestor, ProcessPoolExecutor(
+            max_workers=min(num_procesos, len(subproblemas))
+        ) as ejecutor:
+            detener = gestor.Event()
+            futuros = {
+                ejecutor.submit(
+                    _resolver_en_silencio,
+                    sub.grupos, sub.materias, sub.profesores, grafo, opciones, detener
+                ): i
+                for i, sub in enumerate(subproblemas)
+            }
+            
+            pendientes = set(futuros)
+            while pendientes:
+                listos, pendientes = wait(pendientes, timeout=0.1, return_when=FIRST_COMPLETED)
+                
+                # Reenviar la cancelación del usuario a los procesos
+                if cancelacion is not None and cancelacion.is_set():
+                    detener.set()
+                
+                for futuro in listos:
+                    resultado = futuro.result()
+                    resultados[futuros[futuro]] = resultado
+                    if _desenlace(resultado[2]) == 'sin_solucion':
+                        detener.set()
+    else:
+        limite_tiempo = (tiempo_inicio + opciones['max_segundos']
+                         if opciones.get('max_segundos') is not None else None)
+        for i, sub in enumerate(subproblemas):
+            if cancelacion is not None and cancelacion.is_set():
+                break
+            configuracion = dict(opciones)
+            if limite_tiempo is not None:
+                configuracion['max_segundos'] = max(0.0, limite_tiempo - time.time())
+            resultados[i] = _resolver_en_silencio(
+                sub.grupos, sub.materias, sub.profesores, grafo, configuracion, cancelacion
+            )
+            if _desenlace(resultados[i][2]) == 'sin_solucion':
+                break
+    
+    horario, arbol, estadisticas = _unir_subproblemas(
+        grupos, subproblemas, resultados, time.time() - tiempo_inicio
+    )
+    
+    con_presupuesto = (opciones.get('max_nodos') is not None
+                       or opciones.get('max_segundos') is not None
+                       or cancelacion is not None)
+    if estadisticas['solucion_completa']:
+        print("\n✅ ¡SOLUCIÓN ENCONTRADA! (todos los subproblemas)")
+    else:
+        print("\n❌ No se encontró solución válida en todos los subproblemas")
+        if not con_presupuesto:
+            horario = None
+    print(f"⏱️  Tiempo total: {estadisticas['tiempo_total']:.2f}s")
+    print("=" * 70)
+    
+    return horario, arbol, estadisticas
+
+
+def _desenlace(estadisticas: Dict[str, Any]) -> str:
+    """Clasifica el resultado de una búsqueda: 'solucion', 'presupuesto' o 'sin_solucion'."""
+    if estadisticas['solucion_completa']:
+        return 'solucion'
+    if estadisticas['presupuesto_agotado']:
+        return 'presupuesto'
+    return 'sin_solucion'
+
+
+def _unir_subproblemas(
+    grupos: List[Grupo],
+    subproblemas: List[Subproblema],
+    resultados: List[Optional[Tuple]],
+    tiempo_total: float
+) -> Tuple[Dict, ArbolDecisiones, Dict[str, Any]]:
+    """
+    Une horarios, árboles y estadísticas de los subproblemas.
+    
+    Los subproblemas sin resultado (cancelados antes de empezar) cuentan todas
+    sus asignaciones como faltantes. Los grupos sin clases en ningún
+    subproblema reciben un horario vacío.
+    """
+    arbol = ArbolDecisiones()
+    raiz_id = arbol.agregar_nodo('raiz', {'descripcion': 'Estado inicial'})
+    
+    horario_parcial: Dict = {}
+    faltantes: List[Tuple[str, str, int]] = []
+    detalle = []
+    nodos_subproblema = []
+    for i, (sub, resultado) in enumerate(zip(subproblemas, resultados)):
+        nodo_id = arbol.agregar_nodo('subproblema', {
+            'descripcion': f"Subproblema {i + 1}",
+            'grupos': [g.nombre for g in sub.grupos],
+            'asignaciones': sub.num_asignaciones
+        }, padre_id=raiz_id)
+        nodos_subproblema.append(nodo_id)
+        
+        if resultado is None:
+            faltantes.extend(
+                (g.nombre, m.nombre, m.horas_semana)
+                for m in sub.materias for g in m.grupos_que_cursan
+            )
+            detalle.append({
+                'grupos': [g.nombre for g in sub.grupos],
+                'asignaciones': sub.num_asignaciones,
+                'desenlace': 'cancelado',
+                'nodos_decision': 0,
+                'tiempo': 0.0
+            })
+            continue
+        
+        horario_sub, arbol_sub, est = resultado
+        arbol.injertar(arbol_sub, nodo_id)
+        if horario_sub:
+            horario_parcial.update(horario_sub)
+        faltantes.extend(est['asignaciones_faltantes'])
+        detalle.append({
+            'grupos': [g.nombre for g in sub.grupos],
+            'asignaciones': sub.num_asignaciones,
+            'desenlace': _desenlace(est),
+            'nodos_decision': est['nodos_decision'],
+            'tiempo': est['tiempo_total']
+        })
+    
+    completa = all(d['desenlace'] == 'solucion' for d in detalle)
+    if completa:
+        for nodo_id in nodos_subproblema:
+            arbol.marcar_exito(nodo_id)
+    
+    # Grupos sin asignaciones: horario vacío, en el orden original de grupos
+    sin_horario = [g for g in grupos if g.nombre not in horario_parcial]
+    horario_parcial.update(EstadoCompacto(sin_horario, [], []).a_horario())
+    horario = {g.nombre: horario_parcial[g.nombre] for g in grupos}
+    
+    estadisticas = _metricas_arbol(arbol, tiempo_total, completa)
+    estadisticas.update({
+        'nodos_decision': sum(d['nodos_decision'] for d in detalle),
+        'solucion_completa': completa,
+        # Un subproblema sin solución decide, aunque se haya cancelado a otros
+        'presupuesto_agotado': (any(d['desenlace'] == 'presupuesto' for d in detalle)
+                                and not any(d['desenlace'] == 'sin_solucion' for d in detalle)),
+        'horas_asignadas': sum(r[2]['horas_asignadas'] for r in resultados if r is not None),
+        'asignaciones_faltantes': faltantes,
+        'descomposicion': detalle
+    })
+    return horario, arbol, estadisticas
 
 
 def _inicializar_estado(
     grupos: List[Grupo],
     materias: List[Materia],
-    profesores: List[Profesor]
+    profesores: List[Profesor],
+    forward_checking: bool = False,
+    grafo: Optional[GrafoConflictos] = None,
+    simetria: bool = False,
+    fijas: Optional[Dict] = None,
+    previo: Optional[Dict] = None
 ) -> Dict[str, Any]:
     """
     Inicializa el estado del algoritmo.
     
+    Con fijas (un horario anidado), esas clases ocupan sus slots desde el
+    inicio y se descuentan de las horas pendientes: la búsqueda solo coloca
+    el resto (ver optimizar_lns). Con previo (otro horario anidado), sus
+    clases solo se guardan como pistas para el orden de los candidatos.
+    
     Returns:
         Diccionario con:
-        - horario: Matriz 3D vacía
-        - profesor_ocupado: Tracking de ocupación de profesores
-        - horas_asignadas_profesor: Horas ya asignadas a cada profesor
-        - asignaciones_pendientes: Cola de asignaciones por hacer
-    """
-    # Inicializar horario vacío (matriz 3D)
-    horario = {}
-    for grupo in grupos:
-        horario[grupo.nombre] = {}
-        for dia in DIAS_SEMANA:
-            horario[grupo.nombre][dia] = {}
-            # Inicializar todos los slots del turno
-            slots = get_all_slots(grupo.turno)
-            for slot in slots:
-                if slot.dia == dia:
-                    slot_key = f"{slot.hora_inicio}-{slot.hora_fin}"
-                    horario[grupo.nombre][dia][slot_key] = None
-    
-    # Tracking de profesores
-    profesor_ocupado = {p.nombre: {dia: {} for dia in DIAS_SEMANA} for p in profesores}
-    horas_asignadas_profesor = {p.nombre: 0 for p in profesores}
+        - compacto: EstadoCompacto con la ocupación de grupos y profesores
+          indexada por enteros (el horario anidado se genera al final)
+        - pendientes: TablaPendientes con las asignaciones por hacer
+        - rastro: Pila de decisiones tomadas, para deshacerlas en O(1)
+        - dominios: DominiosFC con los slots válidos de cada asignación
+        - cola: ColaMRV para elegir la asignación más restringida
+        - forward_checking: Si se poda cuando un dominio no alcanza sus horas
+        - nodos: Decisiones probadas hasta ahora
+        - max_nodos, limite_tiempo, cancelacion: Presupuesto de búsqueda
+        - corte_reinicio: Nodos (acumulados) en que termina la ejecución actual
+        - abortado: True si la búsqueda se detuvo por el presupuesto o el corte
+        - motivo_parada: 'presupuesto' o 'reinicio' cuando abortado es True
+        - mejor_rastro: Copia del rastro con más horas asignadas
+        - aleatorio: random.Random para desempates (None = determinista)
+        - reinicios: Estadísticas de cada ejecución en modo reinicios
+        - backjumping: Si se salta a la decisión responsable del conflicto
+        - conflicto: Niveles responsables del fallo del último nivel agotado
+          o del último candidato podado
+        - nogoods: AlmacenNogoods con los conflictos aprendidos (None = sin aprendizaje)
+        - simetria: Si se rompen las simetrías entre horas y entre profesores
+        - slots_asignacion: Bitset de slots locales usados por cada asignación
+        - orden_calidad: Si LCV prioriza el score de calidad (ver seleccionar_mejor_slot)
+        - previo: {slot local: profesor_id} de cada asignación en el horario
+          previo (None = sin pistas)
+        - ocupados_previo: Bitset de slots locales ocupados de cada grupo en
+          el horario previo
+    """
+    compacto = EstadoCompacto(grupos, materias, profesores)
     
     # Crear lista de asignaciones pendientes
     asignaciones_pendientes = []
@@ -144,11 +706,340 @@ def _inicializar_estado(
                 profesores_posibles
             ))
     
+    pendientes = TablaPendientes(asignaciones_pendientes)
+    if fijas is not None:
+        compacto.cargar_horario(fijas, fijas=True)
+        for celda, materia_id in enumerate(compacto.materia_en):
+            if materia_id == VACIO:
+                continue
+            clave = (compacto.grupos[celda // SLOTS_POR_TURNO].nombre, compacto.materias[materia_id].nombre)
+            asignacion_id = pendientes.id_asignacion.get(clave)
+            if asignacion_id is not None and pendientes.horas_restantes[asignacion_id] > 0:
+                pendientes.descontar_hora(asignacion_id)
+    
+    # Pistas del horario previo: slot y profesor de cada hora por asignación
+    pistas = None
+    ocupados_previo = [0] * len(compacto.grupos)
+    if previo is not None:
+        anterior = EstadoCompacto(grupos, materias, profesores)
+        anterior.cargar_horario(previo)
+        ocupados_previo = anterior.mascara_grupo
+        pistas = [{} for _ in pendientes.asignaciones]
+        for celda, materia_id in enumerate(anterior.materia_en):
+            if materia_id == VACIO:
+                continue
+            clave = (anterior.grupos[celda // SLOTS_POR_TURNO].nombre, anterior.materias[materia_id].nombre)
+            asignacion_id = pendientes.id_asignacion.get(clave)
+            if asignacion_id is not None:
+                pistas[asignacion_id][celda % SLOTS_POR_TURNO] = anterior.profesor_en[celda]
+    slots_asignacion = [0] * len(pendientes.asignaciones)
+    
+    dominios = DominiosFC(
+        compacto,
+        [
+            (compacto.id_grupo[g.nombre], [compacto.id_profesor[p.nombre] for p in profs])
+            for g, _, profs in pendientes.asignaciones
+        ],
+        pendientes.horas_restantes,
+        slots_asignacion if simetria else None
+    )
+    
+    # Grado de cada asignación en el grafo (desempate de MRV)
+    grados = []
+    for g, m, _ in pendientes.asignaciones:
+        nodo = NodoAsignacion(
+            grupo_nombre=g.nombre,
+            materia_nombre=m.nombre,
+            cuatrimestre=m.cuatrimestre
+        )
+        grados.append(grafo.obtener_grado(nodo) if grafo is not None and nodo in grafo.nodos else 0)
+    
+    cola = ColaMRV(dominios.dominios, pendientes.horas_restantes, grados)
+    dominios.cola = cola
+    
     return {
-        'horario': horario,
-        'profesor_ocupado': profesor_ocupado,
-        'horas_asignadas_profesor': horas_asignadas_profesor,
-        'asignaciones_pendientes': asignaciones_pendientes
+        'compacto': compacto,
+        'pendientes': pendientes,
+        'rastro': [],
+        'dominios': dominios,
+        'cola': cola,
+        'forward_checking': forward_checking,
+        'nodos': 0,
+        'max_nodos': None,
+        'limite_tiempo': None,
+        'cancelacion': None,
+        'corte_reinicio': None,
+        'abortado': False,
+        'motivo_parada': None,
+        'mejor_rastro': [],
+        'aleatorio': None,
+        'reinicios': [],
+        'backjumping': False,
+        'conflicto': set(),
+        'nogoods': None,
+        'simetria': simetria,
+        'slots_asignacion': slots_asignacion,
+        'orden_calidad': False,
+        'previo': pistas,
+        'ocupados_previo': ocupados_previo
+    }
+
+
+def _ejecutar_busqueda(
+    estado: Dict,
+    arbol: ArbolDecisiones,
+    grafo: GrafoConflictos,
+    grupos: List[Grupo],
+    iterativo: bool
+) -> Optional[Dict]:
+    """Ejecuta una búsqueda desde el nodo actual del árbol con el motor elegido."""
+    if iterativo:
+        return BuscadorIterativo(estado, arbol).ejecutar()
+    return _backtrack_recursivo(estado, 0, arbol, grafo, grupos)
+
+
+def secuencia_luby(i: int) -> int:
+    """
+    Término i-ésimo (desde 1) de la secuencia de Luby: 1, 1, 2, 1, 1, 2, 4, 1, ...
+    
+    Multiplicada por un corte base da una política de reinicios universal
+    (óptima salvo un factor logarítmico sin conocer la distribución de tiempos).
+    """
+    k = 1
+    while True:
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        if (1 << (k - 1)) <= i < (1 << k) - 1:
+            i -= (1 << (k - 1)) - 1
+            k = 1
+        else:
+            k += 1
+
+
+def _corte_reinicio(estrategia: str, numero: int, corte_inicial: int) -> int:
+    """Nodos permitidos a la ejecución número `numero` (desde 1)."""
+    if estrategia == 'luby':
+        return corte_inicial * secuencia_luby(numero)
+    return int(corte_inicial * FACTOR_GEOMETRICO ** (numero - 1))
+
+
+def _buscar_con_reinicios(
+    estado: Dict,
+    arbol: ArbolDecisiones,
+    grafo: GrafoConflictos,
+    grupos: List[Grupo],
+    iterativo: bool,
+    estrategia: str,
+    corte_inicial: int
+) -> Optional[Dict]:
+    """
+    Repite la búsqueda con cortes de nodos crecientes y desempates nuevos.
+    
+    El corte de cada ejecución son los nodos que exceden la profundidad de
+    una solución. Cada ejecución cuelga de un nodo 'reinicio' bajo la raíz. Termina al
+    encontrar solución, al agotar el presupuesto global o cuando una
+    ejecución recorre todo el espacio sin llegar al corte (no hay solución).
+    
+    Returns:
+        Horario completo si se encuentra solución, None si no
+    """
+    raiz_id = arbol.nodo_actual_id
+    
+    # Nodos mínimos para completar un horario sin retroceder: se suman al
+    # corte para que ninguna ejecución quede descartada de antemano
+    profundidad = sum(estado['pendientes'].horas_restantes)
+    numero = 0
+    while True:
+        numero += 1
+        corte = _corte_reinicio(estrategia, numero, corte_inicial)
+        nodos_inicio = estado['nodos']
+        inicio = time.time()
+        estado['corte_reinicio'] = nodos_inicio + profundidad + corte
+        
+        arbol.agregar_nodo(
+            'reinicio',
+            {'descripcion': f'Reinicio {numero}', 'corte_nodos': corte},
+            padre_id=raiz_id
+        )
+        resultado = _ejecutar_busqueda(estado, arbol, grafo, grupos, iterativo)
+        
+        cortado = estado['abortado'] and estado['motivo_parada'] == 'reinicio'
+        if resultado is not None:
+            desenlace = 'solucion'
+        elif cortado:
+            desenlace = 'corte'
+        elif estado['abortado']:
+            desenlace = 'presupuesto'
+        else:
+            desenlace = 'sin_solucion'
+        estado['reinicios'].append({
+            'reinicio': numero,
+            'corte_nodos': corte,
+            'nodos': estado['nodos'] - nodos_inicio,
+            'tiempo': time.time() - inicio,
+            'horas_asignadas': len(estado['rastro']),
+            'desenlace': desenlace
+        })
+        
+        if not cortado:
+            estado['corte_reinicio'] = None
+            return resultado
+        
+        _reiniciar_estado(estado)
+
+
+def _reiniciar_estado(estado: Dict) -> None:
+    """Deshace todas las decisiones y sortea un nuevo desempate para MRV."""
+    _registrar_mejor_parcial(estado)
+    estado['dominios'].restaurar(0)
+    while estado['rastro']:
+        _deshacer_asignacion(estado)
+    estado['cola'].barajar(estado['aleatorio'])
+    estado['abortado'] = False
+    estado['motivo_parada'] = None
+
+
+def _conservar_previo(
+    estado: Dict,
+    arbol: ArbolDecisiones,
+    grafo: GrafoConflictos,
+    grupos: List[Grupo],
+    horario_previo: Dict,
+    iterativo: bool
+) -> Optional[Dict]:
+    """
+    Intenta completar el horario sin mover las clases previas aún válidas.
+    
+    Las clases del horario previo que cumplen las restricciones duras con
+    los datos actuales (ver _clases_conservables) quedan fijas y la búsqueda
+    solo coloca las horas restantes, con NODOS_CONSERVACION decisiones más
+    allá de su profundidad. Es una aproximación voraz a minimizar los
+    cambios: si no se completa, quien llama resuelve desde cero. La búsqueda
+    cuelga de un nodo 'conservacion' bajo la raíz, sus nodos se suman a
+    estado['nodos'] y su resumen queda en estado['conservacion'].
+    
+    Returns:
+        Horario completo si se encuentra solución, None si no
+    """
+    compacto = estado['compacto']
+    fijas, num_fijas = _clases_conservables(estado, horario_previo)
+    parcial = _inicializar_estado(
+        compacto.grupos, compacto.materias, compacto.profesores,
+        estado['forward_checking'], grafo, estado['simetria'],
+        fijas=fijas, previo=horario_previo
+    )
+    max_nodos = estado['nodos'] + sum(parcial['pendientes'].horas_restantes) + NODOS_CONSERVACION
+    if estado['max_nodos'] is not None:
+        max_nodos = min(max_nodos, estado['max_nodos'])
+    parcial['nodos'] = estado['nodos']
+    parcial['max_nodos'] = max_nodos
+    parcial['limite_tiempo'] = estado['limite_tiempo']
+    parcial['cancelacion'] = estado['cancelacion']
+    parcial['backjumping'] = estado['backjumping']
+    if estado['aleatorio'] is not None:
+        parcial['aleatorio'] = estado['aleatorio']
+        parcial['cola'].barajar(parcial['aleatorio'])
+    
+    raiz_id = arbol.nodo_actual_id
+    arbol.agregar_nodo(
+        'conservacion',
+        {'descripcion': f'Conservando {num_fijas} clases del horario previo', 'clases_fijas': num_fijas},
+        padre_id=raiz_id
+    )
+    resultado = None
+    if not estado['forward_checking'] or parcial['dominios'].es_consistente():
+        resultado = _ejecutar_busqueda(parcial, arbol, grafo, grupos, iterativo)
+    
+    if resultado is not None:
+        desenlace = 'solucion'
+    elif parcial['abortado']:
+        desenlace = 'presupuesto'
+    else:
+        desenlace = 'sin_solucion'
+    estado['conservacion'] = {
+        'clases_fijas': num_fijas,
+        'nodos': parcial['nodos'] - estado['nodos'],
+        'desenlace': desenlace
+    }
+    estado['nodos'] = parcial['nodos']
+    if resultado is None:
+        arbol.nodo_actual_id = raiz_id
+    return resultado
+
+
+def _clases_conservables(estado: Dict, horario_previo: Dict) -> Tuple[Dict, int]:
+    """
+    Filtra las clases del horario previo que siguen siendo válidas.
+    
+    Una clase se conserva si su grupo aún cursa la materia, sin pasarse de
+    sus horas semanales, y su profesor aún puede impartirla en ese slot
+    (mascara_slots_validos, junto con las ya conservadas).
+    
+    Returns:
+        (horario anidado con las clases conservables, número de clases)
+    """
+    compacto = estado['compacto']
+    pendientes = estado['pendientes']
+    anterior = EstadoCompacto(compacto.grupos, compacto.materias, compacto.profesores)
+    anterior.cargar_horario(horario_previo)
+    conservado = EstadoCompacto(compacto.grupos, compacto.materias, compacto.profesores)
+    
+    horas = list(pendientes.horas_iniciales)
+    num_fijas = 0
+    for celda, materia_id in enumerate(anterior.materia_en):
+        if materia_id == VACIO:
+            continue
+        grupo_id, slot = divmod(celda, SLOTS_POR_TURNO)
+        profesor_id = anterior.profesor_en[celda]
+        materia = compacto.materias[materia_id]
+        asignacion_id = pendientes.id_asignacion.get((compacto.grupos[grupo_id].nombre, materia.nombre))
+        if (asignacion_id is None or horas[asignacion_id] == 0
+                or not compacto.profesores[profesor_id].puede_impartir(materia.nombre)
+                or not mascara_slots_validos(conservado, grupo_id, profesor_id) >> slot & 1):
+            continue
+        conservado.asignar(grupo_id, materia_id, profesor_id, slot)
+        horas[asignacion_id] -= 1
+        num_fijas += 1
+    return conservado.a_horario(), num_fijas
+
+
+def contar_cambios(horario_previo: Dict, horario: Dict) -> Dict[str, int]:
+    """
+    Compara un horario con el previo clase por clase.
+    
+    Una clase previa se conserva si el horario nuevo tiene, en el mismo
+    grupo, día y hora, la misma materia con el mismo profesor.
+    
+    Args:
+        horario_previo: Horario anidado de referencia
+        horario: Horario anidado nuevo
+    
+    Returns:
+        Diccionario con 'previas' (clases del horario previo), 'conservadas',
+        'cambiadas' (previas movidas, con otro profesor o quitadas) y
+        'nuevas' (clases del horario nuevo que no estaban en el previo)
+    """
+    previas = conservadas = 0
+    for grupo, dias in horario_previo.items():
+        for dia, celdas in dias.items():
+            for slot_key, asignacion in celdas.items():
+                if asignacion is None:
+                    continue
+                previas += 1
+                actual = horario.get(grupo, {}).get(dia, {}).get(slot_key)
+                if (actual is not None and actual['materia'] == asignacion['materia']
+                        and actual['profesor'] == asignacion['profesor']):
+                    conservadas += 1
+    
+    total = sum(
+        1 for dias in horario.values() for celdas in dias.values()
+        for asignacion in celdas.values() if asignacion is not None
+    )
+    return {
+        'previas': previas,
+        'conservadas': conservadas,
+        'cambiadas': previas - conservadas,
+        'nuevas': total - conservadas
     }
 
 
@@ -167,6 +1058,15 @@ def _backtrack_recursivo(
     - LCV: Prueba primero los slots menos restrictivos
     - Poda: Abandona ramas que violan restricciones
     
+    La profundidad de recursión es igual al total de horas a asignar;
+    para instancias grandes usar BuscadorIterativo (mismas heurísticas).
+    
+    Con estado['backjumping'], cada nivel acumula su conjunto de conflicto
+    (niveles de las decisiones que eliminaron sus candidatos) y, si el nivel
+    actual no está en el conflicto de un hijo fallido, retorna sin probar
+    más candidatos: el salto continúa hasta la decisión responsable. Con
+    estado['nogoods'], el conflicto de cada nivel agotado se aprende.
+    
     Args:
         estado: Estado actual del algoritmo
         profundidad: Nivel de recursión
@@ -177,178 +1077,610 @@ def _backtrack_recursivo(
     Returns:
         Horario completo si se encuentra solución, None si no
     """
+    # Nodo del que cuelgan las decisiones de este nivel
+    nodo_padre_id = arbol.nodo_actual_id
+    
+    # Seleccionar asignación (MRV) y ordenar sus candidatos (LCV)
+    expansion = _expandir_nodo(estado, arbol, nodo_padre_id)
+    
     # CASO BASE: No hay más asignaciones pendientes
-    if not estado['asignaciones_pendientes']:
-        # Verificar que la solución esté completa
-        return estado['horario']
-    
-    # Aplicar heurísticas: MRV + Degree
-    asignaciones_ordenadas = aplicar_heuristicas_combinadas(
-        estado['asignaciones_pendientes'],
-        estado,
-        grafo,
-        grupos
-    )
+    if expansion is None:
+        # Convertir el estado compacto al horario anidado (una sola vez)
+        return estado['compacto'].a_horario()
     
-    # Tomar la asignación más restringida (MRV)
-    grupo, materia, horas_restantes, profesores_posibles = asignaciones_ordenadas[0]
+    asignacion_id, candidatos = expansion
     
-    # Obtener slots disponibles para el turno del grupo
-    slots_turno = get_all_slots(grupo.turno)
+    backjumping = estado['backjumping']
+    if backjumping:
+        nivel = len(estado['rastro'])
+        conflicto = _causas_descartes(estado, asignacion_id)
     
-    # Aplicar LCV: ordenar slots por menos restrictivos primero
+    # EXPLORAR: Probar cada combinación válida de slot + profesor
+    for slot, profesor_id in candidatos:
+        if _presupuesto_agotado(estado):
+            return None  # Se abandona la búsqueda sin deshacer el estado
+        
+        paso = _probar_candidato(estado, arbol, nodo_padre_id, asignacion_id, slot, profesor_id)
+        if paso is None:
+            if backjumping:
+                conflicto |= estado['conflicto']
+            continue  # Podado por forward checking o por un nogood
+        
+        nodo_decision_id, marca = paso
+        
+        # RECURSIÓN: Explorar con esta decisión
+        resultado = _backtrack_recursivo(estado, profundidad + 1, arbol, grafo, grupos)
+        
+        if resultado is not None:
+            # ¡ÉXITO! Propagar solución hacia arriba
+            arbol.marcar_exito(nodo_decision_id)
+            return resultado
+        
+        if estado['abortado']:
+            return None
+        
+        # BACKTRACK: Esta decisión no llevó a solución
+        _retroceder(estado, arbol, nodo_decision_id, marca)
+        
+        if backjumping:
+            conflicto_hijo = estado['conflicto']
+            if nivel not in conflicto_hijo:
+                # BACKJUMP: esta decisión no causó el fallo; seguir subiendo
+                return None
+            conflicto |= conflicto_hijo
+            conflicto.discard(nivel)
+    
+    # Ninguna opción funcionó: retornar None (backtrack)
+    if backjumping:
+        estado['conflicto'] = conflicto
+        _aprender_nogood(estado, conflicto)
+    return None
+
+
+def _expandir_nodo(
+    estado: Dict,
+    arbol: ArbolDecisiones,
+    nodo_padre_id: Optional[int]
+) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+    """
+    Elige la siguiente asignación y genera sus candidatos en orden.
+    
+    Aplica MRV (+ grado) para la asignación y LCV para los slots; las
+    combinaciones slot + profesor inválidas se descartan con bitsets y
+    se resumen en un nodo 'conflicto' del árbol. Con estado['simetria'],
+    solo se generan slots posteriores a los ya usados por la asignación
+    y un profesor por clase de profesores intercambiables sin horas. Con
+    pistas de un horario previo (estado['previo']) van primero los
+    candidatos que lo repiten (ver _rango_previo).
+    
+    Returns:
+        None si no quedan asignaciones pendientes, si no
+        (asignacion_id, candidatos) con candidatos = [(slot, profesor_id), ...]
+    """
+    compacto = estado['compacto']
+    
+    # Seleccionar la asignación más restringida: (MRV, -grado) incremental
+    asignacion_id = estado['cola'].seleccionar()
+    if asignacion_id is None:
+        return None
+    
+    grupo, materia, profesores_posibles = estado['pendientes'].asignaciones[asignacion_id]
+    grupo_id = compacto.id_grupo[grupo.nombre]
+    profesores_ids = [compacto.id_profesor[p.nombre] for p in profesores_posibles]
+    if estado['simetria']:
+        profesores_ids = _representantes_profesores(compacto, profesores_ids)
+    
+    # Aplicar LCV: ordenar slots (locales al turno) por menos restrictivos primero
     slots_ordenados = seleccionar_mejor_slot(
-        slots_turno,
-        estado['horario'],
+        range(SLOTS_POR_TURNO),
         grupo,
         materia,
         estado
     )
     
-    # EXPLORAR: Probar cada combinación de slot + profesor
-    for slot in slots_ordenados:
-        for profesor in profesores_posibles:
-            # Validar restricciones duras
-            es_valido, razon = validar_restricciones_duras(
-                estado['horario'],
-                grupo,
-                materia,
-                profesor,
-                slot,
-                estado
-            )
-            
-            if not es_valido:
-                # Registrar conflicto en el árbol (PODA)
-                arbol.agregar_nodo(
-                    'conflicto',
-                    {
-                        'grupo': grupo.nombre,
-                        'materia': materia.nombre,
-                        'profesor': profesor.nombre,
-                        'slot': str(slot),
-                        'razon': razon
-                    },
-                    padre_id=arbol.nodo_actual_id
-                )
-                continue  # Probar siguiente opción
-            
-            # DECISIÓN VÁLIDA: Registrar en el árbol
-            nodo_decision_id = arbol.agregar_nodo(
-                'decision',
-                {
-                    'grupo': grupo.nombre,
-                    'materia': materia.nombre,
-                    'profesor': profesor.nombre,
-                    'slot': str(slot),
-                    'horas_restantes': horas_restantes
-                },
-                padre_id=arbol.nodo_actual_id
-            )
+    # Validar todas las combinaciones slot + profesor de una vez (bitsets)
+    mascaras = [
+        mascara_slots_validos(compacto, grupo_id, profesor_id)
+        for profesor_id in profesores_ids
+    ]
+    if estado['simetria']:
+        posteriores = slots_posteriores(estado['slots_asignacion'][asignacion_id])
+        mascaras = [mascara & posteriores for mascara in mascaras]
+    descartados = SLOTS_POR_TURNO * len(mascaras) - sum(contar_bits(m) for m in mascaras)
+    if descartados:
+        # Registrar en el árbol las combinaciones podadas (PODA)
+        arbol.agregar_nodo(
+            'conflicto',
+            {
+                'grupo': grupo.nombre,
+                'materia': materia.nombre,
+                'descartados': descartados,
+                'razon': f"{descartados} combinaciones slot/profesor violan restricciones duras"
+            },
+            padre_id=nodo_padre_id
+        )
+    
+    candidatos = [
+        (slot, profesor_id)
+        for slot in slots_ordenados
+        for profesor_id, mascara in zip(profesores_ids, mascaras)
+        if mascara >> slot & 1
+    ]
+    
+    # Warm start: orden estable, LCV sigue desempatando dentro de cada rango
+    if estado['previo'] is not None:
+        pistas = estado['previo'][asignacion_id]
+        profesores_previos = set(pistas.values())
+        ocupados = estado['ocupados_previo'][grupo_id]
+        candidatos.sort(key=lambda c: _rango_previo(pistas, profesores_previos, ocupados, c))
+    return asignacion_id, candidatos
+
+
+def _rango_previo(
+    pistas: Dict[int, int],
+    profesores_previos: Set[int],
+    ocupados: int,
+    candidato: Tuple[int, int]
+) -> Tuple[int, int]:
+    """
+    Clave de orden de un candidato según el horario previo de su asignación.
+    
+    Primero los que repiten slot y profesor (por slot creciente, para no
+    cerrarse slots previos con la ruptura de simetría), luego los que
+    repiten solo el slot y luego solo el profesor. Del resto van antes los
+    slots que el grupo tenía libres, para no desplazar otra clase previa.
+    """
+    slot, profesor_id = candidato
+    if pistas.get(slot) == profesor_id:
+        return 0, slot
+    if slot in pistas:
+        return 1, 0
+    libre = not ocupados >> slot & 1
+    if profesor_id in profesores_previos:
+        return 2, not libre
+    return 3, not libre
+
+
+def _representantes_profesores(compacto: EstadoCompacto, profesores_ids: List[int]) -> List[int]:
+    """
+    Quita los profesores equivalentes a otro de la lista (ruptura de simetría).
+    
+    Dos profesores de la misma clase (ver EstadoCompacto.clase_profesor) que
+    aún no tienen horas son intercambiables: cualquier horario con uno se
+    convierte en otro con el otro, así que basta probar el primero.
+    """
+    clases_vistas = set()
+    representantes = []
+    for profesor_id in profesores_ids:
+        if compacto.horas_profesor[profesor_id] == 0:
+            clase = compacto.clase_profesor[profesor_id]
+            if clase in clases_vistas:
+                continue
+            clases_vistas.add(clase)
+        representantes.append(profesor_id)
+    return representantes
+
+
+def _causas_descartes(estado: Dict, asignacion_id: int) -> Set[int]:
+    """
+    Niveles de las decisiones que eliminaron candidatos de la asignación.
+    
+    Es el conjunto de conflicto inicial del nivel en modo backjumping: une
+    las causas (causas_conflicto) de los slots descartados por _expandir_nodo
+    para cada profesor posible. Con simetría, los slots válidos anteriores
+    al último usado por la asignación se explican por la decisión que lo
+    ocupó. Los profesores omitidos por simetría no aportan causas distintas:
+    las de su representante son las mismas.
+    """
+    compacto = estado['compacto']
+    grupo, _, profesores_posibles = estado['pendientes'].asignaciones[asignacion_id]
+    grupo_id = compacto.id_grupo[grupo.nombre]
+    
+    usados = estado['slots_asignacion'][asignacion_id] if estado['simetria'] else 0
+    anteriores = MASCARA_TURNO & ~slots_posteriores(usados)
+    
+    causas: Set[int] = set()
+    orden_culpable = False
+    for profesor in profesores_posibles:
+        profesor_id = compacto.id_profesor[profesor.nombre]
+        causas.update(causas_conflicto(compacto, grupo_id, profesor_id))
+        if anteriores & mascara_slots_validos(compacto, grupo_id, profesor_id):
+            orden_culpable = True
+    
+    if orden_culpable:
+        causas.add(compacto.nivel_en[grupo_id * SLOTS_POR_TURNO + usados.bit_length() - 1])
+    return causas
+
+
+def _probar_candidato(
+    estado: Dict,
+    arbol: ArbolDecisiones,
+    nodo_padre_id: Optional[int],
+    asignacion_id: int,
+    slot: int,
+    profesor_id: int
+) -> Optional[Tuple[int, int]]:
+    """
+    Registra y aplica una decisión, propagando sus efectos en los dominios.
+    
+    Si la decisión se poda, estado['conflicto'] queda con los niveles que
+    la explican: los del nogood que completa o, en la poda de forward
+    checking (que no identifica culpables), todos los anteriores.
+    
+    Returns:
+        (nodo_decision_id, marca_dominios) si la decisión queda aplicada,
+        o None si forward checking o un nogood la podó (ya deshecha)
+    """
+    compacto = estado['compacto']
+    dominios = estado['dominios']
+    pendientes = estado['pendientes']
+    grupo, materia, _ = pendientes.asignaciones[asignacion_id]
+    grupo_id = compacto.id_grupo[grupo.nombre]
+    estado['nodos'] += 1
+    
+    # DECISIÓN VÁLIDA: Registrar en el árbol
+    nodo_decision_id = arbol.agregar_nodo(
+        'decision',
+        {
+            'grupo': grupo.nombre,
+            'materia': materia.nombre,
+            'profesor': compacto.profesores[profesor_id].nombre,
+            'slot': compacto.texto_slot(grupo_id, slot),
+            'horas_restantes': pendientes.horas_restantes[asignacion_id]
+        },
+        padre_id=nodo_padre_id
+    )
+    
+    # Hacer asignación temporal
+    marca = dominios.marca()
+    _hacer_asignacion(estado, asignacion_id, profesor_id, slot)
+    
+    # NOGOODS: Podar si la decisión completa una combinación ya fallida
+    if estado['nogoods'] is not None:
+        explicacion = estado['nogoods'].violado()
+        if explicacion is not None:
+            estado['conflicto'] = explicacion
+            _retroceder(estado, arbol, nodo_decision_id, marca)
+            return None
+    
+    # Actualizar dominios afectados (alimentan MRV)
+    consistente = dominios.propagar(grupo_id, profesor_id)
+    
+    # FORWARD CHECKING: Podar si alguna asignación pendiente se quedó sin slots
+    if estado['forward_checking'] and not consistente:
+        estado['conflicto'] = set(range(len(estado['rastro']) - 1))
+        _retroceder(estado, arbol, nodo_decision_id, marca)
+        return None
+    
+    return nodo_decision_id, marca
+
+
+def _aprender_nogood(estado: Dict, conflicto: Set[int]) -> None:
+    """Guarda como nogood las decisiones de los niveles del conflicto."""
+    if estado['nogoods'] is not None:
+        estado['nogoods'].aprender(conflicto)
+
+
+def _retroceder(
+    estado: Dict,
+    arbol: ArbolDecisiones,
+    nodo_decision_id: int,
+    marca: int
+) -> None:
+    """Marca la decisión como fallida y deshace sus efectos (backtrack)."""
+    _registrar_mejor_parcial(estado)
+    arbol.marcar_backtrack(nodo_decision_id)
+    estado['dominios'].restaurar(marca)
+    _deshacer_asignacion(estado)
+
+
+def _presupuesto_agotado(estado: Dict) -> bool:
+    """
+    Verifica el presupuesto de nodos, tiempo y cancelación, y el corte de
+    la ejecución actual en modo reinicios.
+    
+    El reloj y el token de cancelación se consultan cada 64 decisiones
+    para no encarecer cada nodo. Al agotarse marca estado['abortado'] y
+    estado['motivo_parada'].
+    """
+    if estado['abortado']:
+        return True
+    
+    nodos = estado['nodos']
+    if estado['max_nodos'] is not None and nodos >= estado['max_nodos']:
+        estado['motivo_parada'] = 'presupuesto'
+    elif estado['corte_reinicio'] is not None and nodos >= estado['corte_reinicio']:
+        estado['motivo_parada'] = 'reinicio'
+    elif nodos % 64 == 0:
+        if estado['limite_tiempo'] is not None and time.time() >= estado['limite_tiempo']:
+            estado['motivo_parada'] = 'presupuesto'
+        elif estado['cancelacion'] is not None and estado['cancelacion'].is_set():
+            estado['motivo_parada'] = 'presupuesto'
+    
+    estado['abortado'] = estado['motivo_parada'] is not None
+    return estado['abortado']
+
+
+def _registrar_mejor_parcial(estado: Dict) -> None:
+    """Guarda una copia del rastro si tiene más horas asignadas que el mejor."""
+    if len(estado['rastro']) > len(estado['mejor_rastro']):
+        estado['mejor_rastro'] = list(estado['rastro'])
+
+
+def _horario_desde_rastro(estado: Dict, rastro: List[Tuple]) -> Dict:
+    """Reconstruye el horario anidado que corresponde a un rastro de decisiones."""
+    compacto = estado['compacto']
+    pendientes = estado['pendientes']
+    parcial = EstadoCompacto(compacto.grupos, compacto.materias, compacto.profesores)
+    for asignacion_id, grupo_id, profesor_id, slot, _ in rastro:
+        materia = pendientes.asignaciones[asignacion_id][1]
+        parcial.asignar(grupo_id, compacto.id_materia[materia.nombre], profesor_id, slot)
+    return parcial.a_horario()
+
+
+def _asignaciones_faltantes(estado: Dict, rastro: List[Tuple]) -> List[Tuple[str, str, int]]:
+    """Lista (grupo, materia, horas) que el rastro deja sin asignar."""
+    pendientes = estado['pendientes']
+    horas = list(pendientes.horas_iniciales)
+    for asignacion_id, *_ in rastro:
+        horas[asignacion_id] -= 1
+    return [
+        (grupo.nombre, materia.nombre, horas[asignacion_id])
+        for asignacion_id, (grupo, materia, _) in enumerate(pendientes.asignaciones)
+        if horas[asignacion_id] > 0
+    ]
+
+
+@dataclass
+class MarcoBusqueda:
+    """
+    Nivel de la pila explícita de BuscadorIterativo.
+    
+    Attributes:
+        asignacion_id: Asignación (grupo, materia) elegida en este nivel
+        candidatos: (slot, profesor_id) en orden LCV
+        nodo_padre_id: Nodo del árbol del que cuelgan las decisiones del nivel
+        indice: Siguiente candidato a probar
+        decision: (nodo_decision_id, marca) del candidato aplicado, si hay uno
+        conflicto: Niveles responsables de los fracasos del nivel (modo
+                   backjumping): las causas de _causas_descartes más los
+                   conflictos de los hijos fallidos y de los candidatos
+                   podados. Al agotarse el nivel pasa al padre (y se
+                   aprende como nogood si hay almacén)
+    """
+    asignacion_id: int
+    candidatos: List[Tuple[int, int]]
+    nodo_padre_id: Optional[int]
+    indice: int = 0
+    decision: Optional[Tuple[int, int]] = None
+    conflicto: Set[int] = field(default_factory=set)
+
+
+class BuscadorIterativo:
+    """
+    Motor de backtracking con pila explícita en lugar de recursión.
+    
+    Aplica la misma selección MRV/LCV y la misma poda que _backtrack_recursivo,
+    pero sin límite de recursión ni costo de marcos de Python. La búsqueda
+    puede pausarse (ejecutar con max_pasos) y reanudarse más tarde, y la
+    frontera (candidatos pendientes de cada nivel) puede inspeccionarse.
+    """
+    
+    def __init__(self, estado: Dict, arbol: ArbolDecisiones):
+        """
+        Args:
+            estado: Estado inicializado con _inicializar_estado
+            arbol: Árbol de decisiones (ya con su nodo raíz)
+        """
+        self.estado = estado
+        self.arbol = arbol
+        self.pila: List[MarcoBusqueda] = []
+        self.iniciado = False
+        self.terminado = False
+        self.resultado: Optional[Dict] = None
+        self.pasos = 0
+    
+    def _descender(self, nodo_padre_id: Optional[int]) -> None:
+        """Expande un nuevo nivel o registra la solución si ya no hay pendientes."""
+        expansion = _expandir_nodo(self.estado, self.arbol, nodo_padre_id)
+        if expansion is None:
+            # Convertir el estado compacto al horario anidado (una sola vez)
+            self.resultado = self.estado['compacto'].a_horario()
+            self.terminado = True
+            if self.pila:
+                self.arbol.marcar_exito(self.pila[-1].decision[0])
+            return
+        
+        asignacion_id, candidatos = expansion
+        marco = MarcoBusqueda(asignacion_id, candidatos, nodo_padre_id)
+        if self.estado['backjumping']:
+            marco.conflicto = _causas_descartes(self.estado, asignacion_id)
+        self.pila.append(marco)
+    
+    def paso(self) -> bool:
+        """
+        Avanza la búsqueda una decisión (o un retroceso de nivel).
+        
+        Returns:
+            True si la búsqueda puede continuar, False si terminó
+        """
+        if self.terminado:
+            return False
+        self.pasos += 1
+        
+        if not self.iniciado:
+            self.iniciado = True
+            self._descender(self.arbol.nodo_actual_id)
+            return not self.terminado
+        
+        if _presupuesto_agotado(self.estado):
+            self.terminado = True
+            return False
+        
+        marco = self.pila[-1]
+        
+        # BACKTRACK: el hijo del candidato aplicado se agotó sin solución
+        if marco.decision is not None:
+            _retroceder(self.estado, self.arbol, *marco.decision)
+            marco.decision = None
             
-            # Hacer asignación temporal
-            _hacer_asignacion(estado, grupo, materia, profesor, slot)
+            if self.estado['backjumping']:
+                nivel = len(self.estado['rastro'])
+                conflicto_hijo = self.estado['conflicto']
+                if nivel not in conflicto_hijo:
+                    # BACKJUMP: abandonar el nivel; el conflicto del hijo sube intacto
+                    self.pila.pop()
+                    if not self.pila:
+                        self.terminado = True
+                    return not self.terminado
+                marco.conflicto |= conflicto_hijo
+                marco.conflicto.discard(nivel)
+        
+        # EXPLORAR: siguiente candidato válido de este nivel
+        while marco.indice < len(marco.candidatos):
+            if _presupuesto_agotado(self.estado):
+                self.terminado = True  # La pila queda tal cual (estado parcial)
+                return False
             
-            # RECURSIÓN: Explorar con esta decisión
-            resultado = _backtrack_recursivo(estado, profundidad + 1, arbol, grafo, grupos)
+            slot, profesor_id = marco.candidatos[marco.indice]
+            marco.indice += 1
             
-            if resultado is not None:
-                # ¡ÉXITO! Propagar solución hacia arriba
-                arbol.marcar_exito(nodo_decision_id)
-                return resultado
+            paso = _probar_candidato(
+                self.estado, self.arbol, marco.nodo_padre_id,
+                marco.asignacion_id, slot, profesor_id
+            )
+            if paso is None:
+                if self.estado['backjumping']:
+                    marco.conflicto |= self.estado['conflicto']
+                continue  # Podado por forward checking o por un nogood
             
-            # BACKTRACK: Esta decisión no llevó a solución
-            arbol.marcar_backtrack(nodo_decision_id)
-            _deshacer_asignacion(estado, grupo, materia, profesor, slot)
+            marco.decision = paso
+            self._descender(paso[0])
+            return not self.terminado
+        
+        # Nivel agotado: volver al anterior
+        if self.estado['backjumping']:
+            self.estado['conflicto'] = marco.conflicto
+            _aprender_nogood(self.estado, marco.conflicto)
+        self.pila.pop()
+        if not self.pila:
+            self.terminado = True
+        return not self.terminado
     
-    # Ninguna opción funcionó: retornar None (backtrack)
-    return None
+    def ejecutar(self, max_pasos: Optional[int] = None) -> Optional[Dict]:
+        """
+        Ejecuta la búsqueda hasta terminar o hasta agotar max_pasos.
+        
+        Si se pausa por max_pasos, puede reanudarse llamando de nuevo.
+        
+        Returns:
+            Horario completo si se encontró solución, None si no (o si se pausó;
+            consultar self.terminado)
+        """
+        pasos = 0
+        while not self.terminado and (max_pasos is None or pasos < max_pasos):
+            self.paso()
+            pasos += 1
+        return self.resultado
+    
+    def frontera(self) -> List[Dict[str, Any]]:
+        """
+        Describe los candidatos que faltan por probar en cada nivel de la pila.
+        
+        Returns:
+            Lista (de la raíz a la hoja) de diccionarios con grupo, materia y
+            candidatos pendientes como (slot legible, profesor)
+        """
+        compacto = self.estado['compacto']
+        pendientes = self.estado['pendientes']
+        frontera = []
+        for marco in self.pila:
+            grupo, materia, _ = pendientes.asignaciones[marco.asignacion_id]
+            grupo_id = compacto.id_grupo[grupo.nombre]
+            frontera.append({
+                'grupo': grupo.nombre,
+                'materia': materia.nombre,
+                'candidatos_pendientes': [
+                    (compacto.texto_slot(grupo_id, slot), compacto.profesores[profesor_id].nombre)
+                    for slot, profesor_id in marco.candidatos[marco.indice:]
+                ]
+            })
+        return frontera
 
 
 def _hacer_asignacion(
     estado: Dict,
-    grupo: Grupo,
-    materia: Materia,
-    profesor: Profesor,
-    slot
+    asignacion_id: int,
+    profesor_id: int,
+    slot: int
 ) -> None:
     """
     Realiza una asignación temporal en el estado.
     
-    Actualiza:
+    Actualiza en O(1):
     - Horario del grupo
     - Ocupación del profesor
     - Horas asignadas al profesor
-    - Lista de asignaciones pendientes
-    """
-    # Actualizar horario
-    slot_key = f"{slot.hora_inicio}-{slot.hora_fin}"
-    estado['horario'][grupo.nombre][slot.dia][slot_key] = {
-        'materia': materia.nombre,
-        'profesor': profesor.nombre
-    }
+    - Tabla de asignaciones pendientes
+    - Slots usados por la asignación (ruptura de simetría)
+    
+    La decisión se apila en el rastro para que _deshacer_asignacion
+    restaure exactamente el estado anterior.
     
-    # Marcar profesor como ocupado
-    estado['profesor_ocupado'][profesor.nombre][slot.dia][slot_key] = True
+    Args:
+        asignacion_id: Índice de la asignación (grupo, materia)
+        profesor_id: Índice del profesor
+        slot: Slot local (0..34) dentro del turno del grupo
+    """
+    compacto = estado['compacto']
+    pendientes = estado['pendientes']
+    grupo, materia, _ = pendientes.asignaciones[asignacion_id]
+    grupo_id = compacto.id_grupo[grupo.nombre]
     
-    # Incrementar horas asignadas
-    estado['horas_asignadas_profesor'][profesor.nombre] += 1
+    # Actualizar horario, ocupación y horas del profesor
+    compacto.asignar(grupo_id, compacto.id_materia[materia.nombre], profesor_id, slot)
     
     # Actualizar asignaciones pendientes
-    for i, (g, m, horas, profs) in enumerate(estado['asignaciones_pendientes']):
-        if g.nombre == grupo.nombre and m.nombre == materia.nombre:
-            horas_restantes = horas - 1
-            if horas_restantes > 0:
-                # Actualizar horas restantes
-                estado['asignaciones_pendientes'][i] = (g, m, horas_restantes, profs)
-            else:
-                # Asignación completa, remover de pendientes
-                estado['asignaciones_pendientes'].pop(i)
-            break
-
-
-def _deshacer_asignacion(
-    estado: Dict,
-    grupo: Grupo,
-    materia: Materia,
-    profesor: Profesor,
-    slot
-) -> None:
+    completada = pendientes.descontar_hora(asignacion_id)
+    estado['slots_asignacion'][asignacion_id] |= 1 << slot
+    
+    estado['rastro'].append((asignacion_id, grupo_id, profesor_id, slot, completada))
+    if estado['nogoods'] is not None:
+        estado['nogoods'].aplicar(_clave_nogood(estado, asignacion_id, profesor_id, slot))
+
+
+def _clave_nogood(estado: Dict, asignacion_id: int, profesor_id: int, slot: int) -> Tuple[int, ...]:
     """
-    Deshace una asignación (backtrack).
+    Decisión tal como se guarda en los nogoods.
     
-    Revierte todos los cambios hechos por _hacer_asignacion.
+    Con simetría la decisión incluye el número de hora de la asignación: el
+    orden de slots crecientes hace que un nogood dependa de qué hora ocupa
+    cada slot, no solo de los slots ocupados.
     """
-    # Limpiar horario
-    slot_key = f"{slot.hora_inicio}-{slot.hora_fin}"
-    estado['horario'][grupo.nombre][slot.dia][slot_key] = None
+    if estado['simetria']:
+        pendientes = estado['pendientes']
+        hora = pendientes.horas_iniciales[asignacion_id] - pendientes.horas_restantes[asignacion_id] - 1
+        return asignacion_id, profesor_id, slot, hora
+    return asignacion_id, profesor_id, slot
+
+
+def _deshacer_asignacion(estado: Dict) -> None:
+    """
+    Deshace la última asignación (backtrack).
     
-    # Liberar profesor
-    if slot_key in estado['profesor_ocupado'][profesor.nombre][slot.dia]:
-        del estado['profesor_ocupado'][profesor.nombre][slot.dia][slot_key]
+    Revierte todos los cambios hechos por _hacer_asignacion, incluido
+    el orden de la tabla de pendientes.
+    """
+    asignacion_id, grupo_id, profesor_id, slot, completada = estado['rastro'].pop()
+    if estado['nogoods'] is not None:
+        estado['nogoods'].deshacer()
+    estado['slots_asignacion'][asignacion_id] &= ~(1 << slot)
     
-    # Decrementar horas asignadas
-    estado['horas_asignadas_profesor'][profesor.nombre] -= 1
+    # Limpiar horario, liberar profesor y decrementar sus horas
+    estado['compacto'].liberar(grupo_id, profesor_id, slot)
     
     # Restaurar en asignaciones pendientes
-    # Buscar si ya existe
-    encontrado = False
-    for i, (g, m, horas, profs) in enumerate(estado['asignaciones_pendientes']):
-        if g.nombre == grupo.nombre and m.nombre == materia.nombre:
-            # Incrementar horas restantes
-            estado['asignaciones_pendientes'][i] = (g, m, horas + 1, profs)
-            encontrado = True
-            break
-    
-    if not encontrado:
-        # Agregar de nuevo a pendientes
-        profesores_posibles = [
-            p for p in profs if p.nombre == profesor.nombre
-        ] + [p for p in profs if p.nombre != profesor.nombre]
-        
-        estado['asignaciones_pendientes'].append((
-            grupo,
-            materia,
-            1,  # 1 hora pendiente
-            profesores_posibles
-        ))
+    estado['pendientes'].reponer_hora(asignacion_id, completada)
+    if completada:
+        # Vuelve a estar pendiente: reinsertar en la cola MRV
+        estado['cola'].actualizar(asignacion_id)
@@ -0,0 +1,455 @@
+"""
+Búsqueda local para el University Timetabling Problem.
+Parte de un horario voraz (orden de Welsh-Powell) y lo repara con
+min-conflicts y lista tabú hasta que no quedan violaciones de las
+restricciones duras. No prueba infactibilidad, pero escala a instancias
+donde el backtracking exacto no termina.
+"""
+
+import time
+import random
+from array import array
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Set
+
+from ..core.modelos import Grupo, Materia, Profesor
+from ..core.grafo_conflictos import GrafoConflictos
+from ..core.analizador_grafo import orden_welsh_powell
+from .estado_compacto import (
+    EstadoCompacto, SLOTS_POR_TURNO, TOTAL_SLOTS, VACIO, MASCARA_TURNO
+)
+from .restricciones import mascara_slots_validos
+
+
+class EstadoConflictos:
+    """
+    Colocación de cada hora requerida que admite choques y los cuenta.
+    
+    A diferencia de EstadoCompacto, un slot puede tener varias horas del
+    mismo grupo o del mismo profesor y un profesor puede pasarse de sus
+    horas disponibles; cada exceso es una violación. Las restricciones son
+    las de validar_restricciones_duras: las de turno y disponibilidad
+    horaria del profesor se cumplen por construcción (solo se ofrecen
+    profesores compatibles y slots en que están disponibles).
+    
+    Attributes:
+        asignaciones: (grupo_id, materia_id, profesores_ids) por asignación
+        asignacion_hora: Asignación a la que pertenece cada hora
+        profesor_hora: Profesor de cada hora (VACIO si no está colocada)
+        slot_hora: Slot local de cada hora (VACIO si no está colocada)
+        cuenta_grupo: Horas por (grupo, slot local)
+        cuenta_profesor: Horas por (profesor, slot global)
+        ocupantes_grupo, ocupantes_profesor: Horas en cada una de esas celdas
+        horas_de_profesor: Horas colocadas de cada profesor
+        mascara_grupo, mascara_profesor: Bitsets de celdas con al menos una hora
+        choques_grupo, choques_profesor: Celdas con más de una hora
+        excedidos: Profesores con más horas que las disponibles
+        violaciones: Total de violaciones (0 = horario válido)
+    """
+    
+    def __init__(self, compacto: EstadoCompacto, asignaciones: List[Tuple[int, int, List[int]]],
+                 horas: List[int]):
+        """
+        Args:
+            compacto: Estado compacto (solo se usan sus índices, no se modifica)
+            asignaciones: (grupo_id, materia_id, profesores_ids) por asignación
+            horas: Horas semanales de cada asignación
+        """
+        self.compacto = compacto
+        self.asignaciones = asignaciones
+        self.asignacion_hora = array('i', [a for a, n in enumerate(horas) for _ in range(n)])
+        
+        num_horas = len(self.asignacion_hora)
+        self.profesor_hora = array('i', [VACIO]) * num_horas
+        self.slot_hora = array('i', [VACIO]) * num_horas
+        
+        num_celdas_grupo = len(compacto.grupos) * SLOTS_POR_TURNO
+        num_celdas_profesor = len(compacto.profesores) * TOTAL_SLOTS
+        self.cuenta_grupo = array('i', [0]) * num_celdas_grupo
+        self.cuenta_profesor = array('i', [0]) * num_celdas_profesor
+        self.ocupantes_grupo: List[List[int]] = [[] for _ in range(num_celdas_grupo)]
+        self.ocupantes_profesor: List[List[int]] = [[] for _ in range(num_celdas_profesor)]
+        self.horas_de_profesor: List[Set[int]] = [set() for _ in compacto.profesores]
+        self.mascara_grupo = [0] * len(compacto.grupos)
+        self.mascara_profesor = [0] * len(compacto.profesores)
+        
+        self.choques_grupo: Set[int] = set()
+        self.choques_profesor: Set[int] = set()
+        self.excedidos: Set[int] = set()
+        self.violaciones = 0
+    
+    def colocar(self, hora: int, profesor_id: int, slot: int) -> None:
+        """Coloca una hora (no colocada) con el profesor en el slot local."""
+        grupo_id = self.asignaciones[self.asignacion_hora[hora]][0]
+        slot_global = self.compacto.base_grupo[grupo_id] + slot
+        
+        celda = grupo_id * SLOTS_POR_TURNO + slot
+        if self.cuenta_grupo[celda]:
+            self.violaciones += 1
+            self.choques_grupo.add(celda)
+        self.cuenta_grupo[celda] += 1
+        self.ocupantes_grupo[celda].append(hora)
+        self.mascara_grupo[grupo_id] |= 1 << slot
+        
+        celda = profesor_id * TOTAL_SLOTS + slot_global
+        if self.cuenta_profesor[celda]:
+            self.violaciones += 1
+            self.choques_profesor.add(celda)
+        self.cuenta_profesor[celda] += 1
+        self.ocupantes_profesor[celda].append(hora)
+        self.mascara_profesor[profesor_id] |= 1 << slot_global
+        
+        horas_profesor = self.horas_de_profesor[profesor_id]
+        horas_profesor.add(hora)
+        if len(horas_profesor) > self.compacto.horas_max_profesor[profesor_id]:
+            self.violaciones += 1
+            self.excedidos.add(profesor_id)
+        
+        self.profesor_hora[hora] = profesor_id
+        self.slot_hora[hora] = slot
+    
+    def retirar(self, hora: int) -> None:
+        """Revierte colocar() para una hora colocada."""
+        profesor_id = self.profesor_hora[hora]
+        slot = self.slot_hora[hora]
+        grupo_id = self.asignaciones[self.asignacion_hora[hora]][0]
+        slot_global = self.compacto.base_grupo[grupo_id] + slot
+        
+        celda = grupo_id * SLOTS_POR_TURNO + slot
+        self.cuenta_grupo[celda] -= 1
+        self.ocupantes_grupo[celda].remove(hora)
+        restantes = self.cuenta_grupo[celda]
+        if restantes:
+            self.violaciones -= 1
+            if restantes == 1:
+                self.choques_grupo.discard(celda)
+        else:
+            self.mascara_grupo[grupo_id] &= ~(1 << slot)
+        
+        celda = profesor_id * TOTAL_SLOTS + slot_global
+        self.cuenta_profesor[celda] -= 1
+        self.ocupantes_profesor[celda].remove(hora)
+        restantes = self.cuenta_profesor[celda]
+        if restantes:
+            self.violaciones -= 1
+            if restantes == 1:
+                self.choques_profesor.discard(celda)
+        else:
+            self.mascara_profesor[profesor_id] &= ~(1 << slot_global)
+        
+        horas_profesor = self.horas_de_profesor[profesor_id]
+        if len(horas_profesor) > self.compacto.horas_max_profesor[profesor_id]:
+            self.violaciones -= 1
+        horas_profesor.discard(hora)
+        if len(horas_profesor) <= self.compacto.horas_max_profesor[profesor_id]:
+            self.excedidos.discard(profesor_id)
+        
+        self.profesor_hora[hora] = VACIO
+        self.slot_hora[hora] = VACIO
+    
+    def hora_en_conflicto(self, aleatorio: random.Random) -> int:
+        """
+        Elige al azar una hora involucrada en alguna violación.
+        
+        Primero se sortea la violación (celda con choque o profesor excedido)
+        y después una de sus horas. Requiere violaciones > 0.
+        """
+        fuentes = (
+            (self.choques_grupo, self.ocupantes_grupo),
+            (self.choques_profesor, self.ocupantes_profesor),
+            (self.excedidos, self.horas_de_profesor)
+        )
+        indice = aleatorio.randrange(sum(len(claves) for claves, _ in fuentes))
+        for claves, horas in fuentes:
+            if indice < len(claves):
+                clave = next(islice(claves, indice, None))
+                return aleatorio.choice(list(horas[clave]))
+            indice -= len(claves)
+        raise ValueError("No hay violaciones")
+    
+    def mejores_movimientos(
+        self,
+        hora: int,
+        tabu: Dict[Tuple[int, int], Dict[int, int]],
+        iteracion: int,
+        umbral_aspiracion: int
+    ) -> Tuple[int, List[Tuple[int, int]]]:
+        """
+        Destinos (profesor, slot) de menor costo para una hora no colocada.
+        
+        El costo de un destino son las violaciones que añadiría: +1 si el
+        slot del grupo está ocupado, +1 si el del profesor lo está y +1 si el
+        profesor ya no tiene horas; solo se ofrecen slots en que el profesor
+        está disponible. Se calcula para los 35 slots a la vez con
+        bitsets. Los destinos tabú se descartan salvo que su costo quede por
+        debajo de umbral_aspiracion (criterio de aspiración).
+        
+        Returns:
+            (costo, destinos); destinos vacío si todos son tabú
+        """
+        grupo_id, _, profesores_ids = self.asignaciones[self.asignacion_hora[hora]]
+        base = self.compacto.base_grupo[grupo_id]
+        ocupado_grupo = self.mascara_grupo[grupo_id]
+        
+        mejor_costo = None
+        destinos: List[Tuple[int, int]] = []
+        for profesor_id in profesores_ids:
+            disponibles = self.compacto.disponible_profesor[profesor_id] >> base
+            ocupado_profesor = (self.mascara_profesor[profesor_id] >> base) & MASCARA_TURNO
+            exceso = int(len(self.horas_de_profesor[profesor_id])
+                         >= self.compacto.horas_max_profesor[profesor_id])
+            prohibidos = _mascara_tabu(tabu.get((hora, profesor_id)), iteracion)
+            
+            niveles = (
+                MASCARA_TURNO & ~(ocupado_grupo | ocupado_profesor) & disponibles,
+                (ocupado_grupo ^ ocupado_profesor) & disponibles,
+                ocupado_grupo & ocupado_profesor
+            )
+            for nivel, mascara in enumerate(niveles):
+                costo = nivel + exceso
+                if mejor_costo is not None and costo > mejor_costo:
+                    break
+                if costo >= umbral_aspiracion:
+                    mascara &= ~prohibidos
+                if not mascara:
+                    continue
+                if mejor_costo is None or costo < mejor_costo:
+                    mejor_costo = costo
+                    destinos = []
+                destinos.extend(
+                    (profesor_id, slot) for slot in range(SLOTS_POR_TURNO) if mascara >> slot & 1
+                )
+                break
+        
+        return (mejor_costo if mejor_costo is not None else 0), destinos
+
+
+def _mascara_tabu(prohibidos: Optional[Dict[int, int]], iteracion: int) -> int:
+    """Bitset de los slots aún tabú ({slot: iteración en que expira})."""
+    if not prohibidos:
+        return 0
+    mascara = 0
+    for slot, expira in prohibidos.items():
+        if expira > iteracion:
+            mascara |= 1 << slot
+    return mascara
+
+
+def resolver_busqueda_local(
+    grupos: List[Grupo],
+    materias: List[Materia],
+    profesores: List[Profesor],
+    grafo: Optional[GrafoConflictos] = None,
+    max_iteraciones: int = 100000,
+    max_segundos: Optional[float] = None,
+    tenencia_tabu: int = 10,
+    semilla: Optional[int] = None,
+    cancelacion: Optional[Any] = None
+) -> Tuple[Dict, Dict[str, Any]]:
+    """
+    Genera un horario con búsqueda local (min-conflicts + lista tabú).
+    
+    1. Construcción voraz: las asignaciones se recorren en orden de
+       Welsh-Powell (más conflictivas primero) y cada hora va al destino
+       (profesor, slot) que menos violaciones añade.
+    2. Reparación: en cada iteración se toma una hora en conflicto y se
+       mueve al destino de menor costo que no sea tabú. El destino que
+       deja queda prohibido para esa hora durante tenencia_tabu iteraciones
+       (más un extra aleatorio), salvo que mejore el mejor horario visto.
+    
+    A diferencia de resolver_backtracking no prueba que no haya solución:
+    al agotar el presupuesto retorna el mejor horario visto sin las horas
+    que violan restricciones duras (parcial pero válido).
+    
+    Args:
+        grupos: Lista de grupos
+        materias: Lista de materias
+        profesores: Lista de profesores
+        grafo: Grafo de conflictos (orden de construcción; None = orden de materias)
+        max_iteraciones: Máximo de movimientos de reparación
+        max_segundos: Tiempo máximo de búsqueda (None = sin límite)
+        tenencia_tabu: Iteraciones mínimas que un destino abandonado queda prohibido
+        semilla: Semilla para los sorteos (None = no reproducible)
+        cancelacion: Objeto con is_set() (ej: threading.Event) para detener la búsqueda
+    
+    Returns:
+        Tupla (horario, estadisticas):
+        - horario: {grupo: {dia: {"HH:MM-HH:MM": asignacion o None}}}
+        - estadisticas: tiempo, iteraciones, violaciones iniciales y finales,
+          'solucion_completa', 'horas_asignadas' y 'asignaciones_faltantes'
+          ((grupo, materia, horas faltantes), como en resolver_backtracking)
+    """
+    print("🚀 Iniciando búsqueda local (min-conflicts + tabú)...")
+    print("=" * 70)
+    
+    tiempo_inicio = time.time()
+    limite_tiempo = tiempo_inicio + max_segundos if max_segundos is not None else None
+    aleatorio = random.Random(semilla)
+    
+    estado, sin_profesor = _construir_estado(grupos, materias, profesores)
+    compacto = estado.compacto
+    print(f"📊 Horas a colocar: {len(estado.asignacion_hora)}")
+    
+    # Paso 1: construcción voraz en orden de Welsh-Powell
+    for hora in _orden_construccion(estado, grafo):
+        _, destinos = estado.mejores_movimientos(hora, {}, 0, 0)
+        estado.colocar(hora, *aleatorio.choice(destinos))
+    violaciones_iniciales = estado.violaciones
+    print(f"🧱 Horario voraz: {violaciones_iniciales} violaciones")
+    
+    # Paso 2: reparación con min-conflicts + tabú
+    mejor_violaciones = estado.violaciones
+    mejor_colocacion = (array('i', estado.profesor_hora), array('i', estado.slot_hora))
+    tabu: Dict[Tuple[int, int], Dict[int, int]] = {}
+    iteracion = 0
+    while estado.violaciones > 0 and iteracion < max_iteraciones:
+        if iteracion % 256 == 0:
+            if limite_tiempo is not None and time.time() >= limite_tiempo:
+                break
+            if cancelacion is not None and cancelacion.is_set():
+                break
+        
+        hora = estado.hora_en_conflicto(aleatorio)
+        profesor_anterior, slot_anterior = estado.profesor_hora[hora], estado.slot_hora[hora]
+        estado.retirar(hora)
+        tabu.setdefault((hora, profesor_anterior), {})[slot_anterior] = (
+            iteracion + tenencia_tabu + aleatorio.randint(0, tenencia_tabu)
+        )
+        
+        costo, destinos = estado.mejores_movimientos(
+            hora, tabu, iteracion, mejor_violaciones - estado.violaciones
+        )
+        if destinos:
+            estado.colocar(hora, *aleatorio.choice(destinos))
+        else:
+            estado.colocar(hora, profesor_anterior, slot_anterior)
+        iteracion += 1
+        
+        if estado.violaciones < mejor_violaciones:
+            mejor_violaciones = estado.violaciones
+            mejor_colocacion = (array('i', estado.profesor_hora), array('i', estado.slot_hora))
+        
+        # Olvidar las prohibiciones vencidas de vez en cuando
+        if iteracion % 4096 == 0:
+            tabu = {
+                clave: vigentes for clave, vigentes in (
+                    (clave, {s: e for s, e in prohibidos.items() if e > iteracion})
+                    for clave, prohibidos in tabu.items()
+                ) if vigentes
+            }
+    
+    # Horario final: el mejor visto, sin las horas que violan restricciones duras
+    horario, faltantes = _horario_valido(estado, mejor_colocacion)
+    faltantes.extend(sin_profesor)
+    horas_asignadas = compacto.num_asignaciones
+    
+    tiempo_total = time.time() - tiempo_inicio
+    estadisticas = {
+        'tiempo_total': tiempo_total,
+        'iteraciones': iteracion,
+        'iteraciones_por_segundo': iteracion / tiempo_total if tiempo_total > 0 else 0,
+        'violaciones_iniciales': violaciones_iniciales,
+        'violaciones': mejor_violaciones,
+        'solucion_completa': not faltantes,
+        'horas_asignadas': horas_asignadas,
+        'asignaciones_faltantes': faltantes
+    }
+    
+    if not faltantes:
+        print(f"\n✅ ¡SOLUCIÓN ENCONTRADA! ({iteracion} iteraciones)")
+    else:
+        print(f"\n❌ Quedan {mejor_violaciones} violaciones tras {iteracion} iteraciones")
+        print(f"📋 Mejor horario parcial: {horas_asignadas} horas asignadas, "
+              f"{len(faltantes)} asignaciones incompletas")
+    print(f"⏱️  Tiempo total: {tiempo_total:.2f}s")
+    print("=" * 70)
+    
+    return horario, estadisticas
+
+
+def _construir_estado(
+    grupos: List[Grupo],
+    materias: List[Materia],
+    profesores: List[Profesor]
+) -> Tuple[EstadoConflictos, List[Tuple[str, str, int]]]:
+    """
+    Crea el estado de conflictos con una entrada por asignación (grupo, materia).
+    
+    Returns:
+        (estado, sin_profesor): las asignaciones sin ningún profesor capaz,
+        compatible con el turno del grupo y con algún slot disponible en él
+        quedan fuera y se reportan como faltantes
+    """
+    compacto = EstadoCompacto(grupos, materias, profesores)
+    num_turnos = len(compacto.base_turno)
+    
+    asignaciones = []
+    horas = []
+    sin_profesor = []
+    for materia in materias:
+        materia_id = compacto.id_materia[materia.nombre]
+        for grupo in materia.grupos_que_cursan:
+            grupo_id = compacto.id_grupo[grupo.nombre]
+            turno = compacto.base_grupo[grupo_id] // SLOTS_POR_TURNO
+            profesores_ids = [
+                profesor_id for profesor_id, p in enumerate(compacto.profesores)
+                if p.puede_impartir(materia.nombre)
+                and compacto.turno_valido[profesor_id * num_turnos + turno]
+                and compacto.disponible_profesor[profesor_id] >> compacto.base_grupo[grupo_id] & MASCARA_TURNO
+            ]
+            if not profesores_ids:
+                sin_profesor.append((grupo.nombre, materia.nombre, materia.horas_semana))
+                continue
+            asignaciones.append((grupo_id, materia_id, profesores_ids))
+            horas.append(materia.horas_semana)
+    
+    return EstadoConflictos(compacto, asignaciones, horas), sin_profesor
+
+
+def _orden_construccion(estado: EstadoConflictos, grafo: Optional[GrafoConflictos]) -> List[int]:
+    """Horas en orden de Welsh-Powell de su asignación (sin grafo, en orden de materias)."""
+    compacto = estado.compacto
+    posicion: Dict[Tuple[str, str], int] = {}
+    if grafo is not None:
+        for i, nodo in enumerate(orden_welsh_powell(grafo)):
+            posicion[(nodo.grupo_nombre, nodo.materia_nombre)] = i
+    
+    def clave(hora: int) -> int:
+        grupo_id, materia_id, _ = estado.asignaciones[estado.asignacion_hora[hora]]
+        nombres = (compacto.grupos[grupo_id].nombre, compacto.materias[materia_id].nombre)
+        return posicion.get(nombres, len(posicion))
+    
+    return sorted(range(len(estado.asignacion_hora)), key=clave)
+
+
+def _horario_valido(
+    estado: EstadoConflictos,
+    colocacion: Tuple[array, array]
+) -> Tuple[Dict, List[Tuple[str, str, int]]]:
+    """
+    Pasa una colocación al estado compacto descartando las horas inválidas.
+    
+    Cada hora se agrega solo si respeta las restricciones duras frente a las
+    ya agregadas (mascara_slots_validos), así que el horario es válido.
+    
+    Returns:
+        (horario, faltantes) con faltantes = [(grupo, materia, horas faltantes)]
+    """
+    compacto = estado.compacto
+    profesor_hora, slot_hora = colocacion
+    
+    faltan = [0] * len(estado.asignaciones)
+    for hora, asignacion_id in enumerate(estado.asignacion_hora):
+        grupo_id, materia_id, _ = estado.asignaciones[asignacion_id]
+        profesor_id, slot = profesor_hora[hora], slot_hora[hora]
+        if mascara_slots_validos(compacto, grupo_id, profesor_id) >> slot & 1:
+            compacto.asignar(grupo_id, materia_id, profesor_id, slot)
+        else:
+            faltan[asignacion_id] += 1
+    
+    faltantes = [
+        (compacto.grupos[grupo_id].nombre, compacto.materias[materia_id].nombre, faltan[a])
+        for a, (grupo_id, materia_id, _) in enumerate(estado.asignaciones)
+        if faltan[a]
+    ]
+    return compacto.a_horario(), faltantes
@@ -0,0 +1,120 @@
+"""
+Descomposición del problema de horarios en subproblemas independientes.
+Separa las componentes conexas del grafo de conflictos y, dentro de cada una,
+los turnos que ningún profesor conecta, para resolverlos por separado.
+"""
+
+from dataclasses import dataclass, replace
+from typing import List, Dict, Set
+
+from ..core.modelos import Grupo, Materia, Profesor
+from ..core.grafo_conflictos import GrafoConflictos, NodoAsignacion
+
+
+@dataclass
+class Subproblema:
+    """
+    Parte del problema que no comparte grupos ni profesores con las demás.
+    
+    Attributes:
+        grupos: Grupos del subproblema
+        materias: Materias con grupos_que_cursan restringido a esos grupos
+        profesores: Profesores que pueden impartir alguna de esas materias
+    """
+    grupos: List[Grupo]
+    materias: List[Materia]
+    profesores: List[Profesor]
+    
+    @property
+    def num_asignaciones(self) -> int:
+        """Asignaciones (grupo, materia) del subproblema."""
+        return sum(len(m.grupos_que_cursan) for m in self.materias)
+
+
+def descomponer_problema(
+    grupos: List[Grupo],
+    materias: List[Materia],
+    profesores: List[Profesor],
+    grafo: GrafoConflictos
+) -> List[Subproblema]:
+    """
+    Divide el problema en subproblemas que pueden resolverse por separado.
+    
+    1. Cada componente conexa del grafo de conflictos es independiente: sus
+       asignaciones no comparten grupo ni profesor con las de otra.
+    2. Dentro de una componente, los slots de turnos distintos nunca chocan;
+       la única interacción es un profesor que pueda dar clase en ambos turnos
+       (turno "Ambos"), por sus horas disponibles. Si ninguno los conecta,
+       cada turno es un subproblema aparte.
+    
+    Los grupos sin materias no aparecen en ningún subproblema.
+    
+    Args:
+        grupos: Lista de grupos
+        materias: Lista de materias
+        profesores: Lista de profesores
+        grafo: Grafo de conflictos construido con los mismos datos
+    
+    Returns:
+        Lista de subproblemas, del más grande al más chico
+    """
+    turno_grupo = {g.nombre: g.turno for g in grupos}
+    
+    partes: List[Set[NodoAsignacion]] = []
+    for componente in grafo.componentes_conexas():
+        por_turno: Dict[str, Set[NodoAsignacion]] = {}
+        for nodo in componente:
+            por_turno.setdefault(turno_grupo[nodo.grupo_nombre], set()).add(nodo)
+        
+        if len(por_turno) > 1 and _turnos_conectados(list(por_turno.values()), profesores):
+            partes.append(componente)
+        else:
+            partes.extend(por_turno.values())
+    
+    subproblemas = [_construir_subproblema(parte, grupos, materias, profesores) for parte in partes]
+    subproblemas.sort(key=lambda s: s.num_asignaciones, reverse=True)
+    return subproblemas
+
+
+def _turnos_conectados(partes: List[Set[NodoAsignacion]], profesores: List[Profesor]) -> bool:
+    """Verifica si algún profesor de turno "Ambos" puede dar materias de más de una parte."""
+    materias_por_parte = [{nodo.materia_nombre for nodo in parte} for parte in partes]
+    for profesor in profesores:
+        if profesor.turno_preferido != "Ambos":
+            continue
+        partes_alcanzadas = sum(
+            1 for materias in materias_por_parte
+            if any(profesor.puede_impartir(m) for m in materias)
+        )
+        if partes_alcanzadas > 1:
+            return True
+    return False
+
+
+def _construir_subproblema(
+    parte: Set[NodoAsignacion],
+    grupos: List[Grupo],
+    materias: List[Materia],
+    profesores: List[Profesor]
+) -> Subproblema:
+    """Restringe grupos, materias y profesores a las asignaciones de una parte."""
+    asignaciones = {(nodo.grupo_nombre, nodo.materia_nombre) for nodo in parte}
+    nombres_grupos = {grupo_nombre for grupo_nombre, _ in asignaciones}
+    
+    materias_sub = []
+    for materia in materias:
+        grupos_materia = [
+            g for g in materia.grupos_que_cursan
+            if (g.nombre, materia.nombre) in asignaciones
+        ]
+        if grupos_materia:
+            materias_sub.append(replace(materia, grupos_que_cursan=grupos_materia))
+    
+    return Subproblema(
+        grupos=[g for g in grupos if g.nombre in nombres_grupos],
+        materias=materias_sub,
+        profesores=[
+            p for p in profesores
+            if any(p.puede_impartir(m.nombre) for m in materias_sub)
+        ]
+    )
@@ -0,0 +1,339 @@
+"""
+Estado compacto del algoritmo de backtracking.
+Representa grupos, materias, profesores y slots con identificadores enteros
+sobre arreglos planos, evitando formatear y hashear cadenas en la búsqueda.
+"""
+
+from array import array
+from typing import List, Dict, Tuple
+
+from ..core.modelos import Grupo, Materia, Profesor
+from ..core.config import (
+    get_all_slots, get_slots_globales, mascara_disponibilidad, DIAS_SEMANA, TURNOS, INDICE_SLOT_GLOBAL
+)
+
+
+# Orden fijo de turnos: define el desplazamiento de sus slots globales
+TURNOS_ORDENADOS = list(TURNOS)
+
+# 5 días × 7 horas
+HORAS_POR_DIA = 7
+SLOTS_POR_TURNO = len(DIAS_SEMANA) * HORAS_POR_DIA
+
+# Slots globales (todos los turnos): los profesores pueden dar clase en ambos
+TOTAL_SLOTS = SLOTS_POR_TURNO * len(TURNOS_ORDENADOS)
+
+# Marca de celda vacía en los arreglos de ocupación
+VACIO = -1
+
+# Máscara con los 35 slots locales de un turno encendidos
+MASCARA_TURNO = (1 << SLOTS_POR_TURNO) - 1
+
+
+def contar_bits(mascara: int) -> int:
+    """Popcount compatible con Python 3.8 (int.bit_count existe desde 3.10)."""
+    return bin(mascara).count("1")
+
+
+def slots_posteriores(usados: int) -> int:
+    """
+    Bitset de los slots posteriores al último slot encendido en usados.
+    
+    Con ruptura de simetría, cada hora de una asignación debe ir en un slot
+    mayor que los de sus horas anteriores (usados = 0 permite todos).
+    """
+    return MASCARA_TURNO & ~((1 << usados.bit_length()) - 1)
+
+
+def firma_profesor(profesor: Profesor) -> Tuple:
+    """
+    Características que hacen intercambiables a dos profesores: materias,
+    turno, horas y slots disponibles.
+    """
+    return (
+        frozenset(profesor.materias_imparte),
+        profesor.turno_preferido,
+        profesor.horas_disponibles,
+        mascara_disponibilidad(profesor)
+    )
+
+
+class EstadoCompacto:
+    """
+    Estado de la búsqueda indexado por enteros.
+    
+    Convenciones de índices:
+    - Grupos, materias y profesores: posición en las listas recibidas
+    - Slot local: 0..34 dentro del turno del grupo (dia * 7 + hora)
+    - Slot global: desplazamiento del turno + slot local (0..69),
+      usado para la ocupación de profesores
+    
+    Attributes:
+        materia_en: Materia asignada por (grupo, slot local), VACIO si libre
+        profesor_en: Profesor asignado por (grupo, slot local), VACIO si libre
+        carga_dia: Horas asignadas por (grupo, día)
+        mascara_grupo: Bitset de 35 bits por grupo (bit = slot local ocupado)
+        mascara_profesor: Bitset de 70 bits por profesor (bit = slot global ocupado)
+        disponible_profesor: Bitset de 70 bits por profesor (bit = slot global
+                             disponible según su disponibilidad horaria)
+        horas_profesor: Horas asignadas a cada profesor
+        clase_profesor: Primer profesor con la misma firma (ver firma_profesor)
+        nivel_en: Orden (0, 1, ...) de la asignación que ocupa cada (grupo, slot local)
+        nivel_profesor: Orden de la asignación que ocupa cada (profesor, slot global)
+        num_asignaciones: Asignaciones vigentes (el nivel de la siguiente)
+    """
+    
+    def __init__(
+        self,
+        grupos: List[Grupo],
+        materias: List[Materia],
+        profesores: List[Profesor]
+    ):
+        """
+        Construye los índices y arreglos vacíos para los datos dados.
+        
+        Raises:
+            ValueError: Si algún grupo tiene un turno inválido
+        """
+        self.grupos = list(grupos)
+        self.materias = list(materias)
+        self.profesores = list(profesores)
+        
+        self.id_grupo: Dict[str, int] = {g.nombre: i for i, g in enumerate(self.grupos)}
+        self.id_materia: Dict[str, int] = {m.nombre: i for i, m in enumerate(self.materias)}
+        self.id_profesor: Dict[str, int] = {p.nombre: i for i, p in enumerate(self.profesores)}
+        
+        # Tabla de slots globales y sus representaciones de texto (una sola vez)
+        self.slots = get_slots_globales()
+        self.slot_keys = [s.slot_key for s in self.slots]
+        self.slot_textos = [str(s) for s in self.slots]
+        self.hora_slot = array('i', [int(s.hora_inicio.split(':')[0]) for s in self.slots])
+        self.id_slot = INDICE_SLOT_GLOBAL
+        
+        self.base_turno = {t: i * SLOTS_POR_TURNO for i, t in enumerate(TURNOS_ORDENADOS)}
+        for grupo in self.grupos:
+            if grupo.turno not in self.base_turno:
+                # Mismo error que get_all_slots para turnos desconocidos
+                get_all_slots(grupo.turno)
+        self.base_grupo = array('i', [self.base_turno[g.turno] for g in self.grupos])
+        
+        # Compatibilidad de turno del profesor con cada turno: (profesor, turno)
+        self.turno_valido = bytearray(
+            1 if p.turno_preferido in ("Ambos", t) else 0
+            for p in self.profesores
+            for t in TURNOS_ORDENADOS
+        )
+        self.horas_max_profesor = array('i', [p.horas_disponibles for p in self.profesores])
+        self.disponible_profesor = [mascara_disponibilidad(p) for p in self.profesores]
+        
+        # Clases de profesores intercambiables (ruptura de simetría)
+        representante: Dict[Tuple, int] = {}
+        self.clase_profesor = array('i', [
+            representante.setdefault(firma_profesor(p), i)
+            for i, p in enumerate(self.profesores)
+        ])
+        
+        num_celdas = len(self.grupos) * SLOTS_POR_TURNO
+        self.materia_en = array('i', [VACIO]) * num_celdas
+        self.profesor_en = array('i', [VACIO]) * num_celdas
+        self.ocupados_grupo = array('i', [0]) * len(self.grupos)
+        self.carga_dia = array('i', [0]) * (len(self.grupos) * len(DIAS_SEMANA))
+        self.mascara_grupo = [0] * len(self.grupos)
+        self.mascara_profesor = [0] * len(self.profesores)
+        self.horas_profesor = array('i', [0]) * len(self.profesores)
+        
+        # Nivel de decisión de cada ocupación (explica conflictos al backjumping)
+        self.nivel_en = array('i', [VACIO]) * num_celdas
+        self.nivel_profesor = array('i', [VACIO]) * (len(self.profesores) * TOTAL_SLOTS)
+        self.num_asignaciones = 0
+    
+    def asignar(self, grupo_id: int, materia_id: int, profesor_id: int, slot: int) -> None:
+        """
+        Ocupa el slot local del grupo y el slot global del profesor.
+        
+        Las asignaciones deben deshacerse en orden inverso (LIFO) con liberar().
+        """
+        celda = grupo_id * SLOTS_POR_TURNO + slot
+        slot_global = self.base_grupo[grupo_id] + slot
+        self.materia_en[celda] = materia_id
+        self.profesor_en[celda] = profesor_id
+        self.nivel_en[celda] = self.num_asignaciones
+        self.nivel_profesor[profesor_id * TOTAL_SLOTS + slot_global] = self.num_asignaciones
+        self.num_asignaciones += 1
+        self.ocupados_grupo[grupo_id] += 1
+        self.carga_dia[grupo_id * len(DIAS_SEMANA) + slot // HORAS_POR_DIA] += 1
+        self.mascara_grupo[grupo_id] |= 1 << slot
+        self.mascara_profesor[profesor_id] |= 1 << slot_global
+        self.horas_profesor[profesor_id] += 1
+    
+    def liberar(self, grupo_id: int, profesor_id: int, slot: int) -> None:
+        """Revierte exactamente lo hecho por asignar()."""
+        celda = grupo_id * SLOTS_POR_TURNO + slot
+        slot_global = self.base_grupo[grupo_id] + slot
+        self.materia_en[celda] = VACIO
+        self.profesor_en[celda] = VACIO
+        self.nivel_en[celda] = VACIO
+        self.nivel_profesor[profesor_id * TOTAL_SLOTS + slot_global] = VACIO
+        self.num_asignaciones -= 1
+        self.ocupados_grupo[grupo_id] -= 1
+        self.carga_dia[grupo_id * len(DIAS_SEMANA) + slot // HORAS_POR_DIA] -= 1
+        self.mascara_grupo[grupo_id] &= ~(1 << slot)
+        self.mascara_profesor[profesor_id] &= ~(1 << slot_global)
+        self.horas_profesor[profesor_id] -= 1
+    
+    def cargar_horario(self, horario: Dict, fijas: bool = False) -> int:
+        """
+        Ocupa los slots según un horario anidado (inverso de a_horario).
+        
+        Se ignoran las clases de grupos, materias o profesores desconocidos,
+        las de slots ajenos al turno del grupo y las que chocan con otra ya
+        cargada del mismo grupo o profesor. Con fijas=True (estado recién
+        creado) las clases quedan sin nivel (VACIO): son parte fija del
+        problema, no decisiones que el backjumping pueda deshacer.
+        
+        Returns:
+            Número de clases ignoradas
+        """
+        slot_local = {
+            turno: {
+                (DIAS_SEMANA[s // HORAS_POR_DIA], self.slot_keys[base + s]): s
+                for s in range(SLOTS_POR_TURNO)
+            }
+            for turno, base in self.base_turno.items()
+        }
+        
+        ignoradas = 0
+        for grupo_nombre, dias in horario.items():
+            grupo_id = self.id_grupo.get(grupo_nombre)
+            for dia, celdas in dias.items():
+                for slot_key, asignacion in celdas.items():
+                    if asignacion is None:
+                        continue
+                    if grupo_id is None:
+                        ignoradas += 1
+                        continue
+                    
+                    slot = slot_local[self.grupos[grupo_id].turno].get((dia, slot_key))
+                    materia_id = self.id_materia.get(asignacion['materia'])
+                    profesor_id = self.id_profesor.get(asignacion['profesor'])
+                    if (slot is None or materia_id is None or profesor_id is None
+                            or self.mascara_grupo[grupo_id] >> slot & 1
+                            or self.mascara_profesor[profesor_id] >> (self.base_grupo[grupo_id] + slot) & 1):
+                        ignoradas += 1
+                        continue
+                    self.asignar(grupo_id, materia_id, profesor_id, slot)
+        
+        if fijas:
+            self.nivel_en = array('i', [VACIO]) * len(self.nivel_en)
+            self.nivel_profesor = array('i', [VACIO]) * len(self.nivel_profesor)
+            self.num_asignaciones = 0
+        return ignoradas
+    
+    def texto_slot(self, grupo_id: int, slot: int) -> str:
+        """Representación legible de un slot local del grupo (ej: "Lunes 07:00-08:00")."""
+        return self.slot_textos[self.base_grupo[grupo_id] + slot]
+    
+    def a_horario(self) -> Dict:
+        """
+        Convierte el estado al horario anidado usado por el resto del sistema.
+        
+        Returns:
+            Diccionario {grupo: {dia: {"HH:MM-HH:MM": asignacion o None}}}
+        """
+        horario = {}
+        for grupo_id, grupo in enumerate(self.grupos):
+            base = self.base_grupo[grupo_id]
+            horario_grupo = {dia: {} for dia in DIAS_SEMANA}
+            for slot in range(SLOTS_POR_TURNO):
+                celda = grupo_id * SLOTS_POR_TURNO + slot
+                materia_id = self.materia_en[celda]
+                asignacion = None
+                if materia_id != VACIO:
+                    asignacion = {
+                        'materia': self.materias[materia_id].nombre,
+                        'profesor': self.profesores[self.profesor_en[celda]].nombre
+                    }
+                horario_grupo[DIAS_SEMANA[slot // HORAS_POR_DIA]][self.slot_keys[base + slot]] = asignacion
+            horario[grupo.nombre] = horario_grupo
+        return horario
+
+
+class TablaPendientes:
+    """
+    Asignaciones (grupo, materia) pendientes indexadas por entero.
+    
+    Reemplaza la lista de tuplas que se recorría linealmente: descontar y
+    reponer una hora cuestan O(1). Al completarse una asignación se retira
+    intercambiándola con la última de la lista; reponer deshace exactamente
+    ese intercambio, así que deshacer en orden LIFO restaura también el orden.
+    
+    Attributes:
+        asignaciones: (grupo, materia, profesores) por índice (no cambia)
+        id_asignacion: (nombre grupo, nombre materia) -> índice
+        horas_iniciales: Horas semanales requeridas por índice
+        horas_restantes: Horas pendientes por índice
+        lista: Índices de las asignaciones con horas pendientes
+        posicion: Posición de cada índice en lista (la última que tuvo si ya se completó)
+    """
+    
+    def __init__(self, asignaciones_pendientes: List[Tuple[Grupo, Materia, int, List[Profesor]]]):
+        """
+        Args:
+            asignaciones_pendientes: Lista de (grupo, materia, horas, profesores)
+        """
+        self.asignaciones = [(g, m, profs) for g, m, _, profs in asignaciones_pendientes]
+        self.id_asignacion: Dict[Tuple[str, str], int] = {
+            (g.nombre, m.nombre): i for i, (g, m, _) in enumerate(self.asignaciones)
+        }
+        self.horas_iniciales = array('i', [horas for _, _, horas, _ in asignaciones_pendientes])
+        self.horas_restantes = array('i', self.horas_iniciales)
+        self.lista = [i for i, horas in enumerate(self.horas_restantes) if horas > 0]
+        self.posicion = array('i', [VACIO]) * len(self.asignaciones)
+        for pos, asignacion_id in enumerate(self.lista):
+            self.posicion[asignacion_id] = pos
+    
+    def __len__(self) -> int:
+        return len(self.lista)
+    
+    def descontar_hora(self, asignacion_id: int) -> bool:
+        """
+        Resta una hora a la asignación y la retira si queda completa.
+        
+        Returns:
+            True si la asignación quedó completa (hay que pasarlo a reponer_hora)
+        """
+        self.horas_restantes[asignacion_id] -= 1
+        if self.horas_restantes[asignacion_id] > 0:
+            return False
+        
+        # Retirar intercambiando con la última (O(1))
+        pos = self.posicion[asignacion_id]
+        ultima = self.lista.pop()
+        if ultima != asignacion_id:
+            self.lista[pos] = ultima
+            self.posicion[ultima] = pos
+        return True
+    
+    def reponer_hora(self, asignacion_id: int, completada: bool) -> None:
+        """Revierte exactamente el último descontar_hora de la asignación."""
+        self.horas_restantes[asignacion_id] += 1
+        if not completada:
+            return
+        
+        # Deshacer el intercambio: la que ocupó su lugar vuelve al final
+        pos = self.posicion[asignacion_id]
+        if pos == len(self.lista):
+            self.lista.append(asignacion_id)
+        else:
+            movida = self.lista[pos]
+            self.posicion[movida] = len(self.lista)
+            self.lista.append(movida)
+            self.lista[pos] = asignacion_id
+    
+    def como_tuplas(self) -> List[Tuple[Grupo, Materia, int, List[Profesor]]]:
+        """Asignaciones pendientes en el formato (grupo, materia, horas, profesores)."""
+        tuplas = []
+        for asignacion_id in self.lista:
+            g, m, profs = self.asignaciones[asignacion_id]
+            tuplas.append((g, m, self.horas_restantes[asignacion_id], profs))
+        return tuplas
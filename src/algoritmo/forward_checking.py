@@ -0,0 +1,130 @@
+"""
+Forward checking para el algoritmo de backtracking.
+Mantiene el dominio vivo (slots aún posibles) de cada asignación pendiente
+y detecta callejones sin salida antes de descender en el árbol.
+"""
+
+from typing import List, Tuple, Sequence, Optional
+
+from .estado_compacto import EstadoCompacto, contar_bits, slots_posteriores
+from .restricciones import mascara_slots_validos
+from .heuristicas import ColaMRV
+
+
+class DominiosFC:
+    """
+    Dominios de las asignaciones (grupo, materia) con rastro para deshacer.
+    
+    El dominio de una asignación es el bitset de slots locales del grupo donde
+    al menos uno de sus profesores posibles puede dar la clase. Solo se
+    recalculan los dominios afectados por cada decisión: los del mismo grupo
+    y los que comparten al profesor elegido. Los tamaños de dominio también
+    alimentan la heurística MRV (ColaMRV), aunque no se pode con ellos.
+    
+    Con ruptura de simetría (slots_usados), el dominio solo incluye los slots
+    posteriores a los ya usados por la asignación.
+    
+    Attributes:
+        dominios: Bitset de slots válidos por asignación
+        rastro: Pila de (asignacion_id, dominio_anterior) para restaurar
+        cola: ColaMRV notificada de cada cambio de dominio (opcional)
+        slots_usados: Bitset de slots usados por asignación (None = sin simetría)
+    """
+    
+    def __init__(
+        self,
+        compacto: EstadoCompacto,
+        asignaciones: List[Tuple[int, List[int]]],
+        horas_restantes: Sequence[int],
+        slots_usados: Optional[Sequence[int]] = None
+    ):
+        """
+        Args:
+            compacto: Estado compacto de la búsqueda
+            asignaciones: (grupo_id, profesores_ids) por asignación
+            horas_restantes: Horas pendientes por asignación (se comparte con
+                             el motor, que la actualiza en cada decisión)
+            slots_usados: Slots usados por asignación (compartido, como
+                          horas_restantes) para la ruptura de simetría
+        """
+        self.compacto = compacto
+        self.asignaciones = asignaciones
+        self.horas_restantes = horas_restantes
+        self.slots_usados = slots_usados
+        
+        # Índices inversos: qué asignaciones se ven afectadas por cada grupo/profesor
+        self.por_grupo: List[List[int]] = [[] for _ in compacto.grupos]
+        self.por_profesor: List[List[int]] = [[] for _ in compacto.profesores]
+        for asignacion_id, (grupo_id, profesores_ids) in enumerate(asignaciones):
+            self.por_grupo[grupo_id].append(asignacion_id)
+            for profesor_id in profesores_ids:
+                self.por_profesor[profesor_id].append(asignacion_id)
+        
+        self.dominios = [self.calcular_dominio(a) for a in range(len(asignaciones))]
+        self.rastro: List[Tuple[int, int]] = []
+        self.cola: Optional[ColaMRV] = None
+    
+    def calcular_dominio(self, asignacion_id: int) -> int:
+        """Recalcula el dominio de una asignación a partir del estado actual."""
+        grupo_id, profesores_ids = self.asignaciones[asignacion_id]
+        dominio = 0
+        for profesor_id in profesores_ids:
+            dominio |= mascara_slots_validos(self.compacto, grupo_id, profesor_id)
+        if self.slots_usados is not None:
+            dominio &= slots_posteriores(self.slots_usados[asignacion_id])
+        return dominio
+    
+    def es_consistente(self) -> bool:
+        """Verifica que todas las asignaciones pendientes tengan dominio suficiente."""
+        return all(
+            contar_bits(self.dominios[a]) >= self.horas_restantes[a]
+            for a in range(len(self.asignaciones))
+        )
+    
+    def marca(self) -> int:
+        """Posición actual del rastro, para restaurar con restaurar()."""
+        return len(self.rastro)
+    
+    def propagar(self, grupo_id: int, profesor_id: int) -> bool:
+        """
+        Actualiza los dominios tras ocupar un slot del grupo y del profesor.
+        
+        Todos los dominios afectados se actualizan aunque alguno quede vacío,
+        para que la cola MRV siga siendo exacta.
+        
+        Returns:
+            False si algún dominio quedó por debajo de sus horas restantes
+        """
+        afectadas = self.por_grupo[grupo_id] + [
+            a for a in self.por_profesor[profesor_id]
+            if self.asignaciones[a][0] != grupo_id
+        ]
+        
+        consistente = True
+        for asignacion_id in afectadas:
+            horas = self.horas_restantes[asignacion_id]
+            if horas == 0:
+                continue  # Asignación completa: su dominio ya no importa
+            
+            nuevo = self.calcular_dominio(asignacion_id)
+            anterior = self.dominios[asignacion_id]
+            if nuevo != anterior:
+                self.rastro.append((asignacion_id, anterior))
+                self.dominios[asignacion_id] = nuevo
+                if self.cola is not None:
+                    self.cola.actualizar(asignacion_id)
+            
+            if contar_bits(nuevo) < horas:
+                consistente = False
+        
+        return consistente
+    
+    def restaurar(self, marca: int) -> None:
+        """Deshace los cambios de dominio posteriores a la marca."""
+        rastro = self.rastro
+        dominios = self.dominios
+        while len(rastro) > marca:
+            asignacion_id, anterior = rastro.pop()
+            dominios[asignacion_id] = anterior
+            if self.cola is not None:
+                self.cola.actualizar(asignacion_id)
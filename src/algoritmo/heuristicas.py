@@ -3,57 +3,14 @@ Heurísticas para optimizar el algoritmo de backtracking.
 Implementa MRV, Degree Heuristic y LCV para reducir el espacio de búsqueda.
 """
 
-from typing import List, Tuple, Dict, Any
-from ..core.modelos import Grupo, Materia, Profesor, Slot
+import heapq
+import random
+from typing import List, Tuple, Dict, Any, Optional, Sequence
+from ..core.modelos import Grupo, Materia, Profesor
 from ..core.grafo_conflictos import GrafoConflictos, NodoAsignacion
-from ..core.config import get_all_slots
-
-
-def ordenar_por_mrv(
-    asignaciones_pendientes: List[Tuple],
-    estado: Dict,
-    grupos: List[Grupo]
-) -> List[Tuple]:
-    """
-    MRV (Minimum Remaining Values): Ordena asignaciones por número de slots disponibles.
-    
-    Coloca primero las asignaciones con MENOS slots disponibles (más restringidas).
-    Esto implementa la estrategia "fail-fast": detectar callejones sin salida temprano.
-    
-    Args:
-        asignaciones_pendientes: Lista de (grupo, materia, horas_restantes, profesores)
-        estado: Estado actual del algoritmo
-        grupos: Lista de todos los grupos
-    
-    Returns:
-        Lista ordenada de asignaciones (más restringida primero)
-    """
-    def contar_slots_disponibles(asignacion: Tuple) -> int:
-        """Cuenta cuántos slots están disponibles para una asignación."""
-        grupo_obj, materia, horas_restantes, profesores = asignacion
-        
-        # Obtener todos los slots del turno del grupo
-        slots_turno = get_all_slots(grupo_obj.turno)
-        
-        # Contar slots realmente disponibles
-        slots_disponibles = 0
-        horario = estado['horario']
-        
-        for slot in slots_turno:
-            # Verificar si el slot está libre para el grupo
-            if grupo_obj.nombre in horario:
-                if slot.dia in horario[grupo_obj.nombre]:
-                    slot_key = f"{slot.hora_inicio}-{slot.hora_fin}"
-                    if slot_key in horario[grupo_obj.nombre][slot.dia]:
-                        if horario[grupo_obj.nombre][slot.dia][slot_key] is not None:
-                            continue  # Slot ocupado
-            
-            slots_disponibles += 1
-        
-        return slots_disponibles
-    
-    # Ordenar por número de slots disponibles (ascendente)
-    return sorted(asignaciones_pendientes, key=contar_slots_disponibles)
+from ..core.config import DIAS_SEMANA
+from .estado_compacto import HORAS_POR_DIA, contar_bits
+from .restricciones import PUNTAJE_DIA, MASCARA_DIA
 
 
 def ordenar_por_degree(
@@ -94,21 +51,22 @@ def ordenar_por_degree(
 
 
 def seleccionar_mejor_slot(
-    slots_disponibles: List[Slot],
-    horario: Dict,
+    slots_disponibles: List[int],
     grupo: Grupo,
     materia: Materia,
     estado: Dict
-) -> List[Slot]:
+) -> List[int]:
     """
     LCV (Least Constraining Value): Ordena slots por cuánto restringen futuras asignaciones.
     
     Elige primero los slots que MENOS restrinjan las decisiones futuras.
     Esto maximiza las opciones para asignaciones posteriores.
+    Si el estado trae un generador 'aleatorio', los empates se rompen al azar.
+    Con estado['orden_calidad'], en cambio, van primero los slots que más
+    suben el score de calidad del grupo (ver calcular_score_calidad).
     
     Args:
-        slots_disponibles: Lista de slots candidatos
-        horario: Horario actual
+        slots_disponibles: Slots locales candidatos (0..34 dentro del turno del grupo)
         grupo: Grupo a asignar
         materia: Materia a asignar
         estado: Estado actual
@@ -116,68 +74,126 @@ def seleccionar_mejor_slot(
     Returns:
         Lista de slots ordenada (menos restrictivo primero)
     """
-    def calcular_restriccion(slot: Slot) -> int:
+    compacto = estado['compacto']
+    grupo_id = compacto.id_grupo[grupo.nombre]
+    base = compacto.base_grupo[grupo_id]
+    base_dia = grupo_id * len(DIAS_SEMANA)
+    aleatorio = estado.get('aleatorio')
+    
+    def calcular_restriccion(slot: int) -> int:
         """
         Calcula cuántas futuras asignaciones se restringirían con este slot.
         Valor más bajo = menos restrictivo = mejor.
         """
-        restriccion = 0
+        carga_dia_actual = compacto.carga_dia[base_dia + slot // HORAS_POR_DIA]
         
         # Factor 1: Slots ya ocupados en ese día para el grupo
-        if grupo.nombre in horario:
-            if slot.dia in horario[grupo.nombre]:
-                ocupados = sum(1 for v in horario[grupo.nombre][slot.dia].values() if v is not None)
-                restriccion += ocupados * 2  # Penalizar días ya ocupados
+        restriccion = carga_dia_actual * 2  # Penalizar días ya ocupados
         
         # Factor 2: Horas tempranas son más valiosas (menos restricción)
-        hora = int(slot.hora_inicio.split(':')[0])
+        hora = compacto.hora_slot[base + slot]
         if hora < 10:  # Horas tempranas
             restriccion -= 3
         elif hora > 18:  # Horas tardías
             restriccion += 3
         
         # Factor 3: Preferir días con menos carga
-        dias_carga = {}
-        if grupo.nombre in horario:
-            for dia, slots_dia in horario[grupo.nombre].items():
-                carga = sum(1 for v in slots_dia.values() if v is not None)
-                dias_carga[dia] = carga
-        
-        carga_dia_actual = dias_carga.get(slot.dia, 0)
         restriccion += carga_dia_actual
         
         return restriccion
     
-    # Ordenar por restricción (ascendente = menos restrictivo primero)
-    return sorted(slots_disponibles, key=calcular_restriccion)
+    mascara = compacto.mascara_grupo[grupo_id]
+    
+    def calcular_perdida_calidad(slot: int) -> int:
+        """Score de calidad que se pierde (negativo = se gana) con este slot."""
+        dia = (mascara >> (slot // HORAS_POR_DIA * HORAS_POR_DIA)) & MASCARA_DIA
+        return PUNTAJE_DIA[dia] - PUNTAJE_DIA[dia | 1 << (slot % HORAS_POR_DIA)]
+    
+    criterio = calcular_perdida_calidad if estado.get('orden_calidad') else calcular_restriccion
+    
+    # Ordenar por el criterio (ascendente = menos restrictivo o mejor calidad primero)
+    if aleatorio is not None:
+        return sorted(
+            slots_disponibles,
+            key=lambda slot: (criterio(slot), aleatorio.random())
+        )
+    return sorted(slots_disponibles, key=criterio)
 
 
-def aplicar_heuristicas_combinadas(
-    asignaciones_pendientes: List[Tuple],
-    estado: Dict,
-    grafo: GrafoConflictos,
-    grupos: List[Grupo]
-) -> List[Tuple]:
+class ColaMRV:
     """
-    Aplica MRV y Degree Heuristic combinadas.
+    Cola de prioridad incremental para seleccionar la siguiente asignación.
     
-    Primero ordena por MRV (menos slots disponibles).
-    En caso de empate, usa Degree (más conflictos).
-    
-    Args:
-        asignaciones_pendientes: Lista de asignaciones
-        estado: Estado actual
-        grafo: Grafo de conflictos
-        grupos: Lista de grupos
+    Mantiene un heap con clave (valores restantes, -grado, desempate) e invalidación
+    perezosa: cada vez que cambia el dominio de una asignación se inserta una
+    entrada nueva con versión mayor, y las entradas viejas se descartan al
+    llegar a la cima. Seleccionar cuesta O(log n) amortizado en lugar de
+    recalcular y ordenar todas las asignaciones pendientes en cada nodo.
     
-    Returns:
-        Lista ordenada con heurísticas combinadas
+    El desempate es el índice de la asignación, salvo que se baraje con
+    barajar() para los reinicios aleatorizados.
     """
-    # Primero aplicar MRV
-    ordenadas_mrv = ordenar_por_mrv(asignaciones_pendientes, estado, grupos)
-    
-    # Luego aplicar Degree como desempate
-    # (En caso de que MRV dé el mismo valor)
-    ordenadas_final = ordenar_por_degree(ordenadas_mrv, grafo)
     
-    return ordenadas_final
+    def __init__(
+        self,
+        dominios: List[int],
+        horas_restantes: Sequence[int],
+        grados: List[int]
+    ):
+        """
+        Args:
+            dominios: Bitset de slots válidos por asignación (lista compartida
+                      con DominiosFC, que la mantiene actualizada)
+            horas_restantes: Horas pendientes por asignación (compartida)
+            grados: Grado de cada asignación en el grafo de conflictos
+        """
+        self.dominios = dominios
+        self.horas_restantes = horas_restantes
+        self.grados = grados
+        self.version = [0] * len(dominios)
+        self.desempate = list(range(len(dominios)))
+        self._reconstruir()
+    
+    def _reconstruir(self) -> None:
+        """Reconstruye el heap solo con las entradas vigentes."""
+        self.heap = [
+            (contar_bits(self.dominios[a]), -self.grados[a], self.desempate[a], a, self.version[a])
+            for a in range(len(self.dominios))
+            if self.horas_restantes[a] > 0
+        ]
+        heapq.heapify(self.heap)
+    
+    def actualizar(self, asignacion_id: int) -> None:
+        """Registra que el dominio (o las horas) de una asignación cambió."""
+        self.version[asignacion_id] += 1
+        heapq.heappush(self.heap, (
+            contar_bits(self.dominios[asignacion_id]),
+            -self.grados[asignacion_id],
+            self.desempate[asignacion_id],
+            asignacion_id,
+            self.version[asignacion_id]
+        ))
+    
+    def barajar(self, aleatorio: random.Random) -> None:
+        """Sortea un nuevo orden de desempate y reconstruye el heap."""
+        aleatorio.shuffle(self.desempate)
+        self._reconstruir()
+    
+    def seleccionar(self) -> Optional[int]:
+        """
+        Retorna la asignación pendiente más restringida sin retirarla.
+        
+        Returns:
+            Índice de la asignación, o None si no quedan pendientes
+        """
+        # Evitar que las entradas obsoletas crezcan sin límite
+        if len(self.heap) > 4 * len(self.dominios) + 64:
+            self._reconstruir()
+        
+        heap = self.heap
+        while heap:
+            _, _, _, asignacion_id, version = heap[0]
+            if version == self.version[asignacion_id] and self.horas_restantes[asignacion_id] > 0:
+                return asignacion_id
+            heapq.heappop(heap)
+        return None
@@ -0,0 +1,125 @@
+"""
+Aprendizaje de nogoods para el algoritmo de backtracking.
+Guarda las combinaciones de decisiones que ya llevaron a un callejón sin
+salida para podarlas en cuanto reaparecen, aunque sea en otro orden.
+"""
+
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Decisión del motor: (asignacion_id, profesor_id, slot local), más el número
+# de hora de la asignación cuando se rompe la simetría entre sus horas
+Decision = Tuple[int, ...]
+
+# Nogoods más largos casi nunca se repiten y encarecen cada comprobación
+LONGITUD_MAXIMA_NOGOOD = 64
+
+
+class AlmacenNogoods:
+    """
+    Almacén de nogoods con índice por decisión y expulsión LRU.
+    
+    Un nogood es un conjunto de decisiones que no puede formar parte de
+    ninguna solución (el conjunto de conflicto de un nivel agotado). Cada
+    nogood se indexa por todas sus decisiones, de modo que al aplicar una
+    decisión solo se revisan los nogoods que la contienen. Al superar la
+    capacidad se descarta el nogood usado hace más tiempo; los nogoods de
+    más de longitud_maxima decisiones no se guardan.
+    
+    Attributes:
+        capacidad: Máximo de nogoods guardados
+        longitud_maxima: Máximo de decisiones de un nogood guardado
+        nogoods: Nogoods en orden de uso (el primero es el menos reciente)
+        indice: Decisión -> nogoods que la contienen
+        pila: Decisiones vigentes, por nivel
+        actuales: Decisiones vigentes -> nivel en que se tomaron
+        aprendidos, podas, descartados, largos: Contadores para las estadísticas
+    """
+    
+    def __init__(self, capacidad: int, longitud_maxima: int = LONGITUD_MAXIMA_NOGOOD):
+        """
+        Args:
+            capacidad: Máximo de nogoods guardados (debe ser positiva)
+            longitud_maxima: Máximo de decisiones de un nogood guardado
+        """
+        if capacidad <= 0:
+            raise ValueError(f"Capacidad de nogoods inválida: {capacidad}")
+        self.capacidad = capacidad
+        self.longitud_maxima = longitud_maxima
+        self.nogoods: 'OrderedDict[FrozenSet[Decision], None]' = OrderedDict()
+        self.indice: Dict[Decision, Set[FrozenSet[Decision]]] = {}
+        self.pila: List[Decision] = []
+        self.actuales: Dict[Decision, int] = {}
+        self.aprendidos = 0
+        self.podas = 0
+        self.descartados = 0
+        self.largos = 0
+    
+    def __len__(self) -> int:
+        return len(self.nogoods)
+    
+    def aplicar(self, decision: Decision) -> None:
+        """Registra una decisión tomada en el nivel siguiente."""
+        self.actuales[decision] = len(self.pila)
+        self.pila.append(decision)
+    
+    def deshacer(self) -> None:
+        """Retira la última decisión (las decisiones se deshacen en orden LIFO)."""
+        del self.actuales[self.pila.pop()]
+    
+    def aprender(self, niveles: Iterable[int]) -> None:
+        """
+        Guarda como nogood las decisiones vigentes de los niveles dados. Los
+        vacíos (el problema no tiene solución), los demasiado largos y los
+        ya conocidos se ignoran.
+        """
+        nogood = frozenset(self.pila[nivel] for nivel in niveles)
+        if len(nogood) > self.longitud_maxima:
+            self.largos += 1
+            return
+        if not nogood or nogood in self.nogoods:
+            return
+        
+        self.nogoods[nogood] = None
+        for decision in nogood:
+            self.indice.setdefault(decision, set()).add(nogood)
+        self.aprendidos += 1
+        
+        if len(self.nogoods) > self.capacidad:
+            antiguo, _ = self.nogoods.popitem(last=False)
+            for decision in antiguo:
+                contienen = self.indice[decision]
+                contienen.discard(antiguo)
+                if not contienen:
+                    del self.indice[decision]
+            self.descartados += 1
+    
+    def violado(self) -> Optional[Set[int]]:
+        """
+        Comprueba si la última decisión aplicada completa algún nogood.
+        
+        Solo se revisan los nogoods que contienen la decisión: los demás ya
+        se comprobaron al aplicar sus propias decisiones.
+        
+        Returns:
+            None si no se viola ninguno; si no, los niveles de las demás
+            decisiones del nogood (explicación para el conjunto de conflicto)
+        """
+        actuales = self.actuales
+        decision = self.pila[-1]
+        for nogood in self.indice.get(decision, ()):
+            if all(d in actuales for d in nogood):
+                self.nogoods.move_to_end(nogood)
+                self.podas += 1
+                return {actuales[d] for d in nogood if d != decision}
+        return None
+    
+    def estadisticas(self) -> Dict[str, int]:
+        """Resumen del uso del almacén."""
+        return {
+            'guardados': len(self.nogoods),
+            'aprendidos': self.aprendidos,
+            'podas': self.podas,
+            'descartados': self.descartados,
+            'largos': self.largos
+        }
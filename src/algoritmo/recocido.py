@@ -0,0 +1,150 @@
+"""
+Recocido simulado sobre un horario válido.
+Mejora el score de calidad (restricciones blandas de calcular_score_calidad)
+moviendo clases dentro de su grupo sin romper ninguna restricción dura.
+"""
+
+import math
+import time
+import random
+from array import array
+from typing import List, Dict, Any, Optional, Tuple
+
+from ..core.modelos import Grupo, Materia, Profesor
+from .estado_compacto import EstadoCompacto, SLOTS_POR_TURNO
+from .restricciones import CalidadIncremental
+
+
+def optimizar_recocido(
+    horario: Dict,
+    grupos: List[Grupo],
+    materias: List[Materia],
+    profesores: List[Profesor],
+    max_segundos: float = 5.0,
+    max_iteraciones: Optional[int] = None,
+    temperatura_inicial: float = 10.0,
+    temperatura_final: float = 0.1,
+    semilla: Optional[int] = None,
+    cancelacion: Optional[Any] = None
+) -> Tuple[Dict, Dict[str, Any]]:
+    """
+    Mejora la calidad de un horario con recocido simulado.
+    
+    Cada movimiento toma una clase al azar y la lleva a otro slot de su
+    grupo: si está libre (y el profesor también, y disponible) la clase se
+    mueve; si lo ocupa otra clase del grupo, se intercambian cuando ambos
+    profesores quedan libres y disponibles. Materia, profesor y horas por profesor no cambian, así
+    que las restricciones duras se mantienen. El score solo depende de los
+    slots ocupados de cada día, por lo que un movimiento se evalúa en O(1)
+    con CalidadIncremental; los intercambios no cambian el score y siempre
+    se aceptan.
+    
+    La temperatura baja geométricamente de temperatura_inicial a
+    temperatura_final según la fracción consumida del presupuesto.
+    
+    Args:
+        horario: Horario válido (ej: el de resolver_backtracking)
+        grupos: Lista de grupos
+        materias: Lista de materias
+        profesores: Lista de profesores
+        max_segundos: Tiempo de optimización
+        max_iteraciones: Máximo de movimientos propuestos (None = sin límite)
+        temperatura_inicial: Temperatura al empezar (en puntos de score)
+        temperatura_final: Temperatura al agotar el presupuesto
+        semilla: Semilla para los sorteos (None = no reproducible)
+        cancelacion: Objeto con is_set() (ej: threading.Event) para detener la optimización
+    
+    Returns:
+        Tupla (horario, estadisticas): el mejor horario visto y
+        'puntaje_inicial', 'puntaje_final' (suma de calcular_score_calidad
+        de todos los grupos), 'iteraciones', 'aceptados' y 'tiempo_total'
+    """
+    tiempo_inicio = time.time()
+    aleatorio = random.Random(semilla)
+    
+    compacto = EstadoCompacto(grupos, materias, profesores)
+    compacto.cargar_horario(horario)
+    grupos_con_clases = [g for g in range(len(compacto.grupos)) if compacto.mascara_grupo[g]]
+    
+    calidad = CalidadIncremental.desde_estado(compacto)
+    puntaje = calidad.total
+    puntaje_inicial = mejor_puntaje = puntaje
+    mejor = (array('i', compacto.materia_en), array('i', compacto.profesor_en))
+    
+    iteraciones = 0
+    aceptados = 0
+    temperatura = temperatura_inicial
+    enfriamiento = temperatura_final / temperatura_inicial
+    while grupos_con_clases:
+        # Presupuesto y temperatura: se revisan cada 256 movimientos
+        if iteraciones % 256 == 0:
+            fraccion = (time.time() - tiempo_inicio) / max_segundos if max_segundos > 0 else 1.0
+            if max_iteraciones is not None:
+                fraccion = max(fraccion, iteraciones / max_iteraciones)
+            if fraccion >= 1.0 or (cancelacion is not None and cancelacion.is_set()):
+                break
+            temperatura = temperatura_inicial * enfriamiento ** fraccion
+        iteraciones += 1
+        
+        grupo_id = aleatorio.choice(grupos_con_clases)
+        mascara = compacto.mascara_grupo[grupo_id]
+        origen = aleatorio.randrange(SLOTS_POR_TURNO)
+        while not mascara >> origen & 1:
+            origen = aleatorio.randrange(SLOTS_POR_TURNO)
+        destino = aleatorio.randrange(SLOTS_POR_TURNO - 1)
+        if destino >= origen:
+            destino += 1
+        
+        base = compacto.base_grupo[grupo_id]
+        celda_origen = grupo_id * SLOTS_POR_TURNO + origen
+        celda_destino = grupo_id * SLOTS_POR_TURNO + destino
+        materia_id = compacto.materia_en[celda_origen]
+        profesor_id = compacto.profesor_en[celda_origen]
+        
+        if mascara >> destino & 1:
+            # Intercambio: mismo score, solo hace falta que ambos profesores queden libres
+            otra_materia = compacto.materia_en[celda_destino]
+            otro_profesor = compacto.profesor_en[celda_destino]
+            if otro_profesor != profesor_id and (
+                compacto.mascara_profesor[profesor_id] >> (base + destino) & 1
+                or compacto.mascara_profesor[otro_profesor] >> (base + origen) & 1
+            ):
+                continue
+            if not (compacto.disponible_profesor[profesor_id] >> (base + destino) & 1
+                    and compacto.disponible_profesor[otro_profesor] >> (base + origen) & 1):
+                continue
+            compacto.liberar(grupo_id, profesor_id, origen)
+            compacto.liberar(grupo_id, otro_profesor, destino)
+            compacto.asignar(grupo_id, materia_id, profesor_id, destino)
+            compacto.asignar(grupo_id, otra_materia, otro_profesor, origen)
+            aceptados += 1
+            continue
+        
+        if (compacto.mascara_profesor[profesor_id] >> (base + destino) & 1
+                or not compacto.disponible_profesor[profesor_id] >> (base + destino) & 1):
+            continue
+        
+        delta = calidad.delta_mover(grupo_id, origen, destino)
+        if delta < 0 and aleatorio.random() >= math.exp(delta / temperatura):
+            continue
+        
+        compacto.liberar(grupo_id, profesor_id, origen)
+        compacto.asignar(grupo_id, materia_id, profesor_id, destino)
+        calidad.mover(grupo_id, origen, destino)
+        aceptados += 1
+        puntaje += delta
+        if puntaje > mejor_puntaje:
+            mejor_puntaje = puntaje
+            mejor = (array('i', compacto.materia_en), array('i', compacto.profesor_en))
+    
+    # a_horario solo lee materia_en y profesor_en
+    compacto.materia_en, compacto.profesor_en = mejor
+    
+    estadisticas = {
+        'puntaje_inicial': puntaje_inicial,
+        'puntaje_final': mejor_puntaje,
+        'iteraciones': iteraciones,
+        'aceptados': aceptados,
+        'tiempo_total': time.time() - tiempo_inicio
+    }
+    return compacto.a_horario(), estadisticas
@@ -3,9 +3,16 @@ Validación de restricciones para el algoritmo de backtracking.
 Implementa restricciones duras (obligatorias) y blandas (preferencias).
 """
 
-from typing import Tuple, Dict, Any, List
+from array import array
+from typing import Tuple, Dict, Any, List, Set
 from ..core.modelos import Grupo, Materia, Profesor, Slot
-from ..core.config import DIAS_SEMANA
+from ..core.config import DIAS_SEMANA, indice_slot, mascara_disponibilidad
+from .estado_compacto import (
+    EstadoCompacto, SLOTS_POR_TURNO, TOTAL_SLOTS, MASCARA_TURNO, HORAS_POR_DIA, VACIO, contar_bits
+)
+
+# Máscara con las horas de un día encendidas
+MASCARA_DIA = (1 << HORAS_POR_DIA) - 1
 
 
 def validar_restricciones_duras(
@@ -24,6 +31,11 @@ def validar_restricciones_duras(
     2. Grupo no tiene otra clase en ese slot
     3. Slot está en el turno correcto del grupo
     4. Profesor tiene horas disponibles suficientes
+    5. Profesor acepta el turno del slot
+    6. Slot está dentro de la disponibilidad horaria del profesor
+    
+    Si el estado contiene 'compacto' (motor de backtracking), la ocupación
+    se comprueba con bitsets en lugar del horario anidado.
     
     Args:
         horario: Matriz 3D de asignaciones actuales
@@ -40,12 +52,25 @@ def validar_restricciones_duras(
     if slot.turno != grupo.turno:
         return False, f"Slot {slot} no corresponde al turno {grupo.turno} del grupo {grupo.nombre}"
     
+    # Los slots de config ya traen su índice global
+    slot_global = slot.indice if slot.indice >= 0 else indice_slot(slot.turno, slot.dia, slot.hora_inicio)
+    
+    # Con estado compacto: comprobación por bitsets
+    compacto = estado.get('compacto')
+    if compacto is not None:
+        grupo_id = compacto.id_grupo[grupo.nombre]
+        return validar_restricciones_compacto(
+            compacto,
+            grupo_id,
+            compacto.id_profesor[profesor.nombre],
+            slot_global - compacto.base_grupo[grupo_id]
+        )
+    
     # Restricción 2: Verificar que el grupo no tenga otra clase en ese slot
     if grupo.nombre in horario:
         if slot.dia in horario[grupo.nombre]:
-            slot_key = f"{slot.hora_inicio}-{slot.hora_fin}"
-            if slot_key in horario[grupo.nombre][slot.dia]:
-                asignacion_existente = horario[grupo.nombre][slot.dia][slot_key]
+            if slot.slot_key in horario[grupo.nombre][slot.dia]:
+                asignacion_existente = horario[grupo.nombre][slot.dia][slot.slot_key]
                 if asignacion_existente is not None:
                     return False, f"Grupo {grupo.nombre} ya tiene {asignacion_existente['materia']} en {slot}"
     
@@ -53,8 +78,7 @@ def validar_restricciones_duras(
     profesor_ocupado = estado.get('profesor_ocupado', {})
     if profesor.nombre in profesor_ocupado:
         if slot.dia in profesor_ocupado[profesor.nombre]:
-            slot_key = f"{slot.hora_inicio}-{slot.hora_fin}"
-            if slot_key in profesor_ocupado[profesor.nombre][slot.dia]:
+            if slot.slot_key in profesor_ocupado[profesor.nombre][slot.dia]:
                 return False, f"Profesor {profesor.nombre} ya está ocupado en {slot}"
     
     # Restricción 4: Verificar que el profesor tenga horas disponibles
@@ -66,9 +90,277 @@ def validar_restricciones_duras(
     if profesor.turno_preferido not in ["Ambos", slot.turno]:
         return False, f"Profesor {profesor.nombre} prefiere turno {profesor.turno_preferido}, no {slot.turno}"
     
+    # Restricción 6: Verificar la disponibilidad horaria del profesor (bitset compilado)
+    if not mascara_disponibilidad(profesor) >> slot_global & 1:
+        return False, f"Profesor {profesor.nombre} no está disponible en {slot}"
+    
     return True, "Válido"
 
 
+def validar_restricciones_compacto(
+    compacto: EstadoCompacto,
+    grupo_id: int,
+    profesor_id: int,
+    slot: int
+) -> Tuple[bool, str]:
+    """
+    Versión indexada de validar_restricciones_duras para el motor de búsqueda.
+    
+    Verifica las mismas restricciones sobre el estado compacto. El slot es
+    local al turno del grupo, por lo que la restricción de turno del grupo
+    se cumple por construcción. La razón solo se formatea cuando hay fallo;
+    causas_conflicto() indica qué asignaciones previas lo provocan.
+    
+    Args:
+        compacto: Estado compacto de la búsqueda
+        grupo_id: Índice del grupo
+        profesor_id: Índice del profesor
+        slot: Slot local (0..34) dentro del turno del grupo
+    
+    Returns:
+        Tupla (es_valido, razon)
+    """
+    # Restricción 2: El grupo no tiene otra clase en ese slot
+    if compacto.mascara_grupo[grupo_id] >> slot & 1:
+        materia_id = compacto.materia_en[grupo_id * SLOTS_POR_TURNO + slot]
+        return False, (f"Grupo {compacto.grupos[grupo_id].nombre} ya tiene "
+                       f"{compacto.materias[materia_id].nombre} en {compacto.texto_slot(grupo_id, slot)}")
+    
+    # Restricción 3: El profesor no está ocupado en ese slot
+    base = compacto.base_grupo[grupo_id]
+    if compacto.mascara_profesor[profesor_id] >> (base + slot) & 1:
+        return False, (f"Profesor {compacto.profesores[profesor_id].nombre} ya está ocupado "
+                       f"en {compacto.texto_slot(grupo_id, slot)}")
+    
+    # Restricción 4: El profesor tiene horas disponibles
+    horas_asignadas = compacto.horas_profesor[profesor_id]
+    if horas_asignadas >= compacto.horas_max_profesor[profesor_id]:
+        profesor = compacto.profesores[profesor_id]
+        return False, (f"Profesor {profesor.nombre} no tiene horas disponibles "
+                       f"({horas_asignadas}/{profesor.horas_disponibles})")
+    
+    # Restricción 5: Compatibilidad de turno del profesor
+    turno = base // SLOTS_POR_TURNO
+    if not compacto.turno_valido[profesor_id * len(compacto.base_turno) + turno]:
+        profesor = compacto.profesores[profesor_id]
+        return False, (f"Profesor {profesor.nombre} prefiere turno {profesor.turno_preferido}, "
+                       f"no {compacto.grupos[grupo_id].turno}")
+    
+    # Restricción 6: Disponibilidad horaria del profesor
+    if not compacto.disponible_profesor[profesor_id] >> (base + slot) & 1:
+        return False, (f"Profesor {compacto.profesores[profesor_id].nombre} no está disponible "
+                       f"en {compacto.texto_slot(grupo_id, slot)}")
+    
+    return True, "Válido"
+
+
+def causas_conflicto(
+    compacto: EstadoCompacto,
+    grupo_id: int,
+    profesor_id: int,
+    slots: int = MASCARA_TURNO
+) -> Set[int]:
+    """
+    Asignaciones previas responsables de que los slots dados sean inválidos.
+    
+    Explica a la vez los fallos de validar_restricciones_compacto en todos
+    los slots del bitset, con los niveles (orden de asignación, ver
+    EstadoCompacto.nivel_en) de las asignaciones que los provocan; basta
+    una causa por slot:
+    - Turno o disponibilidad horaria del profesor: ninguna (restricciones estáticas)
+    - Horas agotadas: todas las asignaciones del profesor (explican todos los slots)
+    - Grupo ocupado: la asignación que ocupa ese slot del grupo
+    - Profesor ocupado: la asignación que ocupa ese slot del profesor
+    Las clases fijas (nivel VACIO) no las causó ninguna decisión y no cuentan.
+    
+    Args:
+        compacto: Estado compacto de la búsqueda
+        grupo_id: Índice del grupo
+        profesor_id: Índice del profesor
+        slots: Bitset de slots locales (0..34) a explicar; por defecto todo el turno
+    
+    Returns:
+        Conjunto de niveles; vacío si los slots son válidos o los fallos son estáticos
+    """
+    base = compacto.base_grupo[grupo_id]
+    if not compacto.turno_valido[profesor_id * len(compacto.base_turno) + base // SLOTS_POR_TURNO]:
+        return set()
+    
+    base_profesor = profesor_id * TOTAL_SLOTS
+    if compacto.horas_profesor[profesor_id] >= compacto.horas_max_profesor[profesor_id]:
+        return _niveles_mascara(compacto.mascara_profesor[profesor_id], compacto.nivel_profesor, base_profesor)
+    
+    slots &= compacto.disponible_profesor[profesor_id] >> base
+    ocupados_grupo = compacto.mascara_grupo[grupo_id] & slots
+    solo_profesor = (compacto.mascara_profesor[profesor_id] >> base) & slots & ~ocupados_grupo
+    causas = _niveles_mascara(ocupados_grupo, compacto.nivel_en, grupo_id * SLOTS_POR_TURNO)
+    causas.update(_niveles_mascara(solo_profesor, compacto.nivel_profesor, base_profesor + base))
+    return causas
+
+
+def _niveles_mascara(mascara: int, niveles, desplazamiento: int) -> Set[int]:
+    """Niveles guardados en niveles[desplazamiento + bit] para cada bit encendido (sin los VACIO)."""
+    resultado = set()
+    while mascara:
+        bit = mascara & -mascara
+        nivel = niveles[desplazamiento + bit.bit_length() - 1]
+        if nivel != VACIO:  # Clase fija: no la causó ninguna decisión
+            resultado.add(nivel)
+        mascara ^= bit
+    return resultado
+
+
+def mascara_slots_validos(
+    compacto: EstadoCompacto,
+    grupo_id: int,
+    profesor_id: int
+) -> int:
+    """
+    Calcula de una vez todos los slots donde el profesor puede dar clase al grupo.
+    
+    Equivale a llamar validar_restricciones_compacto para los 35 slots del
+    turno: una OR sobre los bitsets de ocupación y una AND con la
+    disponibilidad horaria del profesor, más las restricciones que no
+    dependen del slot (horas y turno del profesor).
+    
+    Args:
+        compacto: Estado compacto de la búsqueda
+        grupo_id: Índice del grupo
+        profesor_id: Índice del profesor
+    
+    Returns:
+        Bitset de slots locales válidos (bit encendido = válido)
+    """
+    if compacto.horas_profesor[profesor_id] >= compacto.horas_max_profesor[profesor_id]:
+        return 0
+    
+    base = compacto.base_grupo[grupo_id]
+    if not compacto.turno_valido[profesor_id * len(compacto.base_turno) + base // SLOTS_POR_TURNO]:
+        return 0
+    
+    ocupados = compacto.mascara_grupo[grupo_id] | (compacto.mascara_profesor[profesor_id] >> base)
+    return MASCARA_TURNO & ~ocupados & (compacto.disponible_profesor[profesor_id] >> base)
+
+
+def componentes_dia(mascara: int) -> Tuple[int, int, int]:
+    """
+    Componentes del score de calidad de un día a partir de su bitset de horas.
+    
+    Equivalen a lo que calcular_score_calidad cuenta en un día (bit i =
+    i-ésima hora del turno).
+    
+    Returns:
+        Tupla (huecos, sobrecargado, consecutivas): huecos entre clases, 1 si
+        hay más de 4 horas (si no 0) y pares de clases consecutivas
+    """
+    if not mascara:
+        return 0, 0, 0
+    # Cada bloque de horas seguidas salvo el primero empieza tras un hueco
+    huecos = contar_bits(mascara & ~(mascara << 1)) - 1
+    sobrecargado = 1 if contar_bits(mascara) > 4 else 0
+    consecutivas = contar_bits(mascara & (mascara >> 1))
+    return huecos, sobrecargado, consecutivas
+
+
+def _puntaje(huecos: int, sobrecargados: int, consecutivas: int) -> int:
+    """Score de calidad a partir de sus componentes."""
+    return consecutivas * 5 - huecos * 10 - sobrecargados * 5
+
+
+# Componentes y score de cada combinación de horas ocupadas en un día (índice = bitset)
+COMPONENTES_DIA = [componentes_dia(mascara) for mascara in range(1 << HORAS_POR_DIA)]
+PUNTAJE_DIA = [_puntaje(*componentes) for componentes in COMPONENTES_DIA]
+
+
+class CalidadIncremental:
+    """
+    Score de calidad de todos los grupos, actualizado hora a hora.
+    
+    Mantiene un bitset de horas ocupadas por (grupo, día) y los totales de
+    huecos, días sobrecargados y pares consecutivos. Colocar o retirar una
+    hora solo afecta a su día: se restan los componentes anteriores de ese
+    día y se suman los nuevos (COMPONENTES_DIA), en O(1). El total coincide
+    con la suma de calcular_score_calidad de todos los grupos.
+    
+    Attributes:
+        mascaras: Bitset de 7 bits por (grupo, día)
+        huecos: Huecos entre clases de todos los grupos
+        sobrecargados: Días con más de 4 horas
+        consecutivas: Pares de clases consecutivas
+    """
+    
+    def __init__(self, num_grupos: int):
+        """Crea el marcador con todos los grupos vacíos."""
+        self.mascaras = array('i', [0]) * (num_grupos * len(DIAS_SEMANA))
+        self.huecos = 0
+        self.sobrecargados = 0
+        self.consecutivas = 0
+    
+    @classmethod
+    def desde_estado(cls, compacto: EstadoCompacto) -> 'CalidadIncremental':
+        """Marcador con la ocupación actual de los grupos del estado compacto."""
+        calidad = cls(len(compacto.grupos))
+        for grupo_id, mascara in enumerate(compacto.mascara_grupo):
+            for dia in range(len(DIAS_SEMANA)):
+                calidad._cambiar_dia(
+                    grupo_id * len(DIAS_SEMANA) + dia,
+                    (mascara >> (dia * HORAS_POR_DIA)) & MASCARA_DIA
+                )
+        return calidad
+    
+    @property
+    def total(self) -> int:
+        """Score de calidad total."""
+        return _puntaje(self.huecos, self.sobrecargados, self.consecutivas)
+    
+    def puntaje_grupo(self, grupo_id: int) -> int:
+        """Score de un grupo (igual a calcular_score_calidad para ese grupo)."""
+        inicio = grupo_id * len(DIAS_SEMANA)
+        return sum(PUNTAJE_DIA[m] for m in self.mascaras[inicio:inicio + len(DIAS_SEMANA)])
+    
+    def _cambiar_dia(self, indice: int, nueva: int) -> None:
+        """Reemplaza el bitset de un (grupo, día) actualizando los totales."""
+        huecos, sobrecargado, consecutivas = COMPONENTES_DIA[self.mascaras[indice]]
+        nuevos_huecos, nuevo_sobrecargado, nuevas_consecutivas = COMPONENTES_DIA[nueva]
+        self.huecos += nuevos_huecos - huecos
+        self.sobrecargados += nuevo_sobrecargado - sobrecargado
+        self.consecutivas += nuevas_consecutivas - consecutivas
+        self.mascaras[indice] = nueva
+    
+    def colocar(self, grupo_id: int, slot: int) -> None:
+        """Marca ocupado el slot local del grupo."""
+        indice = grupo_id * len(DIAS_SEMANA) + slot // HORAS_POR_DIA
+        self._cambiar_dia(indice, self.mascaras[indice] | 1 << (slot % HORAS_POR_DIA))
+    
+    def retirar(self, grupo_id: int, slot: int) -> None:
+        """Marca libre el slot local del grupo."""
+        indice = grupo_id * len(DIAS_SEMANA) + slot // HORAS_POR_DIA
+        self._cambiar_dia(indice, self.mascaras[indice] & ~(1 << (slot % HORAS_POR_DIA)))
+    
+    def delta_mover(self, grupo_id: int, origen: int, destino: int) -> int:
+        """
+        Cambio del total si la hora del slot origen pasara al destino (libre).
+        
+        No modifica el marcador; solo consulta los (a lo sumo dos) días tocados.
+        """
+        dias = len(DIAS_SEMANA)
+        dia_origen, hora_origen = divmod(origen, HORAS_POR_DIA)
+        dia_destino, hora_destino = divmod(destino, HORAS_POR_DIA)
+        mascara_origen = self.mascaras[grupo_id * dias + dia_origen]
+        if dia_origen == dia_destino:
+            nueva = mascara_origen & ~(1 << hora_origen) | 1 << hora_destino
+            return PUNTAJE_DIA[nueva] - PUNTAJE_DIA[mascara_origen]
+        
+        mascara_destino = self.mascaras[grupo_id * dias + dia_destino]
+        return (PUNTAJE_DIA[mascara_origen & ~(1 << hora_origen)] - PUNTAJE_DIA[mascara_origen]
+                + PUNTAJE_DIA[mascara_destino | 1 << hora_destino] - PUNTAJE_DIA[mascara_destino])
+    
+    def mover(self, grupo_id: int, origen: int, destino: int) -> None:
+        """Pasa la hora del slot origen al destino (libre)."""
+        self.retirar(grupo_id, origen)
+        self.colocar(grupo_id, destino)
+
+
 def calcular_score_calidad(horario: Dict, grupo_nombre: str) -> int:
     """
     Calcula el score de calidad del horario para un grupo.
@@ -0,0 +1,188 @@
+"""
+Búsqueda en vecindarios grandes (LNS) sobre un horario completo.
+Destruye una parte del horario (un día, las clases de un profesor o los
+grupos de un cuatrimestre) y la vuelve a resolver con el motor de
+backtracking, quedándose con el resultado si mejora el score de calidad.
+"""
+
+import time
+import random
+from typing import List, Dict, Any, Optional, Tuple
+
+from ..core.modelos import Grupo, Materia, Profesor
+from ..core.grafo_conflictos import GrafoConflictos
+from ..core.config import DIAS_SEMANA
+from .estado_compacto import EstadoCompacto
+from .restricciones import CalidadIncremental
+from .arbol_decisiones import ArbolDecisiones
+from .backtracking import _inicializar_estado, _ejecutar_busqueda
+
+
+# Vecindarios que se pueden destruir
+VECINDARIOS = ('dia', 'profesor', 'cuatrimestre')
+
+
+def optimizar_lns(
+    horario: Dict,
+    grupos: List[Grupo],
+    materias: List[Materia],
+    profesores: List[Profesor],
+    grafo: Optional[GrafoConflictos] = None,
+    max_segundos: float = 10.0,
+    max_iteraciones: Optional[int] = None,
+    max_nodos: int = 2000,
+    vecindarios: Tuple[str, ...] = VECINDARIOS,
+    iterativo: bool = True,
+    semilla: Optional[int] = None,
+    cancelacion: Optional[Any] = None
+) -> Tuple[Dict, Dict[str, Any]]:
+    """
+    Mejora un horario completo destruyendo y reconstruyendo vecindarios.
+    
+    En cada iteración se sortea un vecindario y se quitan sus clases:
+    - 'dia': las de un día en todos los grupos
+    - 'profesor': las de un profesor
+    - 'cuatrimestre': las de los grupos de un cuatrimestre
+    El resto del horario queda fijo (ver _inicializar_estado) y el motor de
+    backtracking recoloca las horas quitadas con max_nodos decisiones,
+    probando primero los slots que más suben el score (orden_calidad) y
+    con desempates aleatorios, así que cada intento explora otra reconstrucción.
+    El resultado reemplaza al horario actual si su score total (suma de
+    calcular_score_calidad) es mayor.
+    
+    Args:
+        horario: Horario completo y válido (ej: el de resolver_backtracking)
+        grupos: Lista de grupos
+        materias: Lista de materias
+        profesores: Lista de profesores
+        grafo: Grafo de conflictos (desempate por grado de MRV)
+        max_segundos: Tiempo de optimización
+        max_iteraciones: Máximo de vecindarios a reconstruir (None = sin límite)
+        max_nodos: Decisiones permitidas a cada reconstrucción
+        vecindarios: Tipos de vecindario a sortear (subconjunto de VECINDARIOS)
+        iterativo: Si es True usa BuscadorIterativo (sin límite de recursión
+                   en vecindarios grandes), si no _backtrack_recursivo
+        semilla: Semilla para los sorteos (None = no reproducible)
+        cancelacion: Objeto con is_set() (ej: threading.Event) para detener la optimización
+    
+    Returns:
+        Tupla (horario, estadisticas): el mejor horario y 'puntaje_inicial',
+        'puntaje_final', 'iteraciones', 'mejoras', 'por_vecindario'
+        (intentos, reconstrucciones completas y mejoras de cada tipo) y 'tiempo_total'
+    
+    Raises:
+        ValueError: Si algún vecindario no es válido
+    """
+    invalidos = [v for v in vecindarios if v not in VECINDARIOS]
+    if invalidos or not vecindarios:
+        raise ValueError(f"Vecindarios inválidos: {invalidos}. Use algunos de {VECINDARIOS}")
+    
+    print("🚀 Iniciando búsqueda en vecindarios grandes (LNS)...")
+    print("=" * 70)
+    
+    tiempo_inicio = time.time()
+    limite_tiempo = tiempo_inicio + max_segundos
+    aleatorio = random.Random(semilla)
+    
+    compacto = EstadoCompacto(grupos, materias, profesores)
+    compacto.cargar_horario(horario)
+    actual = compacto.a_horario()
+    puntaje = puntaje_inicial = CalidadIncremental.desde_estado(compacto).total
+    
+    por_vecindario = {v: {'intentos': 0, 'resueltos': 0, 'mejoras': 0} for v in vecindarios}
+    iteraciones = 0
+    mejoras = 0
+    while max_iteraciones is None or iteraciones < max_iteraciones:
+        if time.time() >= limite_tiempo or (cancelacion is not None and cancelacion.is_set()):
+            break
+        iteraciones += 1
+        
+        tipo = aleatorio.choice(vecindarios)
+        fijas, destruidas = _destruir(actual, tipo, grupos, aleatorio)
+        if not destruidas:
+            continue
+        por_vecindario[tipo]['intentos'] += 1
+        
+        # Reconstruir con el resto del horario fijo
+        estado = _inicializar_estado(grupos, materias, profesores, grafo=grafo, fijas=fijas)
+        estado['max_nodos'] = max_nodos
+        estado['limite_tiempo'] = limite_tiempo
+        estado['cancelacion'] = cancelacion
+        estado['aleatorio'] = aleatorio
+        estado['orden_calidad'] = True
+        estado['cola'].barajar(aleatorio)
+        arbol = ArbolDecisiones()
+        arbol.agregar_nodo('raiz', {'descripcion': f"Vecindario '{tipo}' ({destruidas} clases)"})
+        resultado = _ejecutar_busqueda(estado, arbol, grafo, grupos, iterativo)
+        if resultado is None:
+            continue
+        por_vecindario[tipo]['resueltos'] += 1
+        
+        nuevo_puntaje = CalidadIncremental.desde_estado(estado['compacto']).total
+        if nuevo_puntaje > puntaje:
+            actual, puntaje = resultado, nuevo_puntaje
+            mejoras += 1
+            por_vecindario[tipo]['mejoras'] += 1
+    
+    tiempo_total = time.time() - tiempo_inicio
+    print(f"📈 Score de calidad: {puntaje_inicial} → {puntaje} "
+          f"({mejoras} mejoras en {iteraciones} vecindarios)")
+    print(f"⏱️  Tiempo total: {tiempo_total:.2f}s")
+    print("=" * 70)
+    
+    estadisticas = {
+        'puntaje_inicial': puntaje_inicial,
+        'puntaje_final': puntaje,
+        'iteraciones': iteraciones,
+        'mejoras': mejoras,
+        'por_vecindario': por_vecindario,
+        'tiempo_total': tiempo_total
+    }
+    return actual, estadisticas
+
+
+def _destruir(
+    horario: Dict,
+    tipo: str,
+    grupos: List[Grupo],
+    aleatorio: random.Random
+) -> Tuple[Dict, int]:
+    """
+    Copia el horario sin las clases de un vecindario sorteado del tipo dado.
+    
+    Returns:
+        (horario sin el vecindario, número de clases quitadas)
+    """
+    dia_destruido = profesor_destruido = None
+    grupos_destruidos = set()
+    if tipo == 'dia':
+        dia_destruido = aleatorio.choice(DIAS_SEMANA)
+    elif tipo == 'profesor':
+        nombres = sorted({
+            asignacion['profesor']
+            for dias in horario.values() for celdas in dias.values()
+            for asignacion in celdas.values() if asignacion is not None
+        })
+        if not nombres:
+            return horario, 0
+        profesor_destruido = aleatorio.choice(nombres)
+    else:
+        cuatrimestre = aleatorio.choice(sorted({g.cuatrimestre for g in grupos}))
+        grupos_destruidos = {g.nombre for g in grupos if g.cuatrimestre == cuatrimestre}
+    
+    destruidas = 0
+    restante = {}
+    for grupo, dias in horario.items():
+        restante[grupo] = {}
+        for dia, celdas in dias.items():
+            restante[grupo][dia] = {}
+            for slot_key, asignacion in celdas.items():
+                if asignacion is not None and (
+                    dia == dia_destruido
+                    or asignacion['profesor'] == profesor_destruido
+                    or grupo in grupos_destruidos
+                ):
+                    asignacion = None
+                    destruidas += 1
+                restante[grupo][dia][slot_key] = asignacion
+    return restante, destruidas
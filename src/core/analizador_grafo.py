@@ -3,32 +3,138 @@ Analizador de Grafo de Conflictos.
 Implementa algoritmos para analizar el grafo y estimar la factibilidad del problema.
 """
 
-from typing import List, Tuple, Set
-from .grafo_conflictos import GrafoConflictos, NodoAsignacion
+import heapq
+import random
+import time
+from typing import List, Tuple, Set, Dict, Optional, Iterator
+from .modelos import Materia
+from .grafo_conflictos import (GrafoConflictos, GrafoCompacto, GrafoBitset, NodoAsignacion,
+                               ids_en_mascara)
 
 
-def calcular_numero_cromatico_aproximado(grafo: GrafoConflictos) -> int:
+# Representaciones del grafo que pueden usar los algoritmos:
+# - 'conjuntos': GrafoConflictos (un set de vecinos por nodo)
+# - 'csr': GrafoCompacto (ids enteros y arreglos CSR)
+# - 'bitset': GrafoBitset (una fila de bits por nodo, vecindarios con AND)
+BACKENDS = ('conjuntos', 'csr', 'bitset')
+
+
+def preparar_grafo(grafo: GrafoConflictos, backend: Optional[str] = None) -> GrafoConflictos:
+    """
+    Convierte el grafo a la representación que usará un algoritmo.
+    
+    Args:
+        grafo: GrafoConflictos, GrafoCompacto o GrafoBitset
+        backend: Uno de BACKENDS, o None para usar el grafo tal como viene
+    
+    Returns:
+        El grafo en esa representación (el mismo objeto si ya lo está)
+    
+    Raises:
+        ValueError: Si el backend no es válido
+    """
+    if backend is None:
+        return grafo
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inválido: {backend}. Debe ser uno de {BACKENDS}")
+    
+    if backend == 'bitset':
+        return grafo if isinstance(grafo, GrafoBitset) else GrafoBitset.desde_grafo(grafo)
+    if backend == 'csr':
+        return grafo if isinstance(grafo, GrafoCompacto) else GrafoCompacto.desde_grafo(grafo)
+    if isinstance(grafo, GrafoConflictos):
+        return grafo
+    conjuntos = GrafoConflictos()
+    conjuntos.profesores_por_materia = grafo.profesores_por_materia
+    for nodo in grafo.lista_nodos:
+        conjuntos.agregar_nodo(nodo)
+        conjuntos.aristas[nodo] = grafo.obtener_vecinos(nodo)
+    return conjuntos
+
+
+def orden_welsh_powell(grafo: GrafoConflictos, backend: Optional[str] = None) -> List[NodoAsignacion]:
+    """
+    Ordena los nodos por grado descendente (orden de Welsh-Powell).
+    
+    Los nodos más conflictivos se colorean (o colocan) primero, cuando aún
+    quedan más colores (slots) libres.
+    """
+    grafo = preparar_grafo(grafo, backend)
+    return sorted(grafo.nodos, key=lambda n: grafo.obtener_grado(n), reverse=True)
+
+
+# Algoritmos de coloreo de calcular_numero_cromatico_aproximado
+METODOS_COLOREO = ('welsh_powell', 'dsatur', 'greedy_iterado')
+
+
+def calcular_numero_cromatico_aproximado(grafo: GrafoConflictos, backend: Optional[str] = None,
+                                         metodo: str = 'welsh_powell') -> int:
     """
     Calcula una aproximación del número cromático del grafo.
     
     El número cromático es el mínimo número de colores (slots de tiempo)
     necesarios para colorear el grafo sin que nodos adyacentes compartan color.
-    
-    Usa el algoritmo greedy de coloreo (Welsh-Powell).
+    Cualquier coloreo da una cota superior.
     
     Args:
         grafo: Grafo de conflictos
+        backend: Representación a usar (ver BACKENDS; None = la del grafo).
+                 Con 'bitset' cada color es un bitset de nodos y un color
+                 está libre si su AND con la fila del nodo es 0
+        metodo: 'welsh_powell' (colorear_welsh_powell), 'dsatur'
+                (colorear_dsatur) o 'greedy_iterado' (colorear_greedy_iterado,
+                que nunca usa más colores que DSATUR). Los dos últimos
+                trabajan siempre sobre GrafoBitset
     
     Returns:
         Número aproximado de colores necesarios
+    
+    Raises:
+        ValueError: Si el método no es válido
+    """
+    if metodo not in METODOS_COLOREO:
+        raise ValueError(f"Método inválido: {metodo}. Debe ser uno de {METODOS_COLOREO}")
+    if metodo == 'dsatur':
+        return _num_colores(colorear_dsatur(grafo))
+    if metodo == 'greedy_iterado':
+        return _num_colores(colorear_greedy_iterado(grafo))
+    return _num_colores(colorear_welsh_powell(grafo, backend))
+
+
+def colorear_welsh_powell(grafo: GrafoConflictos,
+                          backend: Optional[str] = None) -> Dict[NodoAsignacion, List[int]]:
     """
-    if len(grafo.nodos) == 0:
-        return 0
+    Colorea el grafo con un greedy en orden de Welsh-Powell.
+    
+    Cada nodo, del de mayor grado al de menor, toma el primer color que no
+    usa ninguno de sus vecinos ya coloreados.
+    
+    Args:
+        grafo: Grafo de conflictos
+        backend: Representación a usar (ver calcular_numero_cromatico_aproximado)
+    
+    Returns:
+        Diccionario {nodo: [color]}
+    """
+    grafo = preparar_grafo(grafo, backend)
     
     # Ordenar nodos por grado descendente (Welsh-Powell)
-    nodos_ordenados = sorted(grafo.nodos, 
-                            key=lambda n: grafo.obtener_grado(n), 
-                            reverse=True)
+    nodos_ordenados = orden_welsh_powell(grafo)
+    
+    if isinstance(grafo, GrafoBitset):
+        clases: List[int] = []
+        coloreo: Dict[NodoAsignacion, List[int]] = {}
+        for nodo in nodos_ordenados:
+            i = grafo.id_nodo[nodo]
+            fila = grafo.filas[i]
+            color = 0
+            while color < len(clases) and clases[color] & fila:
+                color += 1
+            if color == len(clases):
+                clases.append(0)
+            clases[color] |= 1 << i
+            coloreo[nodo] = [color]
+        return coloreo
     
     # Asignar colores
     colores: dict[NodoAsignacion, int] = {}
@@ -45,94 +151,521 @@ def calcular_numero_cromatico_aproximado(grafo: GrafoConflictos) -> int:
         
         colores[nodo] = color
     
-    # El número cromático es el máximo color usado + 1
-    return max(colores.values()) + 1 if colores else 0
+    return {nodo: [color] for nodo, color in colores.items()}
+
+
+def colorear_dsatur(grafo: GrafoConflictos,
+                    horas: Optional[Dict[str, int]] = None) -> Dict[NodoAsignacion, List[int]]:
+    """
+    Colorea el grafo con DSATUR.
+    
+    En cada paso se colorea el nodo con más colores distintos entre sus
+    vecinos (saturación), desempatando por grado; así los nodos más
+    restringidos eligen antes. Con horas, cada nodo recibe tantos colores
+    distintos como horas tiene su materia (un color = un slot), ninguno
+    compartido con sus vecinos.
+    
+    Args:
+        grafo: Grafo de conflictos
+        horas: Horas por materia (ver horas_por_materia; None = un color por nodo)
+    
+    Returns:
+        Diccionario {nodo: colores asignados, de menor a mayor}
+    """
+    bits = preparar_grafo(grafo, 'bitset')
+    horas_id = _horas_por_id(bits, horas)
+    return _colores_por_nodo(bits, _dsatur(bits, horas_id))
+
+
+def colorear_greedy_iterado(grafo: GrafoConflictos, horas: Optional[Dict[str, int]] = None,
+                            iteraciones: int = 100, max_segundos: Optional[float] = None,
+                            semilla: Optional[int] = None) -> Dict[NodoAsignacion, List[int]]:
+    """
+    Mejora el coloreo de DSATUR con greedy iterado (Culberson).
+    
+    En cada iteración se vuelve a colorear con un greedy que recorre los
+    nodos agrupados por color (las clases en orden inverso, de la más grande
+    a la más chica o al azar, alternando). Al mantener juntas las clases, el
+    nuevo coloreo no usa más colores que el anterior y a menudo usa menos;
+    con horas (multicoloreo) eso no está garantizado, así que se conserva el
+    mejor coloreo visto.
+    
+    Args:
+        grafo: Grafo de conflictos
+        horas: Horas por materia (ver horas_por_materia; None = un color por nodo)
+        iteraciones: Máximo de recoloreos
+        max_segundos: Tiempo máximo (None = sin límite)
+        semilla: Semilla para el orden aleatorio de clases (None = no reproducible)
+    
+    Returns:
+        Diccionario {nodo: colores asignados, de menor a mayor}
+    """
+    bits = preparar_grafo(grafo, 'bitset')
+    horas_id = _horas_por_id(bits, horas)
+    limite = time.time() + max_segundos if max_segundos is not None else None
+    aleatorio = random.Random(semilla)
+    
+    actual = mejor = _dsatur(bits, horas_id)
+    for iteracion in range(iteraciones):
+        if limite is not None and time.time() >= limite:
+            break
+        
+        # Clases por el menor color de cada nodo (los nodos sin horas quedan al final)
+        clases: Dict[int, List[int]] = {}
+        for i, colores in enumerate(actual):
+            clases.setdefault((colores & -colores).bit_length() - 1 if colores else len(actual), []).append(i)
+        orden_clases = [clases[color] for color in sorted(clases)]
+        estrategia = iteracion % 3
+        if estrategia == 0:
+            orden_clases.reverse()
+        elif estrategia == 1:
+            orden_clases.sort(key=len, reverse=True)
+        else:
+            aleatorio.shuffle(orden_clases)
+        
+        nuevo = _greedy(bits, horas_id, [i for clase in orden_clases for i in clase])
+        if _bits_usados(nuevo) <= _bits_usados(mejor):
+            actual = mejor = nuevo
+        else:
+            actual = mejor
+    return _colores_por_nodo(bits, mejor)
+
+
+def horas_por_materia(materias: List[Materia]) -> Dict[str, int]:
+    """Horas semanales de cada materia, por nombre (el peso de sus nodos)."""
+    return {materia.nombre: materia.horas_semana for materia in materias}
+
+
+def turnos_por_grupo(materias: List[Materia]) -> Dict[str, str]:
+    """Turno de cada grupo que cursa alguna materia, por nombre del grupo."""
+    return {grupo.nombre: grupo.turno for materia in materias for grupo in materia.grupos_que_cursan}
+
+
+def _horas_por_id(grafo: GrafoBitset, horas: Optional[Dict[str, int]]) -> List[int]:
+    """Colores que necesita cada nodo del grafo, en orden de id."""
+    if horas is None:
+        return [1] * len(grafo.lista_nodos)
+    return [horas.get(nodo.materia_nombre, 1) for nodo in grafo.lista_nodos]
+
+
+def _colores_libres(prohibidos: int, cantidad: int) -> int:
+    """Bitset con los cantidad colores más bajos que no están en prohibidos."""
+    elegidos = 0
+    libres = ~prohibidos
+    for _ in range(cantidad):
+        bit = libres & -libres
+        elegidos |= bit
+        libres ^= bit
+    return elegidos
+
+
+def _dsatur(grafo: GrafoBitset, horas: List[int]) -> List[int]:
+    """
+    DSATUR sobre bitsets.
+    
+    prohibidos[i] es el bitset de colores de los vecinos ya coloreados de i;
+    su popcount es la saturación. El nodo a colorear sale de un heap con
+    entradas perezosas (las que no coinciden con la saturación actual se
+    descartan al salir).
+    
+    Returns:
+        Bitset de colores de cada nodo, en orden de id
+    """
+    n = len(grafo.lista_nodos)
+    colores = [0] * n
+    prohibidos = [0] * n
+    sin_color = (1 << n) - 1
+    heap = [(0, -grafo.grados[i], i) for i in range(n)]
+    heapq.heapify(heap)
+    while heap:
+        saturacion, grado, i = heapq.heappop(heap)
+        if not sin_color >> i & 1 or -saturacion != bin(prohibidos[i]).count("1"):
+            continue
+        sin_color &= ~(1 << i)
+        colores[i] = _colores_libres(prohibidos[i], horas[i])
+        for j in ids_en_mascara(grafo.filas[i] & sin_color):
+            nuevos = prohibidos[j] | colores[i]
+            if nuevos != prohibidos[j]:
+                prohibidos[j] = nuevos
+                heapq.heappush(heap, (-bin(nuevos).count("1"), -grafo.grados[j], j))
+    return colores
+
+
+def _greedy(grafo: GrafoBitset, horas: List[int], orden: List[int]) -> List[int]:
+    """
+    Coloreo greedy en el orden dado: cada nodo toma sus colores más bajos libres.
+    
+    clases[c] es el bitset de nodos con el color c, así que c está libre
+    para el nodo i si clases[c] & filas[i] es 0.
+    
+    Returns:
+        Bitset de colores de cada nodo, en orden de id
+    """
+    colores = [0] * len(grafo.lista_nodos)
+    clases: List[int] = []
+    for i in orden:
+        fila = grafo.filas[i]
+        color = 0
+        for _ in range(horas[i]):
+            while color < len(clases) and clases[color] & fila:
+                color += 1
+            if color == len(clases):
+                clases.append(0)
+            clases[color] |= 1 << i
+            colores[i] |= 1 << color
+            color += 1
+    return colores
+
+
+def _bits_usados(colores: List[int]) -> int:
+    """Número de colores de un coloreo (el mayor color usado + 1)."""
+    usados = 0
+    for mascara in colores:
+        usados |= mascara
+    return usados.bit_length()
+
+
+def _colores_por_nodo(grafo: GrafoBitset, colores: List[int]) -> Dict[NodoAsignacion, List[int]]:
+    """Pasa un coloreo por id (bitsets) a {nodo: lista de colores}."""
+    return {grafo.lista_nodos[i]: ids_en_mascara(mascara) for i, mascara in enumerate(colores)}
+
+
+def _num_colores(coloreo: Dict[NodoAsignacion, List[int]]) -> int:
+    """Número de colores de un coloreo (el mayor color usado + 1)."""
+    return max((max(colores) + 1 for colores in coloreo.values() if colores), default=0)
 
 
-def encontrar_cliques(grafo: GrafoConflictos, max_cliques: int = 10) -> List[Set[NodoAsignacion]]:
+def encontrar_cliques(grafo: GrafoConflictos, max_cliques: int = 10,
+                      max_segundos: Optional[float] = 5.0) -> List[Set[NodoAsignacion]]:
     """
     Encuentra cliques (conjuntos de nodos mutuamente conectados) en el grafo.
     
     Un clique representa un conjunto de asignaciones que todas tienen conflicto
-    entre sí, por lo que necesitan slots diferentes.
+    entre sí, por lo que necesitan slots diferentes. Se recorren las cliques
+    maximales de iterar_cliques_maximales y se conservan las max_cliques más
+    grandes (con un heap). max_cliques solo limita el resultado: el trabajo
+    lo limita max_segundos, y al agotarse son las más grandes de las
+    enumeradas hasta entonces.
     
     Args:
         grafo: Grafo de conflictos
         max_cliques: Número máximo de cliques a retornar
+        max_segundos: Tiempo máximo de búsqueda (None = enumerar todas las
+                      cliques maximales, exponencial en el peor caso)
     
     Returns:
-        Lista de cliques encontrados
+        Lista de cliques maximales encontrados, de la más grande a la más chica
     """
-    cliques = []
+    return heapq.nlargest(max_cliques, iterar_cliques_maximales(grafo, max_segundos), key=len)
+
+
+def iterar_cliques_maximales(grafo: GrafoConflictos,
+                             max_segundos: Optional[float] = None) -> Iterator[Set[NodoAsignacion]]:
+    """
+    Genera las cliques maximales del grafo (Bron–Kerbosch con pivote).
     
-    # Algoritmo simple: buscar triángulos (cliques de tamaño 3)
-    lista_nodos = list(grafo.nodos)
+    Los vértices se recorren en orden de degeneración: cada uno abre una
+    búsqueda con sus vecinos posteriores como candidatos y los anteriores
+    como excluidos, así que ninguna búsqueda tiene más de d candidatos (d =
+    degeneración del grafo). Dentro, el pivote es el vértice de P ∪ X con
+    más vecinos en P. Trabaja sobre GrafoBitset (se convierte si hace falta).
     
-    for i in range(len(lista_nodos)):
-        for j in range(i + 1, len(lista_nodos)):
-            for k in range(j + 1, len(lista_nodos)):
-                nodo1, nodo2, nodo3 = lista_nodos[i], lista_nodos[j], lista_nodos[k]
-                
-                # Verificar si forman un triángulo
-                if (nodo2 in grafo.obtener_vecinos(nodo1) and
-                    nodo3 in grafo.obtener_vecinos(nodo1) and
-                    nodo3 in grafo.obtener_vecinos(nodo2)):
-                    
-                    cliques.append({nodo1, nodo2, nodo3})
-                    
-                    if len(cliques) >= max_cliques:
-                        return cliques
+    Args:
+        grafo: Grafo de conflictos
+        max_segundos: Tiempo máximo de búsqueda; al agotarse la iteración
+                      termina (None = sin límite)
+    
+    Yields:
+        Conjuntos de nodos, uno por clique maximal
+    """
+    bits = preparar_grafo(grafo, 'bitset')
+    busqueda = _nueva_busqueda(max_segundos)
+    for clique in _bron_kerbosch_degeneracion(bits, busqueda):
+        yield set(bits.nodos_de(clique))
+
+
+def encontrar_clique_maxima(grafo: GrafoConflictos,
+                            max_segundos: Optional[float] = None) -> Tuple[Set[NodoAsignacion], bool]:
+    """
+    Busca la clique más grande del grafo.
+    
+    Es el mismo Bron–Kerbosch que iterar_cliques_maximales, pero poda las
+    ramas que no pueden superar a la mejor clique encontrada. Solo es una
+    cota inferior de los slots necesarios si todas las aristas del grafo
+    son conflictos seguros; en el grafo completo hay aristas por un profesor
+    posible, así que la cota es la 'clique' de calcular_cotas_inferiores,
+    que la busca en el grafo de conflictos seguros.
+    
+    Args:
+        grafo: Grafo de conflictos
+        max_segundos: Tiempo máximo de búsqueda (None = sin límite)
     
-    return cliques
+    Returns:
+        Tupla (clique, es_maxima): es_maxima es False si se agotó el tiempo
+        antes de probar que no hay una clique más grande
+    """
+    bits = preparar_grafo(grafo, 'bitset')
+    busqueda = _nueva_busqueda(max_segundos)
+    busqueda['mejor'] = 0
+    mejor = 0
+    for clique in _bron_kerbosch_degeneracion(bits, busqueda):
+        # Con la poda, cada clique generada es más grande que la anterior
+        mejor = clique
+    return set(bits.nodos_de(mejor)), not busqueda['cortada']
 
 
-def verificar_factibilidad(grafo: GrafoConflictos, num_slots_disponibles: int) -> Tuple[bool, str]:
+def _nueva_busqueda(max_segundos: Optional[float]) -> Dict:
+    """
+    Estado compartido de una búsqueda de cliques.
+    
+    'limite' es el instante de corte (o None), 'cortada' indica si se alcanzó
+    y 'mejor' (solo al buscar la clique máxima) el tamaño de la mejor clique.
+    """
+    return {
+        'limite': time.time() + max_segundos if max_segundos is not None else None,
+        'cortada': False,
+        'mejor': None
+    }
+
+
+def orden_degeneracion(grafo: GrafoBitset) -> List[int]:
+    """
+    Ids de los nodos en orden de degeneración.
+    
+    Se quita repetidamente el nodo de menor grado en el grafo restante
+    (con un heap y entradas perezosas), así que cada nodo tiene a lo sumo
+    d vecinos posteriores, con d la degeneración del grafo.
+    """
+    grados = list(grafo.grados)
+    heap = [(grado, i) for i, grado in enumerate(grados)]
+    heapq.heapify(heap)
+    restantes = (1 << len(grados)) - 1
+    orden = []
+    while heap:
+        grado, i = heapq.heappop(heap)
+        if not restantes >> i & 1 or grado != grados[i]:
+            continue
+        restantes &= ~(1 << i)
+        orden.append(i)
+        for j in ids_en_mascara(grafo.filas[i] & restantes):
+            grados[j] -= 1
+            heapq.heappush(heap, (grados[j], j))
+    return orden
+
+
+def _bron_kerbosch_degeneracion(grafo: GrafoBitset, busqueda: Dict) -> Iterator[int]:
+    """Recorre los vértices en orden de degeneración y genera las cliques (bitsets) de cada uno."""
+    posteriores = (1 << len(grafo.lista_nodos)) - 1
+    anteriores = 0
+    for i in orden_degeneracion(grafo):
+        if _tiempo_agotado(busqueda):
+            return
+        bit = 1 << i
+        posteriores &= ~bit
+        fila = grafo.filas[i]
+        yield from _bron_kerbosch(grafo, bit, 1, fila & posteriores, fila & anteriores, busqueda)
+        anteriores |= bit
+
+
+def _bron_kerbosch(grafo: GrafoBitset, r: int, tamano_r: int, p: int, x: int,
+                   busqueda: Dict) -> Iterator[int]:
+    """
+    Bron–Kerbosch con pivote sobre bitsets.
+    
+    Args:
+        grafo: Grafo en bitsets
+        r: Clique en construcción
+        tamano_r: Número de nodos de r
+        p: Candidatos (vecinos de todo r aún no probados)
+        x: Excluidos (vecinos de todo r ya probados)
+        busqueda: Estado de _nueva_busqueda
+    
+    Yields:
+        Bitsets de las cliques maximales que extienden r
+    """
+    filas = grafo.filas
+    if busqueda['mejor'] is not None and tamano_r + bin(p).count("1") <= busqueda['mejor']:
+        return
+    if not p:
+        if not x:
+            if busqueda['mejor'] is not None:
+                busqueda['mejor'] = tamano_r
+            yield r
+        return
+    
+    # Pivote: el vértice de P ∪ X que cubre más candidatos; sus vecinos no se ramifican
+    pivote = max(ids_en_mascara(p | x), key=lambda u: bin(p & filas[u]).count("1"))
+    for v in ids_en_mascara(p & ~filas[pivote]):
+        if _tiempo_agotado(busqueda):
+            return
+        bit = 1 << v
+        yield from _bron_kerbosch(grafo, r | bit, tamano_r + 1, p & filas[v], x & filas[v], busqueda)
+        p &= ~bit
+        x |= bit
+
+
+def _tiempo_agotado(busqueda: Dict) -> bool:
+    """Marca la búsqueda como cortada si pasó su límite de tiempo."""
+    if busqueda['limite'] is not None and time.time() >= busqueda['limite']:
+        busqueda['cortada'] = True
+    return busqueda['cortada']
+
+
+def verificar_factibilidad(grafo: GrafoConflictos, num_slots_disponibles: int,
+                           materias: Optional[List[Materia]] = None,
+                           max_segundos: float = 5.0) -> Tuple[Optional[bool], str, Tuple[int, int]]:
     """
     Verifica si es factible asignar horarios con los slots disponibles.
     
+    Acota los slots necesarios entre una cota inferior (calcular_cotas_inferiores)
+    y una superior (el coloreo de colorear_dsatur o, si con ella no se decide,
+    el de colorear_greedy_iterado). Con materias,
+    cada nodo pesa sus horas_semana y las cotas inferiores se calculan por
+    turno; sin ellas, un slot por nodo.
+    - cota inferior > slots: no factible, con certeza
+    - cota superior <= slots: factible para el grafo (hay un coloreo que separa
+      todos los conflictos; quedan fuera la disponibilidad y la carga de los profesores)
+    - entre ambas: no se puede decidir sin resolver
+    
     Args:
         grafo: Grafo de conflictos
-        num_slots_disponibles: Número de slots disponibles (ej: 35 para un turno)
+        num_slots_disponibles: Número de slots disponibles en cada turno (ej: 35)
+        materias: Lista de materias (para pesar cada nodo por sus horas y
+                  conocer el turno de sus grupos)
+        max_segundos: Tiempo máximo de la búsqueda de la clique y del greedy iterado
     
     Returns:
-        Tupla (es_factible, razon)
+        Tupla (es_factible, razon, (cota_inferior, cota_superior)); es_factible
+        es None si las cotas no deciden
     """
-    # Calcular número cromático aproximado
-    num_cromatico = calcular_numero_cromatico_aproximado(grafo)
+    horas = horas_por_materia(materias) if materias is not None else None
+    turnos = turnos_por_grupo(materias) if materias is not None else None
+    cotas = calcular_cotas_inferiores(grafo, horas, max_segundos / 2, turnos)
+    inferior = max(cotas.values())
+    # DSATUR basta si ya decide; el greedy iterado solo cuando las cotas no deciden
+    superior = _num_colores(colorear_dsatur(grafo, horas))
+    if inferior <= num_slots_disponibles < superior:
+        superior = _num_colores(colorear_greedy_iterado(grafo, horas, max_segundos=max_segundos / 2, semilla=0))
+    intervalo = (inferior, superior)
     
-    if num_cromatico <= num_slots_disponibles:
-        return True, f"Factible: se necesitan ~{num_cromatico} slots y hay {num_slots_disponibles} disponibles"
-    else:
-        deficit = num_cromatico - num_slots_disponibles
-        return False, f"No factible: se necesitan ~{num_cromatico} slots pero solo hay {num_slots_disponibles} (déficit: {deficit})"
+    if inferior > num_slots_disponibles:
+        motivo = max(cotas, key=cotas.get)
+        deficit = inferior - num_slots_disponibles
+        return False, (f"No factible: se necesitan al menos {inferior} slots ({motivo}) pero solo hay "
+                       f"{num_slots_disponibles} (déficit: {deficit}); intervalo [{inferior}, {superior}]"), intervalo
+    if superior <= num_slots_disponibles:
+        return True, (f"Factible: se necesitan entre {inferior} y {superior} slots y hay "
+                      f"{num_slots_disponibles} disponibles"), intervalo
+    return None, (f"Indeterminado: se necesitan entre {inferior} y {superior} slots y hay "
+                  f"{num_slots_disponibles} disponibles"), intervalo
 
 
-def analizar_conflictos_por_tipo(grafo: GrafoConflictos) -> dict:
+def calcular_cotas_inferiores(grafo: GrafoConflictos, horas: Optional[Dict[str, int]] = None,
+                              max_segundos: Optional[float] = None,
+                              turnos: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+    """
+    Cotas inferiores del número de slots necesarios en un turno.
+    
+    Solo usan conflictos seguros: mismo grupo, o materias que solo puede
+    impartir un mismo profesor en grupos del mismo turno. Las aristas por
+    profesor posible del grafo no sirven aquí (si hay otro profesor, esas
+    clases pueden coincidir), y tampoco las de un profesor entre turnos
+    distintos, que nunca comparten slot.
+    - 'clique': horas de la clique más grande de conflictos seguros
+    - 'horas_grupo': máximo de horas de un grupo
+    - 'horas_profesor': máximo de horas de las materias que solo puede dar un
+      profesor, en un mismo turno
+    
+    Args:
+        grafo: Grafo de conflictos
+        horas: Horas por materia (ver horas_por_materia; None = un slot por nodo)
+        max_segundos: Tiempo máximo de la búsqueda de la clique (None = sin límite)
+        turnos: Turno de cada grupo (ver turnos_por_grupo). Sin él no se sabe
+                qué grupos comparten turno y solo cuentan los conflictos de
+                un mismo grupo
+    
+    Returns:
+        Diccionario {nombre de la cota: slots}
+    """
+    bits = preparar_grafo(grafo, 'bitset')
+    horas_id = _horas_por_id(bits, horas)
+    
+    por_grupo: Dict[str, int] = {}
+    # (profesor, turno) -> nodos de las materias que solo puede dar ese profesor
+    por_profesor: Dict[Tuple[str, str], int] = {}
+    clave_profesor: List[Optional[Tuple[str, str]]] = []
+    for i, nodo in enumerate(bits.lista_nodos):
+        por_grupo[nodo.grupo_nombre] = por_grupo.get(nodo.grupo_nombre, 0) | (1 << i)
+        profesores = set(bits.profesores_por_materia.get(nodo.materia_nombre, []))
+        clave = None
+        if len(profesores) == 1:
+            # Sin turnos conocidos, cada grupo es su propio turno
+            turno = turnos.get(nodo.grupo_nombre) if turnos is not None else None
+            clave = (profesores.pop(), turno if turno is not None else nodo.grupo_nombre)
+            por_profesor[clave] = por_profesor.get(clave, 0) | (1 << i)
+        clave_profesor.append(clave)
+    
+    def peso(mascara: int) -> int:
+        return sum(horas_id[i] for i in ids_en_mascara(mascara))
+    
+    seguros = []
+    for i, (nodo, fila) in enumerate(zip(bits.lista_nodos, bits.filas)):
+        mascara = por_grupo[nodo.grupo_nombre]
+        if clave_profesor[i] is not None:
+            mascara |= por_profesor[clave_profesor[i]]
+        seguros.append(fila & mascara & ~(1 << i))
+    clique, _ = encontrar_clique_maxima(GrafoBitset(bits.lista_nodos, seguros, bits.profesores_por_materia),
+                                        max_segundos)
+    
+    return {
+        'clique': sum(horas_id[bits.id_nodo[nodo]] for nodo in clique),
+        'horas_grupo': max(map(peso, por_grupo.values()), default=0),
+        'horas_profesor': max(map(peso, por_profesor.values()), default=0)
+    }
+
+
+def analizar_conflictos_por_tipo(grafo: GrafoConflictos, backend: Optional[str] = None) -> dict:
     """
     Analiza los conflictos del grafo clasificándolos por tipo.
     
+    Args:
+        grafo: Grafo de conflictos
+        backend: Representación a usar (ver BACKENDS; None = la del grafo).
+                 Con 'bitset' los conflictos de grupo de cada nodo son los
+                 bits de su fila AND el bitset de su grupo
+    
     Returns:
         Diccionario con estadísticas de conflictos por tipo
     """
+    grafo = preparar_grafo(grafo, backend)
     conflictos_grupo = 0
     conflictos_profesor = 0
     
-    # Contar aristas ya procesadas para evitar duplicados
-    aristas_procesadas = set()
-    
-    for nodo1 in grafo.nodos:
-        for nodo2 in grafo.obtener_vecinos(nodo1):
-            # Evitar contar la misma arista dos veces
-            arista = tuple(sorted([str(nodo1), str(nodo2)]))
-            if arista in aristas_procesadas:
-                continue
-            aristas_procesadas.add(arista)
-            
-            # Clasificar el tipo de conflicto
-            if nodo1.grupo_nombre == nodo2.grupo_nombre:
-                conflictos_grupo += 1
-            else:
-                conflictos_profesor += 1
+    if isinstance(grafo, GrafoBitset):
+        por_grupo: Dict[str, int] = {}
+        for i, nodo in enumerate(grafo.lista_nodos):
+            por_grupo[nodo.grupo_nombre] = por_grupo.get(nodo.grupo_nombre, 0) | (1 << i)
+        extremos_grupo = sum(bin(fila & por_grupo[nodo.grupo_nombre]).count("1")
+                             for nodo, fila in zip(grafo.lista_nodos, grafo.filas))
+        conflictos_grupo = extremos_grupo // 2
+        conflictos_profesor = sum(grafo.grados) // 2 - conflictos_grupo
+    else:
+        # Contar aristas ya procesadas para evitar duplicados
+        aristas_procesadas = set()
+        
+        for nodo1 in grafo.nodos:
+            for nodo2 in grafo.obtener_vecinos(nodo1):
+                # Evitar contar la misma arista dos veces
+                arista = tuple(sorted([str(nodo1), str(nodo2)]))
+                if arista in aristas_procesadas:
+                    continue
+                aristas_procesadas.add(arista)
+                
+                # Clasificar el tipo de conflicto
+                if nodo1.grupo_nombre == nodo2.grupo_nombre:
+                    conflictos_grupo += 1
+                else:
+                    conflictos_profesor += 1
     
     total = conflictos_grupo + conflictos_profesor
     
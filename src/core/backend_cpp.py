@@ -37,8 +37,9 @@ class BackendCppIntegration:
             )
     
     def convertir_a_json(self, grupos: List[Grupo], materias: List[Materia],
-                        profesores: List[Profesor]) -> Dict:
-        """Convierte los datos Python a formato JSON para el backend."""
+                        profesores: List[Profesor], horario_previo: Optional[Dict] = None,
+                        minimizar_cambios: bool = False) -> Dict:
+        """Convierte los datos Python (y el horario previo, si hay) a formato JSON para el backend."""
         data = {
             "grupos": [],
             "materias": [],
@@ -72,10 +73,15 @@ class BackendCppIntegration:
             
             data["profesores"].append(prof_data)
         
+        if horario_previo is not None:
+            data["horario_previo"] = horario_previo
+            data["minimizar_cambios"] = minimizar_cambios
+        
         return data
     
     def ejecutar_backend(self, grupos: List[Grupo], materias: List[Materia],
-                        profesores: List[Profesor]) -> Tuple[Optional[Dict], Dict[str, Any]]:
+                        profesores: List[Profesor], horario_previo: Optional[Dict] = None,
+                        minimizar_cambios: bool = False) -> Tuple[Optional[Dict], Dict[str, Any]]:
         """
         Ejecuta el backend C++ y retorna los resultados.
         
@@ -83,17 +89,25 @@ class BackendCppIntegration:
             grupos: Lista de grupos
             materias: Lista de materias
             profesores: Lista de profesores
+            horario_previo: Horario anterior usado como pista: el backend prueba
+                            primero el slot y profesor previos de cada materia
+            minimizar_cambios: Si es True, el backend fija primero las clases
+                               previas aún válidas y solo si no completa el
+                               horario resuelve desde cero
         
         Returns:
             Tupla (horario, estadisticas)
             - horario: Diccionario con el horario generado o None si falló
-            - estadisticas: Métricas del algoritmo
+            - estadisticas: Métricas del algoritmo; con horario_previo incluyen
+              'clases_previas', 'clases_fijas' y 'clases_conservadas'
         """
         with tempfile.TemporaryDirectory() as tmpdir:
             input_file = Path(tmpdir) / "input.json"
             output_file = Path(tmpdir) / "output.json"
             
-            input_data = self.convertir_a_json(grupos, materias, profesores)
+            input_data = self.convertir_a_json(
+                grupos, materias, profesores, horario_previo, minimizar_cambios
+            )
             
             with open(input_file, 'w') as f:
                 json.dump(input_data, f, indent=2)
@@ -121,7 +135,7 @@ class BackendCppIntegration:
                 estadisticas = output_data.get("estadisticas", {})
                 
                 return horario, estadisticas
-                
+            
             except subprocess.TimeoutExpired:
                 raise TimeoutError("El backend C++ excedió el tiempo límite de 5 minutos")
             except FileNotFoundError:
@@ -131,7 +145,8 @@ class BackendCppIntegration:
 
 
 def resolver_con_backend_cpp(grupos: List[Grupo], materias: List[Materia],
-                             profesores: List[Profesor]) -> Tuple[Optional[Dict], Dict[str, Any]]:
+                             profesores: List[Profesor], horario_previo: Optional[Dict] = None,
+                             minimizar_cambios: bool = False) -> Tuple[Optional[Dict], Dict[str, Any]]:
     """
     Función auxiliar para resolver horarios usando el backend C++.
     
@@ -139,9 +154,11 @@ def resolver_con_backend_cpp(grupos: List[Grupo], materias: List[Materia],
         grupos: Lista de grupos
         materias: Lista de materias
         profesores: Lista de profesores
+        horario_previo: Horario anterior usado como pista (ver ejecutar_backend)
+        minimizar_cambios: Si se conservan primero las clases previas válidas
     
     Returns:
         Tupla (horario, estadisticas)
     """
     backend = BackendCppIntegration()
-    return backend.ejecutar_backend(grupos, materias, profesores)
+    return backend.ejecutar_backend(grupos, materias, profesores, horario_previo, minimizar_cambios)
@@ -3,8 +3,8 @@ Configuración del Sistema de Gestión de Horarios Académicos.
 Define constantes y funciones para generar slots de tiempo.
 """
 
-from typing import List
-from .modelos import Slot
+from typing import List, Dict, Tuple
+from .modelos import Slot, Profesor
 
 # Días de la semana laborales
 DIAS_SEMANA = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes"]
@@ -44,9 +44,52 @@ SLOTS_VESPERTINO = [
 ]
 
 
+def _generar_tabla_slots() -> Dict[str, Tuple[Slot, ...]]:
+    """
+    Crea una sola vez los slots de cada turno, con sus índices.
+    
+    Returns:
+        Diccionario {turno: tupla de 35 Slot en orden día * 7 + hora}
+    """
+    tabla = {}
+    indice = 0
+    for turno in TURNOS:
+        slots_horarios = SLOTS_MATUTINO if turno == "Matutino" else SLOTS_VESPERTINO
+        slots = []
+        for dia_indice, dia in enumerate(DIAS_SEMANA):
+            for hora_indice, (hora_inicio, hora_fin) in enumerate(slots_horarios):
+                slots.append(Slot(
+                    dia=dia,
+                    hora_inicio=hora_inicio,
+                    hora_fin=hora_fin,
+                    turno=turno,
+                    indice=indice,
+                    dia_indice=dia_indice,
+                    hora_indice=hora_indice
+                ))
+                indice += 1
+        tabla[turno] = tuple(slots)
+    return tabla
+
+
+# Slots inmutables de cada turno: se comparten, no se crean en cada llamada
+TABLA_SLOTS = _generar_tabla_slots()
+
+# Todos los slots, en orden de índice global (turnos en el orden de TURNOS)
+SLOTS_GLOBALES = tuple(slot for turno in TURNOS for slot in TABLA_SLOTS[turno])
+
+# Índice global de cada slot por (turno, día, hora de inicio)
+INDICE_SLOT_GLOBAL = {
+    (slot.turno, slot.dia, slot.hora_inicio): slot.indice
+    for slot in SLOTS_GLOBALES
+}
+
+
 def get_all_slots(turno: str) -> List[Slot]:
     """
-    Genera todos los slots posibles para un turno dado.
+    Obtiene todos los slots posibles para un turno dado.
+    
+    Los Slot son los de TABLA_SLOTS (inmutables): solo se crea la lista.
     
     Args:
         turno: Nombre del turno ("Matutino" o "Vespertino")
@@ -57,22 +100,66 @@ def get_all_slots(turno: str) -> List[Slot]:
     Raises:
         ValueError: Si el turno no es válido
     """
-    if turno not in ["Matutino", "Vespertino"]:
+    if turno not in TABLA_SLOTS:
         raise ValueError(f"Turno inválido: {turno}. Debe ser 'Matutino' o 'Vespertino'")
     
-    # Seleccionar los slots según el turno
-    slots_horarios = SLOTS_MATUTINO if turno == "Matutino" else SLOTS_VESPERTINO
+    return list(TABLA_SLOTS[turno])
+
+
+def get_slots_globales() -> List[Slot]:
+    """
+    Obtiene los slots de todos los turnos, en el orden de TURNOS.
+    
+    La posición de cada slot es su índice global (turno * 35 + día * 7 + hora),
+    el que usan los bitsets de profesores.
+    
+    Returns:
+        Lista de objetos Slot (2 turnos × 35 slots = 70 slots)
+    """
+    return list(SLOTS_GLOBALES)
+
+
+def slot_por_indice(indice: int) -> Slot:
+    """
+    Slot con un índice global dado.
+    
+    Raises:
+        IndexError: Si el índice no está en 0..69
+    """
+    return SLOTS_GLOBALES[indice]
+
+
+def indice_slot(turno: str, dia: str, hora_inicio: str) -> int:
+    """
+    Índice global del slot de un turno, día y hora de inicio.
     
-    # Generar todos los slots combinando días y horarios
-    slots = []
-    for dia in DIAS_SEMANA:
-        for hora_inicio, hora_fin in slots_horarios:
-            slot = Slot(
-                dia=dia,
-                hora_inicio=hora_inicio,
-                hora_fin=hora_fin,
-                turno=turno
-            )
-            slots.append(slot)
+    Raises:
+        ValueError: Si no existe ese slot
+    """
+    indice = INDICE_SLOT_GLOBAL.get((turno, dia, hora_inicio))
+    if indice is None:
+        raise ValueError(f"Slot inexistente: {turno} {dia} {hora_inicio}")
+    return indice
+
+
+def mascara_disponibilidad(profesor: Profesor) -> int:
+    """
+    Bitset de los slots globales en que el profesor está disponible.
+    
+    Se compila una sola vez desde disponibilidad_horaria (con
+    Profesor.esta_disponible_en_slot) y queda en profesor.mascara_disponible;
+    después, saber si un slot está disponible es un desplazamiento y una AND.
     
-    return slots
+    Args:
+        profesor: Profesor a consultar
+    
+    Returns:
+        Bitset con el bit INDICE_SLOT_GLOBAL de cada slot disponible encendido
+    """
+    if profesor.mascara_disponible is None:
+        mascara = 0
+        for slot in SLOTS_GLOBALES:
+            if profesor.esta_disponible_en_slot(slot.dia, slot.hora_inicio, slot.hora_fin):
+                mascara |= 1 << slot.indice
+        profesor.mascara_disponible = mascara
+    return profesor.mascara_disponible
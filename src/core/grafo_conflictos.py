@@ -3,7 +3,11 @@ Grafo de Conflictos para el University Timetabling Problem.
 Modela las restricciones del problema usando teoría de grafos.
 """
 
-from typing import Set, Dict, List, Tuple
+import heapq
+from abc import ABC, abstractmethod
+from array import array
+from collections import Counter
+from typing import Set, Dict, List, Tuple, Iterable
 from dataclasses import dataclass
 from ..core.modelos import Grupo, Materia, Profesor
 
@@ -66,10 +70,21 @@ class GrafoConflictos:
             materias: Lista de materias
             profesores: Lista de profesores
         """
-        # Paso 1: Construir mapeo de profesores por materia
-        self._construir_mapeo_profesores(profesores)
+        # Pasos 1 y 2: mapeo de profesores por materia y nodos
+        self._crear_nodos(materias, profesores)
         
-        # Paso 2: Crear todos los nodos (una asignación por cada grupo-materia)
+        # Paso 3: Detectar y agregar aristas de conflicto con índices invertidos
+        # (grupo -> nodos, profesor -> nodos): cada cubeta es una clique, así que
+        # no se compara cada par de nodos y el costo es proporcional a las aristas
+        for cubeta in self._cubetas_conflicto():
+            for nodo in cubeta:
+                self.aristas[nodo].update(cubeta)
+        for nodo in self.nodos:
+            self.aristas[nodo].discard(nodo)
+    
+    def _crear_nodos(self, materias: List[Materia], profesores: List[Profesor]) -> None:
+        """Construye el mapeo de profesores por materia y un nodo por cada grupo-materia."""
+        self._construir_mapeo_profesores(profesores)
         for materia in materias:
             for grupo in materia.grupos_que_cursan:
                 nodo = NodoAsignacion(
@@ -78,16 +93,25 @@ class GrafoConflictos:
                     cuatrimestre=materia.cuatrimestre
                 )
                 self.agregar_nodo(nodo)
+    
+    def _cubetas_conflicto(self) -> List[List[NodoAsignacion]]:
+        """
+        Agrupa los nodos que están en conflicto entre sí.
+        
+        Hay una cubeta por grupo (conflicto tipo 1) y una por profesor con
+        los nodos de las materias que puede impartir (conflicto tipo 2). Dos
+        nodos tienen conflicto (_tiene_conflicto) si y solo si comparten cubeta.
         
-        # Paso 3: Detectar y agregar aristas de conflicto
-        lista_nodos = list(self.nodos)
-        for i in range(len(lista_nodos)):
-            for j in range(i + 1, len(lista_nodos)):
-                nodo1 = lista_nodos[i]
-                nodo2 = lista_nodos[j]
-                
-                if self._tiene_conflicto(nodo1, nodo2):
-                    self.agregar_arista(nodo1, nodo2)
+        Returns:
+            Lista de cubetas (listas de nodos)
+        """
+        por_grupo: Dict[str, List[NodoAsignacion]] = {}
+        por_profesor: Dict[str, List[NodoAsignacion]] = {}
+        for nodo in self.nodos:
+            por_grupo.setdefault(nodo.grupo_nombre, []).append(nodo)
+            for profesor in set(self.profesores_por_materia.get(nodo.materia_nombre, [])):
+                por_profesor.setdefault(profesor, []).append(nodo)
+        return list(por_grupo.values()) + list(por_profesor.values())
     
     def _construir_mapeo_profesores(self, profesores: List[Profesor]) -> None:
         """Construye el mapeo de materia -> lista de profesores."""
@@ -116,11 +140,11 @@ class GrafoConflictos:
     
     def _comparten_profesor(self, materia1: str, materia2: str) -> bool:
         """Verifica si dos materias pueden ser impartidas por el mismo profesor."""
-        profesores1 = set(self.profesores_por_materia.get(materia1, []))
-        profesores2 = set(self.profesores_por_materia.get(materia2, []))
+        profesores1 = self.profesores_por_materia.get(materia1, [])
+        profesores2 = self.profesores_por_materia.get(materia2, [])
         
         # Si tienen profesores en común, pueden tener conflicto
-        return len(profesores1 & profesores2) > 0
+        return not set(profesores1).isdisjoint(profesores2)
     
     def agregar_nodo(self, nodo: NodoAsignacion) -> None:
         """Agrega un nodo al grafo."""
@@ -144,6 +168,42 @@ class GrafoConflictos:
         """Retorna el número de conflictos (grado) de un nodo."""
         return len(self.obtener_vecinos(nodo))
     
+    def compactar(self) -> 'GrafoCompacto':
+        """Retorna el mismo grafo en representación compacta (ver GrafoCompacto)."""
+        return GrafoCompacto.desde_grafo(self)
+    
+    def componentes_conexas(self) -> List[Set[NodoAsignacion]]:
+        """
+        Separa el grafo en componentes conexas.
+        
+        Asignaciones de componentes distintas no comparten grupo ni profesor
+        posible, así que pueden resolverse por separado.
+        
+        Returns:
+            Lista de conjuntos de nodos, de la componente más grande a la más chica
+        """
+        componentes = []
+        visitados: Set[NodoAsignacion] = set()
+        for inicio in self.nodos:
+            if inicio in visitados:
+                continue
+            
+            # Recorrido en profundidad (pila explícita) desde un nodo aún no visitado
+            visitados.add(inicio)
+            componente = {inicio}
+            pendientes = [inicio]
+            while pendientes:
+                nodo = pendientes.pop()
+                for vecino in self.obtener_vecinos(nodo):
+                    if vecino not in visitados:
+                        visitados.add(vecino)
+                        componente.add(vecino)
+                        pendientes.append(vecino)
+            componentes.append(componente)
+        
+        componentes.sort(key=len, reverse=True)
+        return componentes
+    
     def obtener_estadisticas(self) -> Dict:
         """
         Calcula estadísticas del grafo.
@@ -185,3 +245,251 @@ class GrafoConflictos:
         nodos_con_grado = [(nodo, self.obtener_grado(nodo)) for nodo in self.nodos]
         nodos_con_grado.sort(key=lambda x: x[1], reverse=True)
         return nodos_con_grado[:n]
+
+
+class _GrafoIndexado(ABC):
+    """
+    Base de las representaciones con ids enteros (GrafoCompacto y GrafoBitset).
+    
+    Cada nodo tiene un id entero, su posición en lista_nodos, y grados[i] es
+    el grado del nodo i. Las subclases definen vecinos_id; con eso se ofrece
+    la misma interfaz de consulta que GrafoConflictos (nodos, obtener_vecinos,
+    obtener_grado, componentes_conexas, obtener_estadisticas y
+    obtener_nodos_mas_conflictivos), así que cualquiera puede usarse en su
+    lugar en las heurísticas, el backtracking y la descomposición.
+    """
+    
+    def __init__(self, lista_nodos: List[NodoAsignacion], profesores_por_materia: Dict[str, List[str]]):
+        self.lista_nodos = lista_nodos
+        self.id_nodo: Dict[NodoAsignacion, int] = {nodo: i for i, nodo in enumerate(lista_nodos)}
+        self.nodos = frozenset(lista_nodos)
+        self.profesores_por_materia = profesores_por_materia
+        self.grados = array('i')
+    
+    @abstractmethod
+    def vecinos_id(self, i: int) -> Iterable[int]:
+        """Ids de los vecinos del nodo con id i (ordenados)."""
+    
+    def obtener_vecinos(self, nodo: NodoAsignacion) -> Set[NodoAsignacion]:
+        """Retorna el conjunto de nodos en conflicto con el nodo dado."""
+        i = self.id_nodo.get(nodo)
+        if i is None:
+            return set()
+        return {self.lista_nodos[j] for j in self.vecinos_id(i)}
+    
+    def obtener_grado(self, nodo: NodoAsignacion) -> int:
+        """Retorna el número de conflictos (grado) de un nodo."""
+        i = self.id_nodo.get(nodo)
+        return self.grados[i] if i is not None else 0
+    
+    def componentes_conexas(self) -> List[Set[NodoAsignacion]]:
+        """
+        Separa el grafo en componentes conexas (ver GrafoConflictos.componentes_conexas).
+        
+        Returns:
+            Lista de conjuntos de nodos, de la componente más grande a la más chica
+        """
+        componentes = []
+        visitados = bytearray(len(self.lista_nodos))
+        for inicio in range(len(self.lista_nodos)):
+            if visitados[inicio]:
+                continue
+            
+            visitados[inicio] = 1
+            componente = [inicio]
+            pendientes = [inicio]
+            while pendientes:
+                i = pendientes.pop()
+                for j in self.vecinos_id(i):
+                    if not visitados[j]:
+                        visitados[j] = 1
+                        componente.append(j)
+                        pendientes.append(j)
+            componentes.append({self.lista_nodos[i] for i in componente})
+        
+        componentes.sort(key=len, reverse=True)
+        return componentes
+    
+    def obtener_estadisticas(self) -> Dict:
+        """
+        Calcula estadísticas del grafo (las mismas que GrafoConflictos).
+        
+        Las sumas, máximos y mínimos se hacen directo sobre el vector de
+        grados, sin consultar los vecinos de cada nodo.
+        
+        Returns:
+            Diccionario con métricas del grafo
+        """
+        num_nodos = len(self.lista_nodos)
+        num_aristas = sum(self.grados) // 2
+        
+        return {
+            'num_nodos': num_nodos,
+            'num_aristas': num_aristas,
+            'grado_promedio': sum(self.grados) / num_nodos if num_nodos > 0 else 0,
+            'grado_maximo': max(self.grados, default=0),
+            'grado_minimo': min(self.grados, default=0),
+            'nodos_por_cuatrimestre': dict(Counter(nodo.cuatrimestre for nodo in self.lista_nodos)),
+            'densidad': (2 * num_aristas) / (num_nodos * (num_nodos - 1)) if num_nodos > 1 else 0
+        }
+    
+    def obtener_nodos_mas_conflictivos(self, n: int = 5) -> List[Tuple[NodoAsignacion, int]]:
+        """
+        Retorna los n nodos con más conflictos.
+        
+        Selecciona los n mayores del vector de grados con un heap (O(N log n))
+        en lugar de ordenar todos los nodos.
+        
+        Returns:
+            Lista de tuplas (nodo, grado) ordenadas por grado descendente
+        """
+        mayores = heapq.nlargest(n, range(len(self.lista_nodos)), key=self.grados.__getitem__)
+        return [(self.lista_nodos[i], self.grados[i]) for i in mayores]
+
+
+class GrafoCompacto(_GrafoIndexado):
+    """
+    Grafo de conflictos en formato CSR (de solo lectura).
+    
+    Los vecinos del nodo i son indices[indptr[i]:indptr[i + 1]] (ids
+    ordenados). indptr, indices y grados son array('i'), como en
+    EstadoCompacto: 4 bytes por arista en cada sentido en lugar de un set
+    de NodoAsignacion por nodo.
+    """
+    
+    def __init__(self, lista_nodos: List[NodoAsignacion], vecinos: Iterable[Iterable[int]],
+                 profesores_por_materia: Dict[str, List[str]]):
+        """
+        Args:
+            lista_nodos: Nodos en orden de id
+            vecinos: Ids de los vecinos de cada nodo, en orden de id
+            profesores_por_materia: Mapeo materia -> profesores que la imparten
+        """
+        super().__init__(lista_nodos, profesores_por_materia)
+        self.indptr = array('i', [0])
+        self.indices = array('i')
+        for ids in vecinos:
+            self.indices.extend(sorted(ids))
+            self.indptr.append(len(self.indices))
+        self.grados = array('i', (self.indptr[i + 1] - self.indptr[i] for i in range(len(lista_nodos))))
+    
+    @classmethod
+    def desde_grafo(cls, grafo: GrafoConflictos) -> 'GrafoCompacto':
+        """Compacta un GrafoConflictos ya construido."""
+        lista_nodos = _ordenar_nodos(grafo.nodos)
+        id_nodo = {nodo: i for i, nodo in enumerate(lista_nodos)}
+        vecinos = ([id_nodo[v] for v in grafo.obtener_vecinos(nodo)] for nodo in lista_nodos)
+        return cls(lista_nodos, vecinos, grafo.profesores_por_materia)
+    
+    @classmethod
+    def desde_datos(cls, grupos: List[Grupo], materias: List[Materia],
+                    profesores: List[Profesor]) -> 'GrafoCompacto':
+        """
+        Construye el grafo compacto sin pasar por los sets de GrafoConflictos.
+        
+        Usa las mismas cubetas (_cubetas_conflicto), pero con ids: los vecinos
+        de cada nodo se unen en un set de enteros que se descarta al pasarlo
+        a indices, así que nunca están todas las aristas en sets a la vez.
+        """
+        base = GrafoConflictos()
+        base._crear_nodos(materias, profesores)
+        lista_nodos = _ordenar_nodos(base.nodos)
+        id_nodo = {nodo: i for i, nodo in enumerate(lista_nodos)}
+        
+        cubetas = [[id_nodo[nodo] for nodo in cubeta] for cubeta in base._cubetas_conflicto()]
+        cubetas_de: List[List[int]] = [[] for _ in lista_nodos]
+        for c, cubeta in enumerate(cubetas):
+            for i in cubeta:
+                cubetas_de[i].append(c)
+        
+        def vecinos_de(i: int) -> Set[int]:
+            vecinos = set()
+            for c in cubetas_de[i]:
+                vecinos.update(cubetas[c])
+            vecinos.discard(i)
+            return vecinos
+        
+        return cls(lista_nodos, (vecinos_de(i) for i in range(len(lista_nodos))),
+                   base.profesores_por_materia)
+    
+    def vecinos_id(self, i: int) -> array:
+        """Ids de los vecinos del nodo con id i (ordenados)."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+
+class GrafoBitset(_GrafoIndexado):
+    """
+    Grafo de conflictos como matriz de adyacencia de bitsets (de solo lectura).
+    
+    filas[i] es un int con el bit j encendido si los nodos i y j están en
+    conflicto. Con densidades cercanas a 0.3 una fila ocupa menos que una
+    lista de ids, y las operaciones sobre vecindarios (vecinos comunes para
+    cliques, vecinos con cierto color al colorear) son una AND de enteros en
+    lugar de recorrer sets.
+    """
+    
+    def __init__(self, lista_nodos: List[NodoAsignacion], filas: List[int],
+                 profesores_por_materia: Dict[str, List[str]]):
+        """
+        Args:
+            lista_nodos: Nodos en orden de id
+            filas: Bitset de vecinos de cada nodo, en orden de id
+            profesores_por_materia: Mapeo materia -> profesores que la imparten
+        """
+        super().__init__(lista_nodos, profesores_por_materia)
+        self.filas = filas
+        # Popcount compatible con Python 3.8 (como contar_bits de EstadoCompacto)
+        self.grados = array('i', (bin(fila).count("1") for fila in filas))
+    
+    @classmethod
+    def desde_grafo(cls, grafo) -> 'GrafoBitset':
+        """
+        Convierte otro grafo (GrafoConflictos o GrafoCompacto) a bitsets.
+        
+        Si el grafo ya tiene ids (GrafoCompacto) se conservan.
+        """
+        if isinstance(grafo, _GrafoIndexado):
+            lista_nodos = grafo.lista_nodos
+            vecinos = (grafo.vecinos_id(i) for i in range(len(lista_nodos)))
+        else:
+            lista_nodos = _ordenar_nodos(grafo.nodos)
+            id_nodo = {nodo: i for i, nodo in enumerate(lista_nodos)}
+            vecinos = ((id_nodo[v] for v in grafo.obtener_vecinos(nodo)) for nodo in lista_nodos)
+        
+        filas = []
+        for ids in vecinos:
+            fila = 0
+            for j in ids:
+                fila |= 1 << j
+            filas.append(fila)
+        return cls(lista_nodos, filas, grafo.profesores_por_materia)
+    
+    def vecinos_id(self, i: int) -> List[int]:
+        """Ids de los vecinos del nodo con id i (ordenados)."""
+        return ids_en_mascara(self.filas[i])
+    
+    def mascara_de(self, nodos: Iterable[NodoAsignacion]) -> int:
+        """Bitset con los ids de los nodos dados encendidos."""
+        mascara = 0
+        for nodo in nodos:
+            mascara |= 1 << self.id_nodo[nodo]
+        return mascara
+    
+    def nodos_de(self, mascara: int) -> List[NodoAsignacion]:
+        """Nodos cuyos ids están encendidos en el bitset."""
+        return [self.lista_nodos[i] for i in ids_en_mascara(mascara)]
+
+
+def ids_en_mascara(mascara: int) -> List[int]:
+    """Posiciones de los bits encendidos de un bitset, de menor a mayor."""
+    ids = []
+    while mascara:
+        bit = mascara & -mascara
+        ids.append(bit.bit_length() - 1)
+        mascara ^= bit
+    return ids
+
+
+def _ordenar_nodos(nodos: Iterable[NodoAsignacion]) -> List[NodoAsignacion]:
+    """Ordena los nodos (cuatrimestre, grupo, materia) para que los ids sean reproducibles."""
+    return sorted(nodos, key=lambda n: (n.cuatrimestre, n.grupo_nombre, n.materia_nombre))
@@ -3,7 +3,7 @@ Modelos de datos del Sistema de Gestión de Horarios Académicos.
 Define las clases principales del dominio.
 """
 
-from typing import List
+from typing import List, Optional
 from dataclasses import dataclass, field
 
 
@@ -59,6 +59,10 @@ class Profesor:
                                Formato: {"Lunes": [("07:00", "14:00")], ...}
                                Si está vacío, usa turno_preferido por compatibilidad
         horas_asignadas: Horas ya asignadas (se actualiza durante la generación)
+        mascara_disponible: disponibilidad_horaria compilada a un bitset de slots
+                            globales (ver config.mascara_disponibilidad); None
+                            hasta compilarla. Se debe volver a None si cambia
+                            disponibilidad_horaria
     """
     nombre: str
     materias_imparte: List[str]
@@ -66,6 +70,7 @@ class Profesor:
     turno_preferido: str
     disponibilidad_horaria: dict = field(default_factory=dict)
     horas_asignadas: int = 0
+    mascara_disponible: Optional[int] = field(default=None, compare=False, repr=False)
     
     def puede_impartir(self, materia: str) -> bool:
         """Verifica si el profesor puede impartir una materia."""
@@ -79,6 +84,9 @@ class Profesor:
         """
         Verifica si el profesor está disponible en un slot específico.
         
+        Recorre los rangos de disponibilidad_horaria; se usa al compilar
+        mascara_disponible, que es lo que consultan las validaciones.
+        
         Args:
             dia: Día de la semana
             hora_inicio: Hora de inicio del slot (formato "HH:MM")
@@ -109,21 +117,36 @@ class Profesor:
         return f"{self.nombre} ({self.horas_asignadas}/{self.horas_disponibles}h)"
 
 
-@dataclass
+@dataclass(frozen=True)
 class Slot:
     """
-    Representa un bloque de tiempo en el horario.
+    Representa un bloque de tiempo en el horario (inmutable).
+    
+    Los slots de config (get_all_slots, slot_por_indice) son únicos y traen
+    sus índices; los creados a mano los dejan en -1. Los índices no cuentan
+    en la igualdad.
     
     Attributes:
         dia: Día de la semana
         hora_inicio: Hora de inicio (formato "HH:MM")
         hora_fin: Hora de fin (formato "HH:MM")
         turno: Turno al que pertenece
+        indice: Índice global (turno * 35 + día * 7 + hora), el de los bitsets
+        dia_indice: Posición del día en DIAS_SEMANA
+        hora_indice: Posición de la hora dentro del turno (0..6)
+        slot_key: Clave "HH:MM-HH:MM" usada en los horarios anidados
     """
     dia: str
     hora_inicio: str
     hora_fin: str
     turno: str
+    indice: int = field(default=-1, compare=False)
+    dia_indice: int = field(default=-1, compare=False)
+    hora_indice: int = field(default=-1, compare=False)
+    slot_key: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'slot_key', f"{self.hora_inicio}-{self.hora_fin}")
     
     def __str__(self) -> str:
         return f"{self.dia} {self.hora_inicio}-{self.hora_fin}"
@@ -11,7 +11,80 @@ BacktrackingSolver::BacktrackingSolver(const std::vector<Grupo>& g,
                                        const std::vector<Materia>& m,
                                        const std::vector<Profesor>& p,
                                        const GrafoConflictos& grafo_conflictos)
-    : grupos(g), materias(m), profesores(p), grafo(grafo_conflictos) {}
+    : grupos(g), materias(m), profesores(p), grafo(grafo_conflictos), minimizar_cambios(false) {}
+
+void BacktrackingSolver::setHorarioPrevio(const HorarioPrevio& previo, bool minimizar) {
+    horario_previo = previo;
+    minimizar_cambios = minimizar;
+}
+
+const std::pair<std::string, std::string>* BacktrackingSolver::buscarPrevio(
+    const std::string& grupo_nombre, const Slot& slot) const {
+    auto grupo_it = horario_previo.find(grupo_nombre);
+    if (grupo_it == horario_previo.end()) return nullptr;
+    
+    auto dia_it = grupo_it->second.find(slot.dia);
+    if (dia_it == grupo_it->second.end()) return nullptr;
+    
+    auto slot_it = dia_it->second.find(slot.getKey());
+    if (slot_it == dia_it->second.end()) return nullptr;
+    
+    return &slot_it->second;
+}
+
+int BacktrackingSolver::conservarPrevio() {
+    // Fija las clases previas que siguen cumpliendo las restricciones duras
+    int conservadas = 0;
+    for (const auto& asignacion : asignaciones_pendientes) {
+        const auto& grupo = asignacion.grupo;
+        const auto& materia = asignacion.materia;
+        
+        for (const auto& slot : getAllSlots(grupo.turno)) {
+            const auto* previo = buscarPrevio(grupo.nombre, slot);
+            if (!previo || previo->first != materia.nombre) continue;
+            if (horas_asignadas_materia[grupo.nombre][materia.nombre] >= materia.horas_semana) break;
+            
+            for (const auto& profesor : asignacion.profesores_disponibles) {
+                if (profesor.nombre != previo->second) continue;
+                
+                auto [valido, razon] = validarRestriccionesDuras(
+                    horario, grupo, materia, profesor, slot,
+                    profesor_ocupado, horas_asignadas_profesor
+                );
+                if (valido) {
+                    hacerAsignacion(grupo, materia, profesor, slot);
+                    conservadas++;
+                }
+                break;
+            }
+        }
+    }
+    return conservadas;
+}
+
+int BacktrackingSolver::contarConservadas() const {
+    int conservadas = 0;
+    for (const auto& [grupo_nombre, dias] : horario_previo) {
+        auto grupo_it = horario.find(grupo_nombre);
+        if (grupo_it == horario.end()) continue;
+        
+        for (const auto& [dia, slots] : dias) {
+            auto dia_it = grupo_it->second.find(dia);
+            if (dia_it == grupo_it->second.end()) continue;
+            
+            for (const auto& [slot_key, clase] : slots) {
+                auto slot_it = dia_it->second.find(slot_key);
+                if (slot_it == dia_it->second.end()) continue;
+                
+                auto valor_it = slot_it->second.find(":valor");
+                if (valor_it != slot_it->second.end() && valor_it->second == clase.first + "|" + clase.second) {
+                    conservadas++;
+                }
+            }
+        }
+    }
+    return conservadas;
+}
 
 void BacktrackingSolver::inicializarEstado() {
     horario.clear();
@@ -113,8 +186,25 @@ bool BacktrackingSolver::intentarAsignar(const AsignacionPendiente& asignacion,
     auto slots_turno = getAllSlots(grupo.turno);
     auto slots_ordenados = seleccionarMejorSlot(slots_turno, horario, grupo);
     
+    // Warm start: primero los slots donde el grupo tenía esta materia
+    if (!horario_previo.empty()) {
+        std::stable_partition(slots_ordenados.begin(), slots_ordenados.end(),
+            [this, &grupo, &materia](const Slot& s) {
+                const auto* previo = buscarPrevio(grupo.nombre, s);
+                return previo && previo->first == materia.nombre;
+            });
+    }
+    
     for (const auto& slot : slots_ordenados) {
-        for (const auto& profesor : asignacion.profesores_disponibles) {
+        // ...y en ese slot, primero el profesor que la impartía
+        std::vector<Profesor> profesores_orden = asignacion.profesores_disponibles;
+        const auto* previo = buscarPrevio(grupo.nombre, slot);
+        if (previo && previo->first == materia.nombre) {
+            std::stable_partition(profesores_orden.begin(), profesores_orden.end(),
+                [previo](const Profesor& p) { return p.nombre == previo->second; });
+        }
+        
+        for (const auto& profesor : profesores_orden) {
             auto [valido, razon] = validarRestriccionesDuras(
                 horario, grupo, materia, profesor, slot,
                 profesor_ocupado, horas_asignadas_profesor
@@ -164,7 +254,22 @@ ResultadoBacktracking BacktrackingSolver::resolver() {
     std::cout << "Iniciando backtracking..." << std::endl;
     std::cout << "Asignaciones pendientes: " << asignaciones_pendientes.size() << std::endl;
     
-    bool exito = backtrackRecursivo(0, "raiz", 1);
+    bool exito = false;
+    int clases_fijas = 0;
+    if (minimizar_cambios && !horario_previo.empty()) {
+        clases_fijas = conservarPrevio();
+        std::cout << "Conservando " << clases_fijas << " clases del horario previo" << std::endl;
+        exito = backtrackRecursivo(0, "raiz", 1);
+        if (!exito) {
+            std::cout << "No se pudo conservar el horario previo, resolviendo desde cero" << std::endl;
+            inicializarEstado();
+            clases_fijas = 0;
+        }
+    }
+    
+    if (!exito) {
+        exito = backtrackRecursivo(0, "raiz", 1);
+    }
     
     auto fin = std::chrono::high_resolution_clock::now();
     std::chrono::duration<double> duracion = fin - inicio;
@@ -174,6 +279,18 @@ ResultadoBacktracking BacktrackingSolver::resolver() {
     resultado.estadisticas["tiempo_total"] = duracion.count();
     resultado.estadisticas["nodos_explorados"] = static_cast<double>(arbol.getTotalNodos());
     
+    if (!horario_previo.empty()) {
+        int previas = 0;
+        for (const auto& [grupo_nombre, dias] : horario_previo) {
+            for (const auto& [dia, slots] : dias) {
+                previas += static_cast<int>(slots.size());
+            }
+        }
+        resultado.estadisticas["clases_previas"] = previas;
+        resultado.estadisticas["clases_fijas"] = clases_fijas;
+        resultado.estadisticas["clases_conservadas"] = contarConservadas();
+    }
+    
     if (exito) {
         std::cout << "Solucion encontrada!" << std::endl;
     } else {
@@ -9,6 +9,9 @@
 #include <vector>
 #include <memory>
 
+// Horario previo: grupo -> dia -> "HH:MM-HH:MM" -> (materia, profesor)
+using HorarioPrevio = std::map<std::string, std::map<std::string, std::map<std::string, std::pair<std::string, std::string>>>>;
+
 struct ResultadoBacktracking {
     bool exito;
     std::map<std::string, std::map<std::string, std::map<std::string, std::map<std::string, std::string>>>> horario;
@@ -32,6 +35,9 @@ private:
     
     std::vector<AsignacionPendiente> asignaciones_pendientes;
     
+    HorarioPrevio horario_previo;
+    bool minimizar_cambios;
+    
     void inicializarEstado();
     void construirAsignacionesPendientes();
     bool backtrackRecursivo(size_t indice, const std::string& nodo_padre_id, int profundidad);
@@ -39,11 +45,15 @@ private:
     void hacerAsignacion(const Grupo& grupo, const Materia& materia, const Profesor& profesor, const Slot& slot);
     void deshacerAsignacion(const Grupo& grupo, const Materia& materia, const Profesor& profesor, const Slot& slot);
     bool esSolucionCompleta() const;
+    const std::pair<std::string, std::string>* buscarPrevio(const std::string& grupo_nombre, const Slot& slot) const;
+    int conservarPrevio();
+    int contarConservadas() const;
 
 public:
     BacktrackingSolver(const std::vector<Grupo>& g, const std::vector<Materia>& m,
                       const std::vector<Profesor>& p, const GrafoConflictos& grafo_conflictos);
     
+    void setHorarioPrevio(const HorarioPrevio& previo, bool minimizar);
     ResultadoBacktracking resolver();
 };
 
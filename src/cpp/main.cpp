@@ -32,6 +32,10 @@ int main(int argc, char* argv[]) {
         
         std::cout << "\nResolviendo con backtracking..." << std::endl;
         BacktrackingSolver solver(datos.grupos, datos.materias, datos.profesores, grafo);
+        if (!datos.horario_previo.empty()) {
+            std::cout << "Usando horario previo como pista" << std::endl;
+            solver.setHorarioPrevio(datos.horario_previo, datos.minimizar_cambios);
+        }
         ResultadoBacktracking resultado = solver.resolver();
         
         std::cout << "\nEscribiendo resultados en " << archivo_salida << "..." << std::endl;
@@ -64,6 +64,22 @@ DatosEntrada leerJSON(const std::string& archivo) {
         datos.profesores.push_back(profesor);
     }
     
+    if (j.contains("horario_previo") && !j["horario_previo"].is_null()) {
+        for (const auto& [grupo_nombre, dias] : j["horario_previo"].items()) {
+            for (const auto& [dia, slots] : dias.items()) {
+                for (const auto& [slot_key, clase] : slots.items()) {
+                    if (clase.is_object() && clase.contains("materia") && clase.contains("profesor")) {
+                        datos.horario_previo[grupo_nombre][dia][slot_key] = {
+                            clase["materia"].get<std::string>(),
+                            clase["profesor"].get<std::string>()
+                        };
+                    }
+                }
+            }
+        }
+    }
+    datos.minimizar_cambios = j.value("minimizar_cambios", false);
+    
     for (auto& materia : datos.materias) {
         for (const auto& grupo : datos.grupos) {
             if (grupo.cuatrimestre == materia.cuatrimestre) {
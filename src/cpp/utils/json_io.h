@@ -14,6 +14,8 @@ struct DatosEntrada {
     std::vector<Grupo> grupos;
     std::vector<Materia> materias;
     std::vector<Profesor> profesores;
+    HorarioPrevio horario_previo;
+    bool minimizar_cambios = false;
 };
 
 DatosEntrada leerJSON(const std::string& archivo);
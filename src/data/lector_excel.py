@@ -7,6 +7,7 @@ import os
 from typing import Tuple, List
 import pandas as pd
 from ..core.modelos import Grupo, Materia, Profesor
+from ..core.config import mascara_disponibilidad
 
 
 def leer_excel(ruta_archivo: str) -> Tuple[List[Grupo], List[Materia], List[Profesor]]:
@@ -58,7 +59,7 @@ def leer_excel(ruta_archivo: str) -> Tuple[List[Grupo], List[Materia], List[Prof
         profesores = _procesar_profesores(df_profesores)
         
         return grupos, materias, profesores
-        
+    
     except Exception as e:
         if isinstance(e, (FileNotFoundError, ValueError)):
             raise
@@ -165,6 +166,8 @@ def _procesar_profesores(df: pd.DataFrame) -> List[Profesor]:
             turno_preferido=str(row['Turno_Preferido']).strip(),
             disponibilidad_horaria=disponibilidad
         )
+        # Compilar la disponibilidad una sola vez (las validaciones usan el bitset)
+        mascara_disponibilidad(profesor)
         profesores.append(profesor)
     
     return profesores
@@ -0,0 +1,241 @@
+"""
+Pruebas del grafo de conflictos y su analizador con datos sintéticos.
+No necesitan el Excel ni pandas: se ejecutan con `python test_analizador.py`
+o con pytest.
+
+Cada forma de construir o representar el grafo debe dar las mismas
+aristas que comparar cada par de nodos, los algoritmos del analizador se
+comprueban en grafos aleatorios chicos, y las cotas de
+verificar_factibilidad nunca deben declarar no factible una instancia que
+el motor resuelve.
+"""
+
+import random
+from itertools import combinations
+
+from src.core.modelos import Grupo, Materia, Profesor
+from src.core.grafo_conflictos import GrafoConflictos, GrafoCompacto, GrafoBitset, NodoAsignacion
+from src.core.analizador_grafo import (preparar_grafo, verificar_factibilidad, iterar_cliques_maximales,
+                                       encontrar_cliques, encontrar_clique_maxima, METODOS_COLOREO,
+                                       calcular_numero_cromatico_aproximado, colorear_welsh_powell,
+                                       colorear_dsatur, colorear_greedy_iterado, horas_por_materia)
+from test_motor import (SEMILLAS, generar_instancia, generar_instancia_mediana, instancia_reparto,
+                        resolver, validar_horario)
+
+
+def grafo_aleatorio(semilla: int) -> GrafoConflictos:
+    """Grafo de 1 a 12 nodos con aristas al azar (densidad también al azar)."""
+    aleatorio = random.Random(semilla)
+    grafo = GrafoConflictos()
+    nodos = [NodoAsignacion(f"G{i}", f"M{i}", 1) for i in range(aleatorio.randint(1, 12))]
+    for nodo in nodos:
+        grafo.agregar_nodo(nodo)
+    densidad = aleatorio.random()
+    for nodo1, nodo2 in combinations(nodos, 2):
+        if aleatorio.random() < densidad:
+            grafo.agregar_arista(nodo1, nodo2)
+    return grafo
+
+
+def cliques_por_fuerza_bruta(grafo):
+    """Cliques maximales probando cada subconjunto de nodos."""
+    nodos = sorted(grafo.nodos, key=str)
+    cliques = [
+        set(subconjunto)
+        for tamano in range(1, len(nodos) + 1)
+        for subconjunto in combinations(nodos, tamano)
+        if all(b in grafo.obtener_vecinos(a) for a, b in combinations(subconjunto, 2))
+    ]
+    return [c for c in cliques if not any(c < otra for otra in cliques)]
+
+
+def instancias():
+    """Instancias de prueba: las aleatorias de test_motor y una con dos componentes."""
+    for semilla in SEMILLAS:
+        yield generar_instancia(semilla)
+    for semilla in range(5):
+        yield generar_instancia_mediana(semilla)
+    yield instancia_reparto([5, 6])
+
+
+def construir_por_pares(grupos, materias, profesores) -> GrafoConflictos:
+    """Grafo de referencia: compara cada par de nodos con _tiene_conflicto."""
+    grafo = GrafoConflictos()
+    grafo._crear_nodos(materias, profesores)
+    for nodo1, nodo2 in combinations(list(grafo.nodos), 2):
+        if grafo._tiene_conflicto(nodo1, nodo2):
+            grafo.agregar_arista(nodo1, nodo2)
+    return grafo
+
+
+def vecindarios(grafo):
+    """Vecinos de cada nodo, como {nodo: set}."""
+    return {nodo: set(grafo.obtener_vecinos(nodo)) for nodo in grafo.nodos}
+
+
+def componentes(grafo):
+    """Componentes conexas como conjunto de frozensets (sin importar el orden)."""
+    return {frozenset(componente) for componente in grafo.componentes_conexas()}
+
+
+def test_cotas_profesor_dos_turnos():
+    """
+    Un profesor con 40 horas exclusivas repartidas en los dos turnos cabe
+    en 35 slots por turno; con las 40 en el mismo turno no cabe.
+    """
+    for turno, factible in (("Vespertino", True), ("Matutino", False)):
+        grupos = [Grupo(1, "Matutino", "GM"), Grupo(1, turno, "GV")]
+        materias = [Materia("A", 1, 20, [grupos[0]]), Materia("B", 1, 20, [grupos[1]])]
+        profesores = [Profesor("P", ["A", "B"], 40, "Ambos")]
+        grafo = GrafoConflictos()
+        grafo.construir_desde_datos(grupos, materias, profesores)
+        es_factible, razon, (inferior, superior) = verificar_factibilidad(grafo, 35, materias)
+        assert inferior <= superior
+        if factible:
+            assert es_factible is not False, razon
+            horario, _, estadisticas = resolver(grupos, materias, profesores)
+            assert estadisticas['solucion_completa']
+            validar_horario(horario, grupos, materias, profesores)
+        else:
+            assert es_factible is False, razon
+
+
+def test_cubetas_conflicto():
+    """Las aristas de los índices invertidos son las de comparar cada par de nodos."""
+    for grupos, materias, profesores in instancias():
+        grafo = GrafoConflictos()
+        grafo.construir_desde_datos(grupos, materias, profesores)
+        referencia = construir_por_pares(grupos, materias, profesores)
+        assert vecindarios(grafo) == vecindarios(referencia)
+        assert componentes(grafo) == componentes(referencia)
+
+
+def test_grafo_compacto():
+    """
+    GrafoCompacto (desde el grafo o desde los datos) tiene los mismos
+    vecinos, grados, estadísticas y componentes que GrafoConflictos, y
+    vuelve a 'conjuntos' sin cambios.
+    """
+    for grupos, materias, profesores in instancias():
+        grafo = GrafoConflictos()
+        grafo.construir_desde_datos(grupos, materias, profesores)
+        esperado = vecindarios(grafo)
+        for compacto in (preparar_grafo(grafo, 'csr'), grafo.compactar(),
+                         GrafoCompacto.desde_datos(grupos, materias, profesores)):
+            assert vecindarios(compacto) == esperado
+            assert vecindarios(preparar_grafo(compacto, 'conjuntos')) == esperado
+            assert all(compacto.obtener_grado(nodo) == len(vecinos) for nodo, vecinos in esperado.items())
+            assert compacto.obtener_estadisticas() == grafo.obtener_estadisticas()
+            assert componentes(compacto) == componentes(grafo)
+
+
+def test_grafo_bitset():
+    """GrafoBitset, desde GrafoConflictos o desde GrafoCompacto, equivale a GrafoConflictos."""
+    for grupos, materias, profesores in instancias():
+        grafo = GrafoConflictos()
+        grafo.construir_desde_datos(grupos, materias, profesores)
+        esperado = vecindarios(grafo)
+        for origen in (grafo, preparar_grafo(grafo, 'csr')):
+            bits = preparar_grafo(origen, 'bitset')
+            assert isinstance(bits, GrafoBitset)
+            assert vecindarios(bits) == esperado
+            assert vecindarios(preparar_grafo(bits, 'conjuntos')) == esperado
+            assert bits.obtener_estadisticas() == grafo.obtener_estadisticas()
+            assert componentes(bits) == componentes(grafo)
+
+
+def test_cliques_maximales():
+    """
+    Bron–Kerbosch genera exactamente las cliques maximales (cada una una
+    vez), encontrar_cliques da las más grandes y la clique máxima tiene
+    el tamaño de la mayor.
+    """
+    for semilla in range(200):
+        grafo = grafo_aleatorio(semilla)
+        esperadas = cliques_por_fuerza_bruta(grafo)
+        for backend in (None, 'csr', 'bitset'):
+            generadas = list(iterar_cliques_maximales(preparar_grafo(grafo, backend)))
+            assert len(generadas) == len(esperadas), semilla
+            assert {frozenset(c) for c in generadas} == {frozenset(c) for c in esperadas}, semilla
+        
+        tamanos = sorted(map(len, esperadas), reverse=True)
+        assert [len(c) for c in encontrar_cliques(grafo, max_cliques=3)] == tamanos[:3], semilla
+        clique, es_maxima = encontrar_clique_maxima(grafo)
+        assert es_maxima and len(clique) == tamanos[0], semilla
+        assert frozenset(clique) in {frozenset(c) for c in esperadas}, semilla
+
+
+def comprobar_coloreo(grafo, coloreo, horas=None):
+    """
+    Cada nodo tiene tantos colores distintos como horas su materia (uno
+    sin horas) y ningún color se repite entre vecinos.
+    """
+    assert set(coloreo) == set(grafo.nodos)
+    for nodo, colores in coloreo.items():
+        esperados = horas.get(nodo.materia_nombre, 1) if horas is not None else 1
+        assert len(set(colores)) == len(colores) == esperados, (nodo, colores)
+        for vecino in grafo.obtener_vecinos(nodo):
+            assert not set(colores) & set(coloreo[vecino]), (nodo, vecino)
+
+
+def test_coloreos():
+    """
+    Todos los métodos de METODOS_COLOREO dan coloreos propios, también con
+    horas (ninguna hora de un nodo coincide con una de sus vecinos), y
+    calcular_numero_cromatico_aproximado cuenta sus colores.
+    """
+    casos = []
+    for semilla in range(100):
+        grafo = grafo_aleatorio(semilla)
+        aleatorio = random.Random(semilla)
+        casos.append((grafo, {nodo.materia_nombre: aleatorio.randint(1, 4) for nodo in grafo.nodos}))
+    for grupos, materias, profesores in instancias():
+        grafo = GrafoConflictos()
+        grafo.construir_desde_datos(grupos, materias, profesores)
+        casos.append((grafo, horas_por_materia(materias)))
+    
+    for grafo, horas in casos:
+        clique, _ = encontrar_clique_maxima(grafo)
+        coloreos = {
+            'welsh_powell': colorear_welsh_powell(grafo),
+            'dsatur': colorear_dsatur(grafo),
+            'greedy_iterado': colorear_greedy_iterado(grafo, semilla=0)
+        }
+        assert set(coloreos) == set(METODOS_COLOREO)
+        for metodo, coloreo in coloreos.items():
+            comprobar_coloreo(grafo, coloreo)
+            num_colores = calcular_numero_cromatico_aproximado(grafo, metodo=metodo)
+            assert num_colores >= len(clique), metodo
+            if metodo != 'greedy_iterado':  # Sin semilla no es reproducible
+                assert num_colores == max((max(c) + 1 for c in coloreo.values()), default=0), metodo
+        for backend in ('csr', 'bitset'):
+            comprobar_coloreo(grafo, colorear_welsh_powell(grafo, backend))
+        comprobar_coloreo(grafo, colorear_dsatur(grafo, horas), horas)
+        comprobar_coloreo(grafo, colorear_greedy_iterado(grafo, horas, semilla=0), horas)
+
+
+def test_cotas_factibilidad():
+    """verificar_factibilidad nunca da una cota inferior mayor que la superior, y decide según ellas."""
+    for grupos, materias, profesores in instancias():
+        grafo = GrafoConflictos()
+        grafo.construir_desde_datos(grupos, materias, profesores)
+        for slots in (1, 5, 10, 20, 35):
+            for datos in (materias, None):
+                es_factible, razon, (inferior, superior) = verificar_factibilidad(grafo, slots, datos)
+                assert inferior <= superior, razon
+                assert (es_factible is False) == (inferior > slots), razon
+                assert (es_factible is True) == (superior <= slots), razon
+
+
+def main():
+    """Ejecuta todas las pruebas del módulo."""
+    pruebas = [(nombre, funcion) for nombre, funcion in globals().items()
+               if nombre.startswith('test_') and callable(funcion)]
+    for nombre, funcion in pruebas:
+        funcion()
+        print(f"✓ {nombre}")
+    print(f"\n✅ {len(pruebas)} pruebas correctas")
+
+
+if __name__ == "__main__":
+    main()
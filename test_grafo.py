@@ -8,6 +8,10 @@ from src.core.grafo_conflictos import GrafoConflictos
 from src.core.analizador_grafo import (calcular_numero_cromatico_aproximado,
                                        verificar_factibilidad,
                                        encontrar_cliques,
+                                       encontrar_clique_maxima,
+                                       calcular_cotas_inferiores,
+                                       horas_por_materia,
+                                       turnos_por_grupo,
                                        analizar_conflictos_por_tipo)
 from src.visualization.visualizador_grafo import (visualizar_grafo,
                                                    visualizar_por_cuatrimestre,
@@ -80,8 +84,13 @@ def main():
     print("🎨 ANÁLISIS DE COLOREO")
     print("-" * 80)
     num_cromatico = calcular_numero_cromatico_aproximado(grafo)
-    print(f"Número cromático aproximado: {num_cromatico}")
-    print(f"Interpretación: Se necesitan al menos {num_cromatico} slots de tiempo diferentes")
+    num_dsatur = calcular_numero_cromatico_aproximado(grafo, metodo='dsatur')
+    num_iterado = calcular_numero_cromatico_aproximado(grafo, metodo='greedy_iterado')
+    print(f"Número cromático aproximado: {num_cromatico} (Welsh-Powell), "
+          f"{num_dsatur} (DSATUR), {num_iterado} (greedy iterado)")
+    print(f"Interpretación: con una sola hora por asignación bastarían "
+          f"{min(num_cromatico, num_dsatur, num_iterado)} slots; con las horas de cada materia, "
+          f"ver el intervalo de la verificación de factibilidad")
     print()
     
     # Paso 7: Verificar factibilidad
@@ -90,32 +99,38 @@ def main():
     
     # Verificar para turno matutino (35 slots)
     slots_matutino = 35
-    es_factible_mat, razon_mat = verificar_factibilidad(grafo, slots_matutino)
+    es_factible_mat, razon_mat, _ = verificar_factibilidad(grafo, slots_matutino, materias)
     print(f"Turno Matutino ({slots_matutino} slots): {razon_mat}")
     
     # Verificar para turno vespertino (35 slots)
     slots_vespertino = 35
-    es_factible_vesp, razon_vesp = verificar_factibilidad(grafo, slots_vespertino)
+    es_factible_vesp, razon_vesp, _ = verificar_factibilidad(grafo, slots_vespertino, materias)
     print(f"Turno Vespertino ({slots_vespertino} slots): {razon_vesp}")
     
     # Verificar para ambos turnos (70 slots)
     slots_ambos = 70
-    es_factible_ambos, razon_ambos = verificar_factibilidad(grafo, slots_ambos)
+    es_factible_ambos, razon_ambos, _ = verificar_factibilidad(grafo, slots_ambos, materias)
     print(f"Ambos Turnos ({slots_ambos} slots): {razon_ambos}")
     print()
     
     # Paso 8: Encontrar cliques
     print("🔺 CLIQUES ENCONTRADOS (grupos mutuamente conflictivos)")
     print("-" * 80)
-    cliques = encontrar_cliques(grafo, max_cliques=5)
+    cliques = encontrar_cliques(grafo, max_cliques=5, max_segundos=10)
     
     if cliques:
-        print(f"Se encontraron {len(cliques)} cliques de tamaño 3:")
+        print(f"Se encontraron {len(cliques)} cliques maximales:")
         for i, clique in enumerate(cliques[:5], 1):
             nodos_str = ", ".join([str(n) for n in clique])
-            print(f"{i}. {{{nodos_str}}}")
+            print(f"{i}. ({len(clique)} nodos) {{{nodos_str}}}")
     else:
-        print("No se encontraron cliques de tamaño 3")
+        print("No se encontraron cliques")
+    
+    clique_maxima, es_maxima = encontrar_clique_maxima(grafo, max_segundos=10)
+    print(f"Clique {'máxima' if es_maxima else 'más grande encontrada'}: {len(clique_maxima)} nodos "
+          f"(incluye conflictos por un profesor posible, no es una cota)")
+    cotas = calcular_cotas_inferiores(grafo, horas_por_materia(materias), 10, turnos_por_grupo(materias))
+    print(f"Clique de conflictos seguros: se necesitan al menos {cotas['clique']} slots")
     print()
     
     # Paso 9: Generar visualizaciones
@@ -0,0 +1,542 @@
+"""
+Pruebas de concordancia del motor de backtracking con datos sintéticos.
+No necesitan el Excel ni pandas: se ejecutan con `python test_motor.py`
+o con pytest.
+
+Cada modo de búsqueda (portafolio, descomposición, backjumping, nogoods,
+simetría, ...) debe dar la misma respuesta que la búsqueda simple, y todo
+horario completo debe cumplir las restricciones duras.
+"""
+
+import contextlib
+import io
+import random
+import time
+
+from src.core.modelos import Grupo, Materia, Profesor
+from src.core.config import DIAS_SEMANA, get_all_slots, mascara_disponibilidad
+from src.core.grafo_conflictos import GrafoConflictos
+from src.algoritmo.backtracking import resolver_backtracking, contar_cambios
+from src.algoritmo.busqueda_local import resolver_busqueda_local
+from src.algoritmo.recocido import optimizar_recocido
+from src.algoritmo.vecindarios import optimizar_lns, VECINDARIOS
+from src.algoritmo.estado_compacto import EstadoCompacto, SLOTS_POR_TURNO
+from src.algoritmo.restricciones import (verificar_solucion_completa, calcular_score_calidad,
+                                         CalidadIncremental, causas_conflicto,
+                                         validar_restricciones_compacto)
+
+
+# Decisiones permitidas a cada búsqueda; las que lo agotan no cuentan
+MAX_NODOS = 3000
+
+# Instancias aleatorias de las pruebas de concordancia
+SEMILLAS = range(40)
+
+
+def generar_instancia(semilla: int):
+    """
+    Instancia chica y ajustada: 2-3 grupos, 2-4 materias y 2-3 profesores
+    disponibles solo algunas horas de uno o dos días.
+    
+    Returns:
+        Tupla (grupos, materias, profesores)
+    """
+    aleatorio = random.Random(semilla)
+    grupos = [Grupo(1, "Matutino", f"G{i}") for i in range(aleatorio.randint(2, 3))]
+    materias = []
+    for j in range(aleatorio.randint(2, 4)):
+        materia = Materia(f"M{j}", 1, aleatorio.randint(2, 4))
+        materia.grupos_que_cursan = [g for g in grupos if aleatorio.random() < 0.7] or [grupos[0]]
+        materias.append(materia)
+    
+    profesores = []
+    for k in range(aleatorio.randint(2, 3)):
+        dias = aleatorio.sample(DIAS_SEMANA, aleatorio.randint(1, 2))
+        disponibilidad = {dia: [("07:00", f"{aleatorio.randint(9, 11):02d}:00")] for dia in dias}
+        imparte = aleatorio.sample([m.nombre for m in materias], min(2, len(materias)))
+        profesores.append(Profesor(f"P{k}", imparte, aleatorio.randint(4, 12), "Ambos", disponibilidad))
+    for materia in materias:
+        if not any(p.puede_impartir(materia.nombre) for p in profesores):
+            profesores[0].materias_imparte.append(materia.nombre)
+    return grupos, materias, profesores
+
+
+def generar_instancia_mediana(semilla: int):
+    """
+    Instancia con holgura: 6 grupos de ambos turnos, 7 materias de 3 a 5
+    horas y 9 profesores de turno "Ambos" que pueden dar 3 materias.
+    
+    Returns:
+        Tupla (grupos, materias, profesores)
+    """
+    aleatorio = random.Random(semilla)
+    grupos = [Grupo(i % 3 + 1, "Matutino" if i % 2 == 0 else "Vespertino", f"G{i}") for i in range(6)]
+    materias = []
+    for j in range(7):
+        materia = Materia(f"M{j}", j % 3 + 1, aleatorio.randint(3, 5))
+        materia.grupos_que_cursan = [g for g in grupos if aleatorio.random() < 0.8]
+        materias.append(materia)
+    profesores = [Profesor(f"P{k}", aleatorio.sample([m.nombre for m in materias], 3), 22, "Ambos")
+                  for k in range(9)]
+    for materia in materias:
+        if not any(p.puede_impartir(materia.nombre) for p in profesores):
+            profesores[0].materias_imparte.append(materia.nombre)
+    return grupos, materias, profesores
+
+
+def instancia_reparto(horas):
+    """
+    Una parte independiente por elemento de horas: el grupo Gi cursa Mi
+    (horas[i] horas), que solo pueden dar Pia (lunes de 7 a 10) y Pib
+    (martes de 7 a 10). Con más de 6 horas la parte no tiene solución.
+    
+    Returns:
+        Tupla (grupos, materias, profesores)
+    """
+    grupos, materias, profesores = [], [], []
+    for i, horas_materia in enumerate(horas):
+        grupo = Grupo(1, "Matutino", f"G{i}")
+        materia = Materia(f"M{i}", 1, horas_materia, [grupo])
+        grupos.append(grupo)
+        materias.append(materia)
+        profesores.append(Profesor(f"P{i}a", [materia.nombre], 10, "Matutino",
+                                   {"Lunes": [("07:00", "10:00")]}))
+        profesores.append(Profesor(f"P{i}b", [materia.nombre], 10, "Matutino",
+                                   {"Martes": [("07:00", "10:00")]}))
+    return grupos, materias, profesores
+
+
+def resolver(grupos, materias, profesores, **opciones):
+    """Ejecuta resolver_backtracking sin imprimir, con su propio grafo."""
+    grafo = GrafoConflictos()
+    grafo.construir_desde_datos(grupos, materias, profesores)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return resolver_backtracking(grupos, materias, profesores, grafo, **opciones)
+
+
+def validar_horario(horario, grupos, materias, profesores, completo: bool = True):
+    """
+    Comprueba que un horario esté completo (verificar_solucion_completa)
+    y cumpla las restricciones duras: turno del grupo, profesor que imparte
+    la materia, sin choques de profesor, horas, turno y disponibilidad.
+    Con completo=False solo se comprueban las restricciones duras (horarios
+    parciales).
+    """
+    if completo:
+        es_completo, errores = verificar_solucion_completa(horario, materias)
+        assert es_completo, errores
+    
+    por_nombre = {p.nombre: p for p in profesores}
+    turno_grupo = {g.nombre: g.turno for g in grupos}
+    ocupados = set()
+    horas = {}
+    for grupo, dias in horario.items():
+        slots_turno = {(s.dia, s.slot_key): s for s in get_all_slots(turno_grupo[grupo])}
+        for dia, celdas in dias.items():
+            for slot_key, asignacion in celdas.items():
+                if asignacion is None:
+                    continue
+                slot = slots_turno.get((dia, slot_key))
+                assert slot is not None, f"{grupo}: {dia} {slot_key} fuera de su turno"
+                profesor = por_nombre[asignacion['profesor']]
+                assert profesor.puede_impartir(asignacion['materia']), asignacion
+                assert (profesor.nombre, dia, slot_key) not in ocupados, (profesor.nombre, dia, slot_key)
+                ocupados.add((profesor.nombre, dia, slot_key))
+                horas[profesor.nombre] = horas.get(profesor.nombre, 0) + 1
+                assert profesor.turno_preferido in ("Ambos", slot.turno), (profesor.nombre, slot)
+                assert profesor.esta_disponible_en_slot(dia, slot.hora_inicio, slot.hora_fin), \
+                    (profesor.nombre, dia, slot_key)
+    for nombre, cantidad in horas.items():
+        assert cantidad <= por_nombre[nombre].horas_disponibles, (nombre, cantidad)
+
+
+def desenlace(estadisticas) -> str:
+    """'S' (solución), 'U' (sin solución) o 'P' (presupuesto agotado)."""
+    if estadisticas['solucion_completa']:
+        return 'S'
+    return 'P' if estadisticas['presupuesto_agotado'] else 'U'
+
+
+# Desenlace de la búsqueda simple por semilla (se calcula una sola vez)
+_REFERENCIA = {}
+
+
+def referencia(semilla: int) -> str:
+    """Desenlace de la búsqueda simple (sin opciones) en la instancia de la semilla."""
+    if semilla not in _REFERENCIA:
+        grupos, materias, profesores = generar_instancia(semilla)
+        _, _, estadisticas = resolver(grupos, materias, profesores, max_nodos=MAX_NODOS)
+        _REFERENCIA[semilla] = desenlace(estadisticas)
+    return _REFERENCIA[semilla]
+
+
+def comprobar_concordancia(**opciones):
+    """
+    Resuelve las instancias de SEMILLAS con las opciones dadas y compara
+    con la búsqueda simple: si ambas deciden, deben decir lo mismo, y cada
+    horario completo debe ser válido. Exige que haya casos con y sin
+    solución, para que la comparación no sea vacía.
+    """
+    decididos = {'S': 0, 'U': 0}
+    for semilla in SEMILLAS:
+        esperado = referencia(semilla)
+        grupos, materias, profesores = generar_instancia(semilla)
+        horario, _, estadisticas = resolver(grupos, materias, profesores,
+                                            max_nodos=MAX_NODOS, **opciones)
+        obtenido = desenlace(estadisticas)
+        if obtenido == 'S':
+            validar_horario(horario, grupos, materias, profesores)
+        if 'P' in (esperado, obtenido):
+            continue
+        assert obtenido == esperado, (semilla, opciones, esperado, obtenido)
+        decididos[obtenido] += 1
+    assert decididos['S'] > 0 and decididos['U'] > 0, decididos
+
+
+def test_backjumping():
+    """El salto dirigido por conflictos no pierde soluciones."""
+    comprobar_concordancia(backjumping=True)
+
+
+def test_backjumping_iterativo():
+    """Backjumping con pila explícita."""
+    comprobar_concordancia(backjumping=True, iterativo=True)
+
+
+def test_backjumping_forward_checking():
+    """Backjumping con dominios de forward checking."""
+    comprobar_concordancia(backjumping=True, forward_checking=True)
+
+
+def test_causas_conflicto():
+    """
+    causas_conflicto explica cada slot inválido con los niveles que lo
+    ocupan (grupo o profesor), con todas las clases del profesor si agotó
+    sus horas, y con ninguno si el fallo es de turno o disponibilidad.
+    """
+    grupos = [Grupo(1, "Matutino", "G0"), Grupo(1, "Matutino", "G1")]
+    materias = [Materia("M0", 1, 4, list(grupos))]
+    profesores = [Profesor("P0", ["M0"], 3, "Ambos", {"Lunes": [("07:00", "12:00")]}),
+                  Profesor("P1", ["M0"], 10, "Vespertino"),
+                  Profesor("P2", ["M0"], 10, "Ambos")]
+    compacto = EstadoCompacto(grupos, materias, profesores)
+    compacto.asignar(0, 0, 2, 1)  # Nivel 0: G0 ocupado en el slot 1
+    compacto.asignar(1, 0, 0, 0)  # Nivel 1: P0 ocupado en el slot 0
+    compacto.asignar(1, 0, 0, 2)  # Nivel 2: P0 ocupado en el slot 2
+    
+    assert causas_conflicto(compacto, 0, 0) == {0, 1, 2}
+    assert causas_conflicto(compacto, 0, 0, 1 << 0) == {1}
+    assert causas_conflicto(compacto, 0, 0, 1 << 1) == {0}
+    assert causas_conflicto(compacto, 0, 0, 1 << 7) == set()  # Martes: fuera de su disponibilidad
+    assert causas_conflicto(compacto, 0, 1) == set()  # Turno del profesor
+    for slot in range(SLOTS_POR_TURNO):
+        valido, _ = validar_restricciones_compacto(compacto, 0, 0, slot)
+        if valido:
+            assert causas_conflicto(compacto, 0, 0, 1 << slot) == set(), slot
+    
+    compacto.asignar(1, 0, 0, 3)  # Nivel 3: P0 agota sus 3 horas
+    assert causas_conflicto(compacto, 0, 0, 1 << 4) == {1, 2, 3}
+
+
+def test_nogoods():
+    """Los nogoods aprendidos solo podan ramas sin solución."""
+    comprobar_concordancia(nogoods=100)
+
+
+def test_nogoods_iterativo():
+    """Nogoods con pila explícita."""
+    comprobar_concordancia(nogoods=100, iterativo=True)
+
+
+def test_nogoods_reinicios():
+    """Nogoods que sobreviven a los reinicios (Luby y geométrico), con un almacén chico que desaloja."""
+    comprobar_concordancia(nogoods=100, iterativo=True, reinicios='luby', semilla=0)
+    comprobar_concordancia(nogoods=4, reinicios='geometrico', corte_inicial=20, semilla=1)
+
+
+def test_simetria():
+    """La ruptura de simetrías entre horas y profesores equivalentes no pierde soluciones."""
+    comprobar_concordancia(simetria=True)
+    comprobar_concordancia(simetria=True, iterativo=True, forward_checking=True)
+
+
+def test_simetria_disponibilidad():
+    """
+    Profesores del mismo turno y materias pero con distinta disponibilidad
+    no son equivalentes: con 6 horas hay que usar las 3 del lunes y las 3
+    del martes, con 7 no hay solución, y si el lunes está ocupado por otra
+    materia solo sirve el del martes.
+    """
+    for horas in ([6], [5, 6]):
+        grupos, materias, profesores = instancia_reparto(horas)
+        horario, _, estadisticas = resolver(grupos, materias, profesores, simetria=True)
+        assert estadisticas['solucion_completa'], horas
+        validar_horario(horario, grupos, materias, profesores)
+    
+    grupos, materias, profesores = instancia_reparto([7])
+    _, _, estadisticas = resolver(grupos, materias, profesores, simetria=True)
+    assert desenlace(estadisticas) == 'U'
+    
+    # M1 solo la da P0c, el lunes de 7 a 10: ocupa las horas de P0a y toda
+    # M0 queda para P0b, que nunca se probaría si fuera "equivalente" a P0a
+    grupos, materias, profesores = instancia_reparto([3])
+    materias.append(Materia("M1", 1, 3, [grupos[0]]))
+    profesores.append(Profesor("P0c", ["M1"], 10, "Matutino", {"Lunes": [("07:00", "10:00")]}))
+    horario, _, estadisticas = resolver(grupos, materias, profesores, simetria=True)
+    assert estadisticas['solucion_completa']
+    validar_horario(horario, grupos, materias, profesores)
+
+
+def test_busqueda_local():
+    """
+    La búsqueda local nunca dice haber resuelto una instancia sin solución,
+    termina sin violaciones exactamente cuando el horario está completo y
+    su horario, completo o parcial, cumple las restricciones duras.
+    """
+    completos = 0
+    for semilla in SEMILLAS:
+        grupos, materias, profesores = generar_instancia(semilla)
+        grafo = GrafoConflictos()
+        grafo.construir_desde_datos(grupos, materias, profesores)
+        with contextlib.redirect_stdout(io.StringIO()):
+            horario, estadisticas = resolver_busqueda_local(grupos, materias, profesores, grafo,
+                                                            max_iteraciones=2000, semilla=semilla)
+        completo = estadisticas['solucion_completa']
+        assert completo == (estadisticas['violaciones'] == 0), (semilla, estadisticas)
+        if referencia(semilla) == 'U':
+            assert not completo, semilla
+        validar_horario(horario, grupos, materias, profesores, completo=completo)
+        completos += completo
+    assert completos > 0
+
+
+def test_portafolio_factible():
+    """portafolio=2 encuentra el horario que reparte la materia entre dos profesores."""
+    grupos, materias, profesores = instancia_reparto([5])
+    horario, _, estadisticas = resolver(grupos, materias, profesores, portafolio=2)
+    assert estadisticas['solucion_completa']
+    assert estadisticas['portafolio']['desenlaces'].count('solucion') >= 1
+    validar_horario(horario, grupos, materias, profesores)
+
+
+def test_portafolio_sin_solucion():
+    """Un proceso que prueba que no hay solución cancela al otro y su resultado se mantiene."""
+    grupos, materias, profesores = instancia_reparto([7])
+    _, _, estadisticas = resolver(grupos, materias, profesores, portafolio=2)
+    assert desenlace(estadisticas) == 'U', estadisticas['portafolio']
+    assert 'sin_solucion' in estadisticas['portafolio']['desenlaces']
+
+
+def test_disponibilidad_profesor():
+    """
+    Ninguna clase cae fuera de disponibilidad_horaria: con el profesor
+    disponible solo el lunes de 7 a 9, 2 horas van ahí y 3 no tienen solución.
+    """
+    for opciones in ({}, {'forward_checking': True}, {'iterativo': True, 'backjumping': True}):
+        for horas, esperado in ((2, 'S'), (3, 'U')):
+            grupo = Grupo(1, "Matutino", "G0")
+            materias = [Materia("M0", 1, horas, [grupo])]
+            profesores = [Profesor("P0", ["M0"], 10, "Ambos", {"Lunes": [("07:00", "09:00")]})]
+            horario, _, estadisticas = resolver([grupo], materias, profesores, **opciones)
+            assert desenlace(estadisticas) == esperado, (opciones, horas)
+            if esperado == 'S':
+                validar_horario(horario, [grupo], materias, profesores)
+                ocupadas = [(dia, slot_key) for dia, celdas in horario["G0"].items()
+                            for slot_key, asignacion in celdas.items() if asignacion is not None]
+                assert sorted(ocupadas) == [("Lunes", "07:00-08:00"), ("Lunes", "08:00-09:00")], ocupadas
+    
+    # La máscara compilada es un caché: no cuenta al comparar ni al imprimir
+    compilado = Profesor("P0", ["M0"], 10, "Ambos", {"Lunes": [("07:00", "09:00")]})
+    sin_compilar = Profesor("P0", ["M0"], 10, "Ambos", {"Lunes": [("07:00", "09:00")]})
+    mascara_disponibilidad(compilado)
+    assert compilado == sin_compilar
+    assert "mascara_disponible" not in repr(compilado)
+
+
+def test_calidad_incremental():
+    """
+    CalidadIncremental (total, puntaje_grupo, delta_mover y desde_estado)
+    coincide con calcular_score_calidad sobre el mismo horario durante una
+    secuencia aleatoria de colocar, retirar y mover horas.
+    """
+    aleatorio = random.Random(0)
+    grupos = [Grupo(1, turno, f"G{i}") for i, turno in enumerate(["Matutino", "Vespertino", "Matutino"])]
+    materias = [Materia("M0", 1, 35, list(grupos))]
+    profesores = [Profesor(f"P{i}", ["M0"], 35, "Ambos") for i in range(len(grupos))]
+    compacto = EstadoCompacto(grupos, materias, profesores)
+    calidad = CalidadIncremental(len(grupos))
+    
+    def score_completo() -> int:
+        horario = compacto.a_horario()
+        return sum(calcular_score_calidad(horario, g.nombre) for g in grupos)
+    
+    for _ in range(600):
+        # El grupo i solo usa al profesor i: nunca hay choques de profesor
+        grupo_id = aleatorio.randrange(len(grupos))
+        ocupados = [s for s in range(SLOTS_POR_TURNO) if compacto.mascara_grupo[grupo_id] >> s & 1]
+        libres = [s for s in range(SLOTS_POR_TURNO) if not compacto.mascara_grupo[grupo_id] >> s & 1]
+        operacion = aleatorio.choice(['colocar', 'colocar', 'retirar', 'mover'])
+        if operacion == 'colocar' and libres:
+            slot = aleatorio.choice(libres)
+            compacto.asignar(grupo_id, 0, grupo_id, slot)
+            calidad.colocar(grupo_id, slot)
+        elif operacion == 'retirar' and ocupados:
+            slot = aleatorio.choice(ocupados)
+            compacto.liberar(grupo_id, grupo_id, slot)
+            calidad.retirar(grupo_id, slot)
+        elif operacion == 'mover' and ocupados and libres:
+            origen, destino = aleatorio.choice(ocupados), aleatorio.choice(libres)
+            antes = score_completo()
+            delta = calidad.delta_mover(grupo_id, origen, destino)
+            compacto.liberar(grupo_id, grupo_id, origen)
+            compacto.asignar(grupo_id, 0, grupo_id, destino)
+            calidad.mover(grupo_id, origen, destino)
+            assert delta == score_completo() - antes, (grupo_id, origen, destino)
+        
+        horario = compacto.a_horario()
+        assert calidad.total == score_completo()
+        for i, grupo in enumerate(grupos):
+            assert calidad.puntaje_grupo(i) == calcular_score_calidad(horario, grupo.nombre)
+        assert CalidadIncremental.desde_estado(compacto).total == calidad.total
+
+
+def puntaje_total(horario, grupos) -> int:
+    """Suma de calcular_score_calidad de todos los grupos."""
+    return sum(calcular_score_calidad(horario, g.nombre) for g in grupos)
+
+
+def test_recocido():
+    """
+    El recocido conserva un horario válido, reporta el score real de la
+    entrada y de la salida, nunca lo empeora y con la misma semilla (y
+    presupuesto por iteraciones) repite el resultado.
+    """
+    for semilla in (0, 1):
+        grupos, materias, profesores = generar_instancia_mediana(semilla)
+        horario, _, estadisticas = resolver(grupos, materias, profesores, iterativo=True, semilla=5)
+        assert estadisticas['solucion_completa']
+        
+        resultados = [optimizar_recocido(horario, grupos, materias, profesores, max_segundos=600,
+                                         max_iteraciones=3000, semilla=semilla) for _ in range(2)]
+        optimizado, estadisticas = resultados[0]
+        validar_horario(optimizado, grupos, materias, profesores)
+        assert estadisticas['puntaje_inicial'] == puntaje_total(horario, grupos)
+        assert estadisticas['puntaje_final'] == puntaje_total(optimizado, grupos)
+        assert estadisticas['puntaje_final'] >= estadisticas['puntaje_inicial']
+        assert resultados[1][0] == optimizado
+        assert resultados[1][1]['puntaje_final'] == estadisticas['puntaje_final']
+
+
+def test_lns():
+    """
+    Cada tipo de vecindario reconstruye horarios (con el resto fijo y el
+    orden por calidad) que siguen siendo válidos, con el score real de la
+    entrada y de la salida, sin empeorarlo; un vecindario desconocido es
+    un ValueError.
+    """
+    grupos, materias, profesores = generar_instancia_mediana(0)
+    horario, _, estadisticas = resolver(grupos, materias, profesores, iterativo=True, semilla=5)
+    assert estadisticas['solucion_completa']
+    grafo = GrafoConflictos()
+    grafo.construir_desde_datos(grupos, materias, profesores)
+    
+    for vecindario in VECINDARIOS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            optimizado, estadisticas = optimizar_lns(horario, grupos, materias, profesores, grafo,
+                                                     max_segundos=600, max_iteraciones=15,
+                                                     vecindarios=(vecindario,), semilla=0)
+        assert estadisticas['por_vecindario'][vecindario]['resueltos'] > 0, estadisticas
+        validar_horario(optimizado, grupos, materias, profesores)
+        assert estadisticas['puntaje_inicial'] == puntaje_total(horario, grupos)
+        assert estadisticas['puntaje_final'] == puntaje_total(optimizado, grupos)
+        assert estadisticas['puntaje_final'] >= estadisticas['puntaje_inicial']
+    
+    for vecindarios in (('semana',), ()):
+        try:
+            optimizar_lns(horario, grupos, materias, profesores, vecindarios=vecindarios)
+        except ValueError:
+            continue
+        raise AssertionError(f"vecindarios={vecindarios} no lanzó ValueError")
+
+
+def test_horario_previo():
+    """
+    Con los mismos datos, minimizar_cambios devuelve el horario previo sin
+    cambios; si un profesor deja de estar disponible el lunes, conserva al
+    menos tantas clases como resolver de cero (y el horario es válido).
+    """
+    for semilla in (0, 1):
+        grupos, materias, profesores = generar_instancia_mediana(semilla)
+        previo, _, estadisticas = resolver(grupos, materias, profesores, iterativo=True, semilla=5)
+        assert estadisticas['solucion_completa']
+        
+        _, _, estadisticas = resolver(grupos, materias, profesores, iterativo=True,
+                                      horario_previo=previo, minimizar_cambios=True)
+        cambios = estadisticas['cambios']
+        assert cambios['conservadas'] == cambios['previas'] and cambios['cambiadas'] == cambios['nuevas'] == 0
+        
+        # Quitar el lunes al profesor con más clases
+        clases = {}
+        for dias in previo.values():
+            for celdas in dias.values():
+                for asignacion in celdas.values():
+                    if asignacion is not None:
+                        clases[asignacion['profesor']] = clases.get(asignacion['profesor'], 0) + 1
+        profesor = next(p for p in profesores if p.nombre == max(clases, key=clases.get))
+        profesor.disponibilidad_horaria = {dia: [("07:00", "21:00")] for dia in DIAS_SEMANA if dia != "Lunes"}
+        profesor.mascara_disponible = None
+        
+        en_frio, _, estadisticas_frio = resolver(grupos, materias, profesores, iterativo=True)
+        nuevo, _, estadisticas = resolver(grupos, materias, profesores, iterativo=True,
+                                          horario_previo=previo, minimizar_cambios=True)
+        assert estadisticas_frio['solucion_completa'] and estadisticas['solucion_completa']
+        validar_horario(nuevo, grupos, materias, profesores)
+        conservadas_frio = contar_cambios(previo, en_frio)['conservadas']
+        assert estadisticas['cambios']['conservadas'] >= conservadas_frio, (estadisticas['cambios'], conservadas_frio)
+
+
+def test_descomposicion():
+    """Los horarios de los subproblemas se unen en uno válido, en serie o en paralelo."""
+    for procesos in (1, 2):
+        grupos, materias, profesores = instancia_reparto([5, 6])
+        horario, _, estadisticas = resolver(grupos, materias, profesores, descomponer=procesos)
+        assert estadisticas['solucion_completa'], estadisticas['descomposicion']
+        assert len(estadisticas['descomposicion']) == 2
+        assert list(horario) == [g.nombre for g in grupos]
+        validar_horario(horario, grupos, materias, profesores)
+
+
+def test_descomposicion_sin_solucion():
+    """
+    Un subproblema sin solución decide el resultado; en paralelo cancela
+    al otro (8 slots para 9 horas, que sin cancelar tarda varios segundos).
+    """
+    for procesos in (1, 2):
+        grupos, materias, profesores = instancia_reparto([5, 7])
+        horario, _, estadisticas = resolver(grupos, materias, profesores, descomponer=procesos)
+        assert horario is None and desenlace(estadisticas) == 'U', estadisticas['descomposicion']
+    
+    grupos, materias, profesores = instancia_reparto([7])
+    lento = Grupo(1, "Matutino", "G9")
+    grupos.append(lento)
+    materias.append(Materia("M9", 1, 9, [lento]))
+    for dia, fin in (("Lunes", "10:00"), ("Martes", "10:00"), ("Miércoles", "09:00")):
+        profesores.append(Profesor(f"P9{dia}", ["M9"], 10, "Matutino", {dia: [("07:00", fin)]}))
+    inicio = time.time()
+    _, _, estadisticas = resolver(grupos, materias, profesores, descomponer=2)
+    assert desenlace(estadisticas) == 'U', estadisticas['descomposicion']
+    assert time.time() - inicio < 5, estadisticas['descomposicion']
+
+
+def main():
+    """Ejecuta todas las pruebas del módulo."""
+    pruebas = [(nombre, funcion) for nombre, funcion in globals().items()
+               if nombre.startswith('test_') and callable(funcion)]
+    for nombre, funcion in pruebas:
+        funcion()
+        print(f"✓ {nombre}")
+    print(f"\n✅ {len(pruebas)} pruebas correctas")
+
+
+if __name__ == "__main__":
+    main()